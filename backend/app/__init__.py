@@ -1,23 +1,62 @@
+import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_cors import CORS
 from config import Config
+from app.session import ShardedSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': ShardedSession})
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    from app import json_provider
+    json_provider.init_app(app)
+
+    from app import sqlite_profile
+    sqlite_profile.configure_engine_options(app)
+    # Shard veritabanları SQLALCHEMY_BINDS'e db.init_app'ten önce eklenmelidir
+    from app.sharding import shards
+    shards.init_app(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    sqlite_profile.install(app, db)
+
+    # Göç araçları (Flask-Migrate/Alembic) üretim modunda sadece 'flask' komutları için yüklenir;
+    # Flask CLI her komutta FLASK_RUN_FROM_CLI ortam değişkenini ayarlar
+    if app.config['APP_MODE'] != 'production' or os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    from app.cache import cache
+    cache.init_app(app)
+
+    from app.security import password_hasher
+    password_hasher.init_app(app)
+
+    from app.jobs import job_queue
+    job_queue.init_app(app)
+
+    from app.events import events
+    events.init_app(app)
     # Enable CORS for frontend origin with credentials support
-    CORS(app, resources={r"/*": {"origins": "http://localhost:5173"}}, supports_credentials=True)
+    # (Frontend aynı kökenden sunuluyorsa CORS_ORIGINS boş bırakılır ve eklenti hiç yüklenmez)
+    if app.config['CORS_ORIGINS']:
+        from flask_cors import CORS
+        CORS(app, resources={r"/*": {"origins": app.config['CORS_ORIGINS']}}, supports_credentials=True,
+             expose_headers=['X-Next-Cursor'])
 
     # Register Blueprints
     from app.routes import bp as main_bp
     app.register_blueprint(main_bp)
 
+    from app.instrumentation import instrumentation
+    instrumentation.init_app(app, db)
+
+    from app.commands import register_commands
+    register_commands(app)
+
+    if app.config['PREWARM_ON_STARTUP']:
+        from app.warmup import prewarm
+        prewarm(app)
+
     return app
@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+import numpy as np
+from sqlalchemy import func
+from app import db
+from app.models import Habit, HabitLog, HabitYearBitmap
+
+# Analizler, alışkanlık x gün boyutunda bir boolean matris üzerinde vektörel olarak hesaplanır.
+# Satır i, habit_ids[i] alışkanlığını; sütun j, start_date + j gününü temsil eder.
+
+
+def load_matrix_from_rows(user_id, habit_ids, start_date, end_date):
+    days = (end_date - start_date).days + 1
+    matrix = np.zeros((len(habit_ids), days), dtype=bool)
+    position = {habit_id: i for i, habit_id in enumerate(habit_ids)}
+
+    rows = db.session.query(HabitLog.habit_id, HabitLog.completion_date).join(Habit).filter(
+        Habit.user_id == user_id,
+        HabitLog.habit_id.in_(habit_ids),
+        HabitLog.completed.is_(True),
+        HabitLog.completion_date >= start_date,
+        HabitLog.completion_date <= end_date
+    ).all()
+    if rows:
+        origin = start_date.toordinal()
+        row_index = np.fromiter((position[habit_id] for habit_id, _ in rows), dtype=np.intp, count=len(rows))
+        col_index = np.fromiter((day.toordinal() - origin for _, day in rows), dtype=np.intp, count=len(rows))
+        matrix[row_index, col_index] = True
+    return matrix
+
+
+def load_matrix_from_bitmaps(user_id, habit_ids, start_date, end_date):
+    days = (end_date - start_date).days + 1
+    matrix = np.zeros((len(habit_ids), days), dtype=bool)
+    position = {habit_id: i for i, habit_id in enumerate(habit_ids)}
+
+    rows = db.session.query(HabitYearBitmap.habit_id, HabitYearBitmap.year, HabitYearBitmap.bits).filter(
+        HabitYearBitmap.user_id == user_id,
+        HabitYearBitmap.habit_id.in_(habit_ids),
+        HabitYearBitmap.year >= start_date.year,
+        HabitYearBitmap.year <= end_date.year
+    )
+    for habit_id, year, bits in rows:
+        year_start = date(year, 1, 1)
+        year_days = (date(year + 1, 1, 1) - year_start).days
+        year_bits = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), bitorder='little')[:year_days]
+
+        # Yılın [start_date, end_date] ile kesişen kısmını matrise kopyala
+        offset = (year_start - start_date).days
+        lo = max(0, -offset)
+        hi = min(year_days, days - offset)
+        if lo < hi:
+            matrix[position[habit_id], offset + lo:offset + hi] = year_bits[lo:hi].astype(bool)
+    return matrix
+
+
+def first_completion_date(user_id):
+    return db.session.query(func.min(HabitLog.completion_date)).join(Habit).filter(
+        Habit.user_id == user_id
+    ).scalar()
+
+
+def _rolling_rate(series, window):
+    # Son 'window' gündeki tamamlanma oranı; kümülatif toplamla O(gün) hesaplanır. İlk günlerde
+    # (ve 'window'dan kısa serilerde) pencere, serinin başına kadar olan günlerle sınırlıdır.
+    cumulative = np.concatenate(([0], np.cumsum(series, dtype=np.int64)))
+    ends = np.arange(1, len(series) + 1)
+    starts = np.maximum(0, ends - window)
+    return (cumulative[ends] - cumulative[starts]) / np.minimum(ends, window)
+
+
+def _longest_gap(series, start_date):
+    # Ardışık tamamlanmamış günlerin en uzunu; aralığın başı ve sonu da sınır kabul edilir
+    marks = np.flatnonzero(np.concatenate(([True], series, [True])))
+    gaps = np.diff(marks) - 1
+    if not len(gaps) or gaps.max() <= 0:
+        return {'days': 0, 'start': None, 'end': None}
+    i = int(np.argmax(gaps))
+    length = int(gaps[i])
+    gap_start = start_date + timedelta(days=int(marks[i]))
+    return {
+        'days': length,
+        'start': gap_start.isoformat(),
+        'end': (gap_start + timedelta(days=length - 1)).isoformat()
+    }
+
+
+def _summary(series, start_date, weekdays, months, series_days):
+    completed_days = int(series.sum())
+    rate_7 = _rolling_rate(series, 7)
+    rate_30 = _rolling_rate(series, 30)
+    return {
+        'completed_days': completed_days,
+        'completion_rate': round(completed_days / len(series), 4),
+        'rolling_7d': round(float(rate_7[-1]), 4),
+        'rolling_30d': round(float(rate_30[-1]), 4),
+        'rolling_7d_series': np.round(rate_7[-series_days:], 4).tolist(),
+        'rolling_30d_series': np.round(rate_30[-series_days:], 4).tolist(),
+        'weekday_distribution': np.bincount(weekdays[series], minlength=7).tolist(),
+        'month_distribution': np.bincount(months[series], minlength=13)[1:].tolist(),
+        'longest_gap': _longest_gap(series, start_date),
+    }
+
+
+def compute_analytics(matrix, habit_ids, start_date, series_days=90):
+    """
+    Tamamlanma matrisinden alışkanlık bazında ve genel analizleri hesaplar.
+
+    Argümanlar:
+        matrix (np.ndarray): (alışkanlık sayısı, gün sayısı) boyutunda boolean matris.
+        habit_ids (list[int]): Matris satırlarına karşılık gelen alışkanlık id'leri.
+        start_date (date): Matrisin ilk sütununun tarihi.
+        series_days (int): Döndürülecek kayan oran serilerinin uzunluğu.
+
+    Döndürür:
+        dict: 'habits', 'overall' ve 'co_occurrence' anahtarlarını içeren sözlük.
+    """
+    days = matrix.shape[1]
+    series_days = max(1, min(series_days, days))
+    ordinals = np.arange(start_date.toordinal(), start_date.toordinal() + days)
+    # date.toordinal() için 1 Ocak 0001 Pazartesi'dir: (ordinal - 1) % 7 => 0=Pazartesi
+    weekdays = (ordinals - 1) % 7
+    months = _months(start_date, days)
+
+    habits = {
+        str(habit_id): _summary(matrix[i], start_date, weekdays, months, series_days)
+        for i, habit_id in enumerate(habit_ids)
+    }
+    overall = _summary(matrix.any(axis=0) if len(habit_ids) else np.zeros(days, dtype=bool),
+                       start_date, weekdays, months, series_days)
+
+    # Birlikte tamamlanma: iki alışkanlığın aynı gün tamamlandığı gün sayısı (M @ M.T)
+    # float32 çarpımı BLAS kullanır ve 2^24'e kadar olan sayımlar için kesindir
+    as_float = matrix.astype(np.float32)
+    co_occurrence = (as_float @ as_float.T).astype(np.int64)
+
+    return {
+        'from': start_date.isoformat(),
+        'to': (start_date + timedelta(days=days - 1)).isoformat(),
+        'series_start': (start_date + timedelta(days=days - series_days)).isoformat(),
+        'habits': habits,
+        'overall': overall,
+        'co_occurrence': {
+            'habit_ids': list(habit_ids),
+            'counts': co_occurrence.tolist()
+        }
+    }
+
+
+def _months(start_date, days):
+    # Ay numaralarını yıl/ay sınırları üzerinden blok blok doldurur (gün başına Python döngüsü yok)
+    months = np.empty(days, dtype=np.int64)
+    end_date = start_date + timedelta(days=days - 1)
+    cursor = date(start_date.year, start_date.month, 1)
+    while cursor <= end_date:
+        next_month = date(cursor.year + cursor.month // 12, cursor.month % 12 + 1, 1)
+        lo = max(0, (cursor - start_date).days)
+        hi = min(days, (next_month - start_date).days)
+        months[lo:hi] = cursor.month
+        cursor = next_month
+    return months
@@ -0,0 +1,111 @@
+import hashlib
+from functools import wraps
+from flask import current_app, g, jsonify, request, session
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from app import db
+
+# İki kimlik doğrulama yolu desteklenir: Flask'ın imzalı çerez oturumu ve
+# "Authorization: Bearer <token>" başlığıyla gönderilen kısa ömürlü imzalı erişim token'ları.
+# Erişim token'ları sadece imza ve süre kontrolüyle doğrulanır (veritabanına gidilmez);
+# böylece herhangi bir uygulama kopyası, yapışkan oturum gerektirmeden isteği karşılayabilir.
+
+ACCESS_SALT = 'habit-map-access'
+REFRESH_SALT = 'habit-map-refresh'
+
+
+def _serializer(salt):
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=salt)
+
+
+def _password_fingerprint(user):
+    # Parola değiştiğinde eski refresh token'ların geçersiz olması için özetin kısa bir parmak izi
+    return hashlib.sha256(user.password_hash.encode('utf-8')).hexdigest()[:16]
+
+
+def issue_tokens(user):
+    """Kullanıcı için bir erişim ve bir yenileme token'ı üretir."""
+    return {
+        'access_token': _serializer(ACCESS_SALT).dumps({'uid': user.id}),
+        'refresh_token': _serializer(REFRESH_SALT).dumps({'uid': user.id, 'pwd': _password_fingerprint(user)}),
+        'token_type': 'Bearer',
+        'expires_in': current_app.config['ACCESS_TOKEN_TTL']
+    }
+
+
+def verify_access_token(token):
+    try:
+        payload = _serializer(ACCESS_SALT).loads(token, max_age=current_app.config['ACCESS_TOKEN_TTL'])
+    except (BadSignature, SignatureExpired):
+        return None
+    return payload.get('uid')
+
+
+def verify_refresh_token(token):
+    """Yenileme token'ını doğrular; geçerliyse kullanıcıyı döndürür (tek sorgu)."""
+    from app.models import User
+    from app.sharding import use_shard
+
+    try:
+        payload = _serializer(REFRESH_SALT).loads(token, max_age=current_app.config['REFRESH_TOKEN_TTL'])
+    except (BadSignature, SignatureExpired):
+        return None
+
+    user_id = payload.get('uid')
+    user = db.session.get(User, user_id) if user_id and use_shard(user_id) else None
+    if user is None or payload.get('pwd') != _password_fingerprint(user):
+        return None
+    return user
+
+
+def get_current_user_id():
+    """
+    İsteğin kullanıcı ID'sini döndürür ve oturumu kullanıcının shard'ına yönlendirir.
+    Sonuç istek boyunca g üzerinde saklanır. AUTH_MODE: 'session', 'token' veya 'both'.
+    """
+    from app.sharding import use_shard
+
+    if 'user_id' in g:
+        return g.user_id
+
+    mode = current_app.config['AUTH_MODE']
+    user_id = None
+
+    header = request.headers.get('Authorization', '')
+    if mode in ('token', 'both') and header.startswith('Bearer '):
+        user_id = verify_access_token(header[len('Bearer '):].strip())
+    elif mode in ('session', 'both'):
+        user_id = session.get('user_id')
+
+    # Dizinde bulunmayan kullanıcı (ör. silinmiş) kimliği doğrulanmamış sayılır
+    if user_id and not use_shard(user_id):
+        user_id = None
+
+    g.user_id = user_id
+    return user_id
+
+
+def habit_required(view):
+    """
+    Kimlik doğrulama ve alışkanlık sahipliği kontrolünü tek adımda yapar. Görünüme
+    habit_id yerine sahipliği doğrulanmış Habit nesnesi 'habit' olarak verilir.
+    """
+    @wraps(view)
+    def wrapper(habit_id, *args, **kwargs):
+        from app.models import Habit
+
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        # Aynı istekte tekrar çözümlenmemesi için g üzerinde saklanır
+        habits = g.setdefault('owned_habits', {})
+        if habit_id not in habits:
+            # Silinmiş (temizlenmeyi bekleyen) alışkanlıklar bulunamamış sayılır
+            habits[habit_id] = Habit.query.filter_by(id=habit_id, user_id=user_id, deleted_at=None).first()
+        habit = habits[habit_id]
+        if not habit:
+            return jsonify({'error': 'Habit not found'}), 404
+
+        return view(*args, habit=habit, **kwargs)
+
+    return wrapper
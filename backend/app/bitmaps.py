@@ -0,0 +1,175 @@
+from datetime import date, timedelta
+from sqlalchemy import tuple_
+from app import db
+from app.models import HabitYearBitmap
+
+# Her alışkanlık-yıl çifti için 366 bitlik (46 bayt) tek bir BLOB tutulur. Sayım popcount,
+# kullanıcı düzeyi birleşim bitwise OR, seriler ise ardışık 1 bitleri üzerinde bit
+# işlemleriyle hesaplanır; gün başına satır okumaya gerek kalmaz.
+
+YEAR_BITS = 366
+YEAR_BYTES = (YEAR_BITS + 7) // 8
+
+
+def day_index(day):
+    return day.timetuple().tm_yday - 1
+
+
+def to_int(bits):
+    return int.from_bytes(bits, 'little')
+
+
+def to_bytes(value):
+    return value.to_bytes(YEAR_BYTES, 'little')
+
+
+def set_bit(value, day, completed):
+    mask = 1 << day_index(day)
+    return value | mask if completed else value & ~mask
+
+
+def apply_changes(user_id, changes):
+    """
+    (habit_id, gün, tamamlandı) değişikliklerini bitmap'lere uygular. Etkilenen tüm
+    alışkanlık-yıl satırları tek sorguda okunur. Commit çağırana bırakılır.
+    """
+    keys = list({(habit_id, day.year) for habit_id, day, _ in changes})
+    if not keys:
+        return
+
+    rows = {
+        (row.habit_id, row.year): row
+        for row in HabitYearBitmap.query.filter(
+            tuple_(HabitYearBitmap.habit_id, HabitYearBitmap.year).in_(keys)
+        )
+    }
+    values = {key: to_int(rows[key].bits) if key in rows else 0 for key in keys}
+
+    for habit_id, day, completed in changes:
+        key = (habit_id, day.year)
+        values[key] = set_bit(values[key], day, completed)
+
+    for (habit_id, year), value in values.items():
+        row = rows.get((habit_id, year))
+        if row is None:
+            if value:
+                db.session.add(HabitYearBitmap(habit_id=habit_id, year=year, user_id=user_id, bits=to_bytes(value)))
+        elif value:
+            row.bits = to_bytes(value)
+        else:
+            db.session.delete(row)
+
+
+def load(user_id, habit_ids=None, start_year=None, end_year=None):
+    """Kullanıcının bitmap'lerini {habit_id: {yıl: int}} olarak getirir."""
+    query = db.session.query(HabitYearBitmap.habit_id, HabitYearBitmap.year, HabitYearBitmap.bits).filter(
+        HabitYearBitmap.user_id == user_id
+    )
+    if habit_ids is not None:
+        query = query.filter(HabitYearBitmap.habit_id.in_(habit_ids))
+    if start_year is not None:
+        query = query.filter(HabitYearBitmap.year >= start_year)
+    if end_year is not None:
+        query = query.filter(HabitYearBitmap.year <= end_year)
+
+    bitmaps = {}
+    for habit_id, year, bits in query:
+        bitmaps.setdefault(habit_id, {})[year] = to_int(bits)
+    return bitmaps
+
+
+def clip(year_bits, start_date=None, end_date=None):
+    """Yıl bitmap'lerini verilen tarih aralığının dışında kalan günlerden temizler."""
+    clipped = {}
+    for year, value in year_bits.items():
+        if start_date and start_date.year == year:
+            value &= ~((1 << day_index(start_date)) - 1)
+        if end_date and end_date.year == year:
+            value &= (1 << (day_index(end_date) + 1)) - 1
+        if (start_date and year < start_date.year) or (end_date and year > end_date.year):
+            value = 0
+        if value:
+            clipped[year] = value
+    return clipped
+
+
+def union(bitmaps):
+    """Birden fazla alışkanlığın yıl bitmap'lerini OR ile birleştirir."""
+    combined = {}
+    for year_bits in bitmaps:
+        for year, value in year_bits.items():
+            combined[year] = combined.get(year, 0) | value
+    return combined
+
+
+def count(year_bits):
+    return sum(value.bit_count() for value in year_bits.values())
+
+
+def heatmap(year_bits, counts=None):
+    """Yıl bitmap'lerindeki her set biti 'YYYY-AA-GG' anahtarına çevirir ve counts sözlüğüne ekler."""
+    counts = {} if counts is None else counts
+    for year, value in year_bits.items():
+        start = date(year, 1, 1)
+        while value:
+            low = value & -value
+            date_str = (start + timedelta(days=low.bit_length() - 1)).isoformat()
+            counts[date_str] = counts.get(date_str, 0) + 1
+            value ^= low
+    return counts
+
+
+def _timeline(year_bits):
+    # Yılları gerçek uzunluklarıyla tek bir tamsayıda birleştirir; bit 0 ilk yılın 1 Ocak'ıdır
+    if not year_bits:
+        return 0, None
+    first_year = min(year_bits)
+    value = 0
+    offset = 0
+    for year in range(first_year, max(year_bits) + 1):
+        value |= year_bits.get(year, 0) << offset
+        offset += (date(year + 1, 1, 1) - date(year, 1, 1)).days
+    return value, date(first_year, 1, 1)
+
+
+def streaks(year_bits, today=None):
+    """Bitmap'lerden (mevcut seri, en iyi seri) değerlerini bit işlemleriyle hesaplar."""
+    today = today or date.today()
+    value, origin = _timeline(year_bits)
+    if not value:
+        return 0, 0
+
+    # En uzun 1 dizisi: x &= x >> 1 işlemi her adımda tüm dizileri bir bit kısaltır
+    best_streak = 0
+    remaining = value
+    while remaining:
+        remaining &= remaining >> 1
+        best_streak += 1
+
+    # Son set bit bugün veya dün ise, seri potansiyel olarak devam ediyor
+    last_index = value.bit_length() - 1
+    current_streak = 0
+    if (today - (origin + timedelta(days=last_index))).days <= 1:
+        inverted = ~value & ((1 << (last_index + 1)) - 1)
+        current_streak = last_index + 1 - inverted.bit_length()
+
+    return current_streak, best_streak
+
+
+def rebuild_user_bitmaps(user_id):
+    """Kullanıcının bitmap'lerini ham kayıtlardan yeniden oluşturur."""
+    from app.models import Habit, HabitLog
+
+    HabitYearBitmap.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    rows = db.session.query(HabitLog.habit_id, HabitLog.completion_date).join(Habit).filter(
+        Habit.user_id == user_id,
+        HabitLog.completed.is_(True)
+    )
+
+    values = {}
+    for habit_id, completion_date in rows:
+        key = (habit_id, completion_date.year)
+        values[key] = set_bit(values.get(key, 0), completion_date, True)
+
+    for (habit_id, year), value in values.items():
+        db.session.add(HabitYearBitmap(habit_id=habit_id, year=year, user_id=user_id, bits=to_bytes(value)))
@@ -0,0 +1,134 @@
+from datetime import datetime
+from sqlalchemy import tuple_
+from app import db, bitmaps, leaderboards, schedules
+from app.models import Habit, HabitLog
+from app.streaks import apply_bulk_changes
+from app.rollup import apply_deltas
+
+# SQLite'ın bağlı parametre sınırını aşmamak için IN listeleri bu boyutta parçalanır
+CHUNK_SIZE = 500
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _parse_operation(operation):
+    if not isinstance(operation, dict):
+        raise ValueError('Operation must be an object')
+
+    habit_id = operation.get('habit_id')
+    if not isinstance(habit_id, int) or isinstance(habit_id, bool):
+        raise ValueError('habit_id must be an integer')
+
+    try:
+        log_date = datetime.strptime(operation.get('date') or '', '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Invalid date format. Use YYYY-MM-DD')
+
+    completed = operation.get('completed', True)
+    if not isinstance(completed, bool):
+        raise ValueError('completed must be a boolean')
+
+    return habit_id, log_date, completed
+
+
+def apply_log_operations(user_id, operations):
+    """
+    Çok sayıda (habit_id, date, completed) işlemini tek transaction içinde uygular.
+
+    İşlemler "set" anlamındadır: completed=True günü işaretli, False işaretsiz bırakır.
+    Aynı işlemin tekrar gönderilmesi sonucu değiştirmez; bu yüzden yeniden denemeler güvenlidir.
+    Aynı (habit_id, date) için birden fazla işlem varsa sonuncusu geçerlidir.
+
+    Döndürür:
+        list[dict]: Her işlem için sırasıyla bir sonuç
+              ('created', 'deleted', 'unchanged', 'superseded' veya 'error').
+    """
+    results = [None] * len(operations)
+    desired = {}
+
+    for index, operation in enumerate(operations):
+        try:
+            habit_id, log_date, completed = _parse_operation(operation)
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+            continue
+        results[index] = {
+            'index': index,
+            'habit_id': habit_id,
+            'date': log_date.isoformat(),
+            'completed': completed
+        }
+        key = (habit_id, log_date)
+        if key in desired:
+            # Aynı (habit_id, tarih) için önceki işlem, sonuncusu tarafından geçersiz kılınır
+            results[desired[key][0]].update({'status': 'superseded', 'superseded_by': index})
+        desired[key] = (index, completed)
+
+    # Tüm alışkanlıkların sahipliği tek sorguda doğrulanır
+    habit_ids = list({habit_id for habit_id, _ in desired})
+    owned = set()
+    # Arşivlenmiş alışkanlıkların kayıtları kullanıcı düzeyindeki toplamlara katılmaz
+    counted = set()
+    for chunk in _chunks(habit_ids):
+        for row in db.session.query(Habit.id, Habit.archived_at).filter(
+            Habit.user_id == user_id, Habit.id.in_(chunk), Habit.deleted_at.is_(None)
+        ):
+            owned.add(row.id)
+            if row.archived_at is None:
+                counted.add(row.id)
+
+    for key, (index, _) in list(desired.items()):
+        if key[0] not in owned:
+            results[index].update({'status': 'error', 'error': 'Habit not found'})
+            del desired[key]
+
+    # Mevcut kayıtlar (habit_id, tarih) çiftleri üzerinden toplu olarak okunur
+    keys = list(desired)
+    existing = {}
+    for chunk in _chunks(keys):
+        existing.update(
+            ((row.habit_id, row.completion_date), row.count)
+            for row in db.session.query(HabitLog.habit_id, HabitLog.completion_date, HabitLog.count).filter(
+                tuple_(HabitLog.habit_id, HabitLog.completion_date).in_(chunk)
+            )
+        )
+
+    to_insert = []
+    to_delete = []
+    changes = []
+    count_changes = []
+    deltas = {}
+    for key, (index, completed) in desired.items():
+        if completed and key not in existing:
+            to_insert.append({'habit_id': key[0], 'completed': True, 'completion_date': key[1], 'count': 1})
+            results[index]['status'] = 'created'
+            count_changes.append((key[0], key[1], 0, 1))
+        elif not completed and key in existing:
+            to_delete.append(key)
+            results[index]['status'] = 'deleted'
+            count_changes.append((key[0], key[1], existing[key], 0))
+        else:
+            results[index]['status'] = 'unchanged'
+            continue
+        changes.append((key[0], key[1], completed))
+        if key[0] in counted:
+            deltas[key[1]] = deltas.get(key[1], 0) + (1 if completed else -1)
+
+    if to_insert:
+        db.session.execute(HabitLog.__table__.insert(), to_insert)
+    for chunk in _chunks(to_delete):
+        HabitLog.query.filter(
+            tuple_(HabitLog.habit_id, HabitLog.completion_date).in_(chunk)
+        ).delete(synchronize_session=False)
+
+    if changes:
+        apply_deltas(user_id, deltas)
+        apply_bulk_changes(user_id, changes, counted)
+        bitmaps.apply_changes(user_id, changes)
+        schedules.apply_changes(user_id, count_changes)
+        leaderboards.update_user(user_id)
+
+    return results
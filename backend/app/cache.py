@@ -0,0 +1,207 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, Response
+from sqlalchemy import update
+from app import db
+from app.auth import get_current_user_id
+
+# Okuma uçları kullanıcı başına bir sürüm sayacıyla anahtarlanır. Her yazma rotası sayacı
+# artırır; böylece eski girdiler silinmeden geçersiz olur ve TTL ile kendiliğinden düşer.
+# Sayaç tüm süreçlerce paylaşılmalıdır (gunicorn işçileri, 'flask run-jobs', CLI komutları):
+# 'redis' arka ucunda Redis'te, 'memory' arka ucunda kullanıcının user satırında tutulur.
+
+
+class LRUCache:
+    """TTL destekli, thread-safe, süreç içi LRU önbellek."""
+
+    def __init__(self, max_entries=10000, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+
+class DatabaseVersions:
+    """
+    Sürüm sayaçlarını kullanıcının shard'ındaki user.cache_version sütununda tutar. Her önbellekli
+    istek birincil anahtarla tek bir okuma yapar; böylece başka bir süreçteki artış bir sonraki
+    istekte görülür. Oturum kullanıcının shard'ına yönlendirilmiş olmalıdır.
+    """
+
+    def counter(self, user_id):
+        from app.models import User
+
+        return db.session.query(User.cache_version).filter_by(id=user_id).scalar() or 0
+
+    def incr(self, user_id):
+        from app.models import User
+
+        # Artış veritabanında yapılır; eşzamanlı artışlar kaybolmaz. Yazma rotaları bunu kendi
+        # commit'lerinden sonra çağırır, bu yüzden sayaç ayrı kısa bir transaction'da güncellenir.
+        db.session.execute(update(User).where(User.id == user_id).values(cache_version=User.cache_version + 1))
+        db.session.commit()
+        return self.counter(user_id)
+
+
+class RedisCache:
+    """Redis uyumlu bir istemci (get/set/incr) üzerinden çalışan önbellek arka ucu."""
+
+    def __init__(self, client, default_ttl=300, prefix='habitmap:'):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or None)
+
+    def counter(self, key):
+        raw = self.client.get(self.prefix + key)
+        return int(raw) if raw is not None else 0
+
+    def incr(self, key):
+        return int(self.client.incr(self.prefix + key))
+
+
+class ResponseCache:
+    """Kullanıcı başına sürümlenmiş yanıt önbelleği ve ETag desteği."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.versions = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_BACKEND', 'memory')
+        app.config.setdefault('CACHE_DEFAULT_TTL', 300)
+        app.config.setdefault('CACHE_MAX_ENTRIES', 10000)
+        app.config.setdefault('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+        app.config.setdefault('CACHE_REDIS_CLIENT', None)
+
+        ttl = app.config['CACHE_DEFAULT_TTL']
+        if app.config['CACHE_BACKEND'] == 'none':
+            # Önbellek kapalı: görünümler her istekte çalışır (ölçüm ve hata ayıklama için)
+            self.backend = None
+        elif app.config['CACHE_BACKEND'] == 'redis':
+            client = app.config['CACHE_REDIS_CLIENT']
+            if client is None:
+                # redis sadece bu arka uç seçildiğinde gereklidir
+                import redis
+                client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+            self.backend = RedisCache(client, default_ttl=ttl)
+            self.versions = None
+        else:
+            # Yanıtlar süreç içinde saklanır; sürümler ise veritabanından okunur, bu yüzden başka
+            # bir süreçteki yazma bu süreçteki eski girdileri de hemen geçersiz kılar
+            self.backend = LRUCache(max_entries=app.config['CACHE_MAX_ENTRIES'], default_ttl=ttl)
+            self.versions = DatabaseVersions()
+
+        app.extensions['response_cache'] = self
+
+    def _version_key(self, user_id):
+        return f'user:{user_id}:version'
+
+    def get_version(self, user_id):
+        if self.backend is None:
+            return 0
+        if self.versions is not None:
+            return self.versions.counter(user_id)
+        return self.backend.counter(self._version_key(user_id))
+
+    def bump(self, user_id):
+        """Kullanıcının önbelleğe alınmış tüm yanıtlarını geçersiz kılar."""
+        if self.backend is None:
+            return 0
+        if self.versions is not None:
+            return self.versions.incr(user_id)
+        return self.backend.incr(self._version_key(user_id))
+
+    def cached(self, view):
+        """
+        GET rotaları için dekoratör. Yanıtı (kullanıcı, sürüm, gün, URL) anahtarıyla saklar,
+        ETag ekler ve If-None-Match eşleşirse görünümü hiç çalıştırmadan 304 döndürür.
+        """
+        from app.timezones import user_today
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_current_user_id()
+            if not user_id or self.backend is None:
+                return view(*args, **kwargs)
+
+            # Mevcut seri "bugün"e bağlı olduğundan kullanıcının yerel günü değişince anahtar da değişir
+            version = self.get_version(user_id)
+            fingerprint = f'{user_id}:{version}:{user_today(user_id).isoformat()}:{request.full_path}'
+            etag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+            if etag in request.if_none_match:
+                return self._finalize(Response(status=304), etag)
+
+            key = f'response:{etag}'
+            entry = self.backend.get(key)
+            if entry is None:
+                response = view(*args, **kwargs)
+                if isinstance(response, tuple):
+                    body, status = response
+                else:
+                    body, status = response, 200
+                if status != 200:
+                    return response
+                entry = {
+                    'body': body.get_data(as_text=True),
+                    'mimetype': body.mimetype,
+                    'headers': [
+                        [name, value] for name, value in body.headers.items()
+                        if name not in ('Content-Type', 'Content-Length')
+                    ]
+                }
+                self.backend.set(key, entry)
+
+            response = Response(entry['body'], status=200, mimetype=entry['mimetype'], headers=entry['headers'])
+            return self._finalize(response, etag)
+
+        return wrapper
+
+    def _finalize(self, response, etag):
+        response.set_etag(etag)
+        # Tarayıcı yanıtı saklayabilir ama her kullanımda ETag ile yeniden doğrulamalıdır
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+cache = ResponseCache()
@@ -0,0 +1,261 @@
+import time
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app import db
+from app.models import UserDirectory
+from app.sharding import use_shard
+
+
+def _target_user_ids(user_id):
+    if user_id is not None:
+        return [user_id]
+    return [row.user_id for row in db.session.query(UserDirectory.user_id).all()]
+
+
+@click.command('rebuild-streaks')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının serilerini yeniden oluştur.')
+@with_appcontext
+def rebuild_streaks_command(user_id):
+    """Seri tablolarını kayıt geçmişinden yeniden oluşturur."""
+    from app.streaks import rebuild_user_streaks
+
+    user_ids = _target_user_ids(user_id)
+    for uid in user_ids:
+        use_shard(uid)
+        rebuild_user_streaks(uid)
+        db.session.commit()
+
+    click.echo(f'Rebuilt streaks for {len(user_ids)} user(s).')
+
+
+@click.command('rebuild-rollups')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının günlük toplamlarını yeniden oluştur.')
+@with_appcontext
+def rebuild_rollups_command(user_id):
+    """user_daily_rollup tablosunu kayıt geçmişinden yeniden oluşturur."""
+    from app.rollup import rebuild_user_rollup
+
+    user_ids = _target_user_ids(user_id)
+    for uid in user_ids:
+        use_shard(uid)
+        rebuild_user_rollup(uid)
+        db.session.commit()
+
+    click.echo(f'Rebuilt daily rollups for {len(user_ids)} user(s).')
+
+
+@click.command('rebuild-bitmaps')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının bitmap\'lerini yeniden oluştur.')
+@with_appcontext
+def rebuild_bitmaps_command(user_id):
+    """habit_year_bitmap tablosunu kayıt geçmişinden yeniden oluşturur."""
+    from app.bitmaps import rebuild_user_bitmaps
+
+    user_ids = _target_user_ids(user_id)
+    for uid in user_ids:
+        use_shard(uid)
+        rebuild_user_bitmaps(uid)
+        db.session.commit()
+
+    click.echo(f'Rebuilt habit bitmaps for {len(user_ids)} user(s).')
+
+
+@click.command('rebuild-periods')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının haftalık program satırlarını yeniden oluştur.')
+@with_appcontext
+def rebuild_periods_command(user_id):
+    """habit_period tablosunu (beklenen/hedefe ulaşılan günler) kayıt geçmişinden yeniden oluşturur."""
+    from app.schedules import rebuild_user_periods
+
+    user_ids = _target_user_ids(user_id)
+    for uid in user_ids:
+        use_shard(uid)
+        rebuild_user_periods(uid)
+        db.session.commit()
+
+    click.echo(f'Rebuilt habit periods for {len(user_ids)} user(s).')
+
+
+@click.command('rebuild-search')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının arama indeksini yeniden oluştur.')
+@with_appcontext
+def rebuild_search_command(user_id):
+    """habit_fts arama indeksini habit tablosundan yeniden oluşturur."""
+    from app.search import rebuild_user_index
+
+    user_ids = _target_user_ids(user_id)
+    for uid in user_ids:
+        use_shard(uid)
+        rebuild_user_index(uid)
+        db.session.commit()
+
+    click.echo(f'Rebuilt search index for {len(user_ids)} user(s).')
+
+
+@click.command('purge-habits')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının silinen alışkanlıklarını temizle.')
+@with_appcontext
+def purge_habits_command(user_id):
+    """Silinmiş olarak işaretlenmiş alışkanlıkları kayıtlarıyla birlikte parça parça kalıcı olarak siler."""
+    from app.cache import cache
+    from app.purge import pending_purges, purge_habit
+
+    purged = removed = 0
+    for uid in _target_user_ids(user_id):
+        use_shard(uid)
+        habit_ids = pending_purges(uid)
+        for habit_id in habit_ids:
+            removed += purge_habit(uid, habit_id)
+        if habit_ids:
+            cache.bump(uid)
+            purged += len(habit_ids)
+
+    click.echo(f'Purged {purged} habit(s) and {removed} log(s).')
+
+
+@click.command('run-jobs')
+@click.option('--workers', type=int, default=None, help='İşçi iş parçacığı sayısı (varsayılan JOB_WORKERS).')
+@click.option('--once', is_flag=True, help='Hazır işleri çalıştırıp çık.')
+@with_appcontext
+def run_jobs_command(workers, once):
+    """Arka plan işlerini bu süreçte çalıştırır (web sunucusundan ayrı bir işçi süreci için)."""
+    from app.jobs import job_queue
+
+    if once:
+        count = job_queue.run_pending()
+        click.echo(f'Ran {count} job(s).')
+        return
+
+    workers = workers or current_app.config['JOB_WORKERS'] or 1
+    job_queue.start(workers)
+    click.echo(f'Running {workers} job worker(s). Press CTRL+C to quit.')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        job_queue.stop()
+
+
+@click.group('shards')
+def shards_command():
+    """Shard'lar arasında kullanıcı dağılımını yönetir."""
+
+
+@shards_command.command('status')
+@with_appcontext
+def shards_status_command():
+    """Shard başına kullanıcı sayısını ve yerinde olmayan kullanıcıları gösterir."""
+    from app.sharding import placement, shards
+
+    counts = dict(db.session.query(UserDirectory.shard, db.func.count()).group_by(UserDirectory.shard).all())
+    misplaced = sum(
+        1 for user_id, shard in db.session.query(UserDirectory.user_id, UserDirectory.shard)
+        if shard != placement(user_id, shards.count)
+    )
+    for shard in range(shards.count):
+        click.echo(f'shard {shard}: {counts.get(shard, 0)} user(s)')
+    click.echo(f'{misplaced} user(s) to move on rebalance.')
+
+
+@shards_command.command('move')
+@click.option('--user-id', type=int, required=True)
+@click.option('--to', 'target', type=int, required=True, help='Hedef shard numarası.')
+@with_appcontext
+def shards_move_command(user_id, target):
+    """Bir kullanıcının tüm verisini başka bir shard'a taşır."""
+    from app.sharding import move_user, shards
+
+    if not 0 <= target < shards.count:
+        raise click.BadParameter(f'Shard must be between 0 and {shards.count - 1}', param_hint='--to')
+    rows = move_user(user_id, target)
+    click.echo(f'Moved user {user_id} to shard {target} ({rows} row(s)).')
+
+
+@shards_command.command('rebalance')
+@click.option('--dry-run', is_flag=True, help='Sadece taşınacak kullanıcıları listele.')
+@with_appcontext
+def shards_rebalance_command(dry_run):
+    """
+    Shard sayısı değiştikten sonra (veya tek veritabanından geçişte) her kullanıcıyı
+    user_id özetinin gösterdiği shard'a taşır. Taşınan kullanıcının yazmaları, diğer
+    süreçlerin önbelleği yenilenene kadar (SHARD_DIRECTORY_TTL) eski shard'a gidebileceğinden
+    yazmalar durdurulmuşken çalıştırılmalıdır.
+    """
+    from app.sharding import move_user, placement, shards
+
+    entries = db.session.query(UserDirectory.user_id, UserDirectory.shard).all()
+    moves = [(user_id, placement(user_id, shards.count)) for user_id, shard in entries
+             if shard != placement(user_id, shards.count)]
+
+    rows = 0
+    for user_id, target in moves:
+        if dry_run:
+            click.echo(f'user {user_id} -> shard {target}')
+            continue
+        rows += move_user(user_id, target)
+    if not dry_run:
+        click.echo(f'Moved {len(moves)} user(s) ({rows} row(s)).')
+
+
+@shards_command.command('upgrade')
+@click.option('--revision', default='head')
+@with_appcontext
+def shards_upgrade_command(revision):
+    """Genel veritabanını ve tüm shard'ları verilen göç sürümüne yükseltir."""
+    from flask_migrate import upgrade
+
+    upgrade(revision=revision, x_arg=['shard=all'])
+
+
+@click.group('leaderboards')
+def leaderboards_command():
+    """Kullanıcılar arası sıralama tablolarını yönetir."""
+
+
+@leaderboards_command.command('reconcile')
+@click.option('--full', is_flag=True, help='Tüm kullanıcıların puanlarını ve puan sayaçlarını baştan hesapla.')
+@with_appcontext
+def leaderboards_reconcile_command(full):
+    """
+    Yazım olmadan değişen puanları (kopan seriler, 30 günlük pencereden çıkan günler) yeniler.
+    Cron ile periyodik olarak (ör. saatte bir) çalıştırılmalıdır.
+    """
+    from datetime import datetime, timedelta
+    from app.leaderboards import expired_user_ids, rebuild_score_counts, update_user
+    from app.sharding import each_shard
+
+    if full:
+        user_ids = _target_user_ids(None)
+        for uid in user_ids:
+            use_shard(uid)
+            update_user(uid)
+            db.session.commit()
+        # Sayaçlardaki olası sapmalar satırlardan yeniden sayılarak düzeltilir
+        for _ in each_shard():
+            rebuild_score_counts()
+            db.session.commit()
+        click.echo(f'Reconciled leaderboards for {len(user_ids)} user(s).')
+        return
+
+    # Kullanıcının saat dilimindeki "bugün", UTC gününden en fazla bir gün ileride olabilir
+    cutoff = datetime.utcnow().date() + timedelta(days=1)
+    refreshed = 0
+    for _ in each_shard():
+        for uid in expired_user_ids(cutoff):
+            update_user(uid)
+            db.session.commit()
+            refreshed += 1
+    click.echo(f'Refreshed leaderboard scores for {refreshed} user(s).')
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_streaks_command)
+    app.cli.add_command(rebuild_rollups_command)
+    app.cli.add_command(rebuild_bitmaps_command)
+    app.cli.add_command(rebuild_periods_command)
+    app.cli.add_command(rebuild_search_command)
+    app.cli.add_command(purge_habits_command)
+    app.cli.add_command(run_jobs_command)
+    app.cli.add_command(shards_command)
+    app.cli.add_command(leaderboards_command)
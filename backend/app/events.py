@@ -0,0 +1,210 @@
+import itertools
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+# Yazma rotaları değişiklikleri küçük, kullanıcı başına olaylar olarak yayınlar; /events uç noktası
+# bunları Server-Sent Events ile açık sekmelere iter. 'memory' arka ucu olayları sadece bu süreç
+# içinde dağıtır; 'redis' arka ucu Redis pub/sub üzerinden tüm süreçlere ulaştırır.
+
+CHANNEL = 'habitmap:events'
+
+
+def format_event(event_id, event, data):
+    return f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+class EventBroker:
+    """Kullanıcı başına abonelikler, kısa bir olay geçmişi ve SSE akışı."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.redis = None
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._history = OrderedDict()
+        self._seq = itertools.count(1)
+        # Olay id'leri süreç belirtecini içerir; başka bir sürece yeniden bağlanan istemci
+        # tanınmayan bir id gönderir ve eksik olayları tahmin etmek yerine 'resync' alır
+        self._token = uuid.uuid4().hex[:8]
+        self._listener = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_BACKEND', 'memory')
+        app.config.setdefault('EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+        app.config.setdefault('EVENTS_REDIS_CLIENT', None)
+        app.config.setdefault('EVENTS_KEEPALIVE', 15)
+        app.config.setdefault('EVENTS_STREAM_TIMEOUT', 300)
+        app.config.setdefault('EVENTS_QUEUE_SIZE', 256)
+        app.config.setdefault('EVENTS_HISTORY', 50)
+        app.config.setdefault('EVENTS_HISTORY_USERS', 1000)
+
+        self.backend = app.config['EVENTS_BACKEND']
+        self.redis = None
+        if self.backend == 'none':
+            self.backend = None
+        elif self.backend == 'redis':
+            client = app.config['EVENTS_REDIS_CLIENT']
+            if client is None:
+                # redis sadece bu arka uç seçildiğinde gereklidir
+                import redis
+                client = redis.Redis.from_url(app.config['EVENTS_REDIS_URL'])
+            self.redis = client
+
+        self.queue_size = app.config['EVENTS_QUEUE_SIZE']
+        self.history_size = app.config['EVENTS_HISTORY']
+        self.history_users = app.config['EVENTS_HISTORY_USERS']
+        self.keepalive = app.config['EVENTS_KEEPALIVE']
+        self.stream_timeout = app.config['EVENTS_STREAM_TIMEOUT']
+        app.extensions['event_broker'] = self
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    @property
+    def distributed(self):
+        """Olaylar diğer süreçlerdeki abonelere de gider mi (redis arka ucu)?"""
+        return self.redis is not None
+
+    def should_publish(self, user_id):
+        """
+        Kullanıcı için olay yükü oluşturmaya değer mi? 'memory' arka ucunda sadece bu süreçte açık
+        akışı varsa True; yoksa kullanıcının olay geçmişi silinir, böylece sonradan Last-Event-ID ile
+        yeniden bağlanan istemci kaçırdığı olaylar yerine 'resync' alır. 'redis' arka ucunda
+        abonelerin hangi süreçte olduğu bilinmediğinden her zaman True.
+        """
+        if self.backend is None:
+            return False
+        if self.redis is not None:
+            return True
+        with self._lock:
+            if self._subscribers.get(user_id):
+                return True
+            self._history.pop(user_id, None)
+            return False
+
+    def publish(self, user_id, event, data):
+        """Olayı kullanıcının tüm açık akışlarına gönderir. Commit'ten sonra çağrılmalıdır."""
+        if self.backend is None:
+            return
+        if self.redis is not None:
+            try:
+                self.redis.publish(CHANNEL, json.dumps({'user_id': user_id, 'event': event, 'data': data}))
+            except Exception as e:
+                # Olaylar en iyi çaba ile iletilir; yazma isteği bu yüzden başarısız olmamalı
+                print(f"Error publishing event: {e}")
+            return
+        self._dispatch(user_id, event, data)
+
+    def _dispatch(self, user_id, event, data):
+        event_id = f'{self._token}-{next(self._seq)}'
+        message = format_event(event_id, event, data)
+        with self._lock:
+            history = self._history.get(user_id)
+            if history is None:
+                history = self._history[user_id] = deque(maxlen=self.history_size)
+                if len(self._history) > self.history_users:
+                    self._history.popitem(last=False)
+            else:
+                self._history.move_to_end(user_id)
+            history.append((event_id, message))
+
+            for subscriber in self._subscribers.get(user_id, ()):
+                self._offer(subscriber, message)
+
+    def _offer(self, subscriber, message):
+        try:
+            subscriber.put_nowait(message)
+        except queue.Full:
+            # Yavaş istemci: bekleyen olaylar atılır, istemci tam yeniden yükleme yapar
+            with subscriber.mutex:
+                subscriber.queue.clear()
+            subscriber.put_nowait(format_event(f'{self._token}-{next(self._seq)}', 'resync', {}))
+
+    def subscribe(self, user_id, last_event_id=None):
+        """
+        Kullanıcı için bir olay kuyruğu döndürür. last_event_id verilirse (EventSource yeniden
+        bağlanması) sonrasındaki olaylar geçmişten yeniden oynatılır; bulunamazsa 'resync' gönderilir.
+        """
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+            if last_event_id:
+                history = list(self._history.get(user_id, ()))
+                ids = [event_id for event_id, _ in history]
+                if last_event_id in ids:
+                    for _, message in history[ids.index(last_event_id) + 1:]:
+                        self._offer(subscriber, message)
+                else:
+                    self._offer(subscriber, format_event(f'{self._token}-{next(self._seq)}', 'resync', {}))
+
+        if self.redis is not None:
+            self._start_listener()
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def _start_listener(self):
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(target=self._listen, name='event-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        # Diğer süreçlerin yayınladığı olaylar bu süreçteki abonelere dağıtılır
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                for message in pubsub.listen():
+                    payload = json.loads(message['data'])
+                    self._dispatch(payload['user_id'], payload['event'], payload['data'])
+            except Exception as e:
+                print(f"Error in event listener: {e}")
+                time.sleep(1)
+
+    def stream(self, user_id, last_event_id=None):
+        """
+        SSE gövdesini üreten yinelenebilir nesneyi döndürür. Abonelik hemen yapılır; böylece
+        yanıt başlamadan yayınlanan olaylar kaçmaz. Akış veritabanı bağlantısı tutmaz.
+        """
+        return EventStream(self, user_id, self.subscribe(user_id, last_event_id))
+
+
+class EventStream:
+    # Bağlantı akış hiç başlamadan kapansa bile close() aboneliği kaldırır
+    def __init__(self, broker, user_id, subscriber):
+        self.broker = broker
+        self.user_id = user_id
+        self.subscriber = subscriber
+
+    def __iter__(self):
+        deadline = time.monotonic() + self.broker.stream_timeout
+        try:
+            yield 'retry: 3000\n: connected\n\n'
+            # Akış belirli aralıklarla kapatılır; EventSource Last-Event-ID ile yeniden bağlanır
+            while time.monotonic() < deadline:
+                try:
+                    yield self.subscriber.get(timeout=self.broker.keepalive)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+        finally:
+            self.close()
+
+    def close(self):
+        self.broker.unsubscribe(self.user_id, self.subscriber)
+
+events = EventBroker()
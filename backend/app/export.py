@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import select
+from app import db
+from app.models import Habit, HabitLog
+
+# Dışa aktarma, satırları server-side cursor üzerinden (yield_per) parça parça okur ve
+# her parçayı hemen yanıta yazar; bellek kullanımı geçmişin boyutundan bağımsız kalır.
+
+EXPORT_COLUMNS = ['record_type', 'habit_id', 'name', 'description', 'created_at', 'completion_date', 'completed', 'count']
+YIELD_PER = 1000
+
+
+def _export_rows(user_id, start_date=None, end_date=None):
+    # Arşivlenen alışkanlıklar dışa aktarılır, silinmiş olanlar aktarılmaz
+    habits = select(Habit.id, Habit.name, Habit.description, Habit.created_at).where(
+        Habit.user_id == user_id, Habit.deleted_at.is_(None)
+    ).order_by(Habit.id)
+    for row in db.session.execute(habits.execution_options(yield_per=YIELD_PER)):
+        yield {
+            'record_type': 'habit',
+            'habit_id': row.id,
+            'name': row.name,
+            'description': row.description,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'completion_date': None,
+            'completed': None,
+            'count': None
+        }
+
+    logs = select(HabitLog.habit_id, HabitLog.completion_date, HabitLog.completed, HabitLog.count).join(Habit).where(
+        Habit.user_id == user_id, Habit.deleted_at.is_(None)
+    )
+    if start_date:
+        logs = logs.where(HabitLog.completion_date >= start_date)
+    if end_date:
+        logs = logs.where(HabitLog.completion_date <= end_date)
+    logs = logs.order_by(HabitLog.habit_id, HabitLog.completion_date)
+
+    for row in db.session.execute(logs.execution_options(yield_per=YIELD_PER)):
+        yield {
+            'record_type': 'log',
+            'habit_id': row.habit_id,
+            'name': None,
+            'description': None,
+            'created_at': None,
+            'completion_date': row.completion_date.isoformat() if row.completion_date else None,
+            'completed': row.completed,
+            'count': row.count
+        }
+
+
+def _csv_chunks(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for i, record in enumerate(records, 1):
+        writer.writerow(record)
+        if i % YIELD_PER == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(records):
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= YIELD_PER:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def generate_export(user_id, fmt, start_date=None, end_date=None, compress=False):
+    """
+    Kullanıcının alışkanlık ve kayıt geçmişini CSV veya NDJSON olarak parça parça üretir.
+
+    Argümanlar:
+        fmt (str): 'csv' veya 'ndjson'.
+        compress (bool): True ise çıktı gzip akışı olarak sıkıştırılır.
+
+    Döndürür:
+        iterator[str | bytes]: Yanıta doğrudan yazılabilecek parçalar.
+    """
+    records = _export_rows(user_id, start_date, end_date)
+    chunks = _csv_chunks(records) if fmt == 'csv' else _ndjson_chunks(records)
+    return _gzip_chunks(chunks) if compress else chunks
@@ -24,3 +24,24 @@ def format_heatmap_data(logs):
             heatmap_data[date_str] += 1
             
     return dict(heatmap_data)
+
+def compute_runs(dates):
+    """
+    Tamamlanma tarihlerini ardışık günlerden oluşan serilere (run) ayırır.
+
+    Argümanlar:
+        dates (iterable[date]): Tamamlanma tarihleri. Sıralı veya benzersiz olması gerekmez.
+
+    Döndürür:
+        list[tuple[date, date]]: Eskiden yeniye sıralı (başlangıç, bitiş) çiftleri.
+              Örnek: [(date(2025, 10, 1), date(2025, 10, 3))]
+    """
+    runs = []
+
+    for day in sorted(set(dates)):
+        if runs and (day - runs[-1][1]).days == 1:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+
+    return runs
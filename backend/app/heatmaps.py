@@ -0,0 +1,65 @@
+from flask import current_app
+from sqlalchemy import func
+from app import db, bitmaps
+from app.models import Habit, HabitLog
+
+
+def query_heatmaps(user_id, habit_id=None, start_date=None, end_date=None, habit_ids=None):
+    """
+    Kullanıcının alışkanlık bazındaki ve toplam ısı haritalarını tek bir gruplanmış sorguyla getirir.
+
+    Argümanlar:
+        user_id (int): Sahip kullanıcı.
+        habit_id (int, opsiyonel): Verilirse sadece bu alışkanlık sorgulanır.
+        habit_ids (list[int], opsiyonel): Verilirse sadece bu alışkanlıklar sorgulanır.
+        start_date, end_date (date, opsiyonel): Dahil edilecek tarih aralığı.
+
+    Döndürür:
+        tuple[dict, dict]: ({habit_id: {'YYYY-AA-GG': sayı}}, {'YYYY-AA-GG': toplam sayı})
+    """
+    if current_app.config['HABIT_STORAGE_MODE'] == 'bitmap':
+        return _query_bitmap_heatmaps(user_id, habit_id, start_date, end_date, habit_ids)
+
+    query = db.session.query(
+        HabitLog.habit_id, HabitLog.completion_date, func.count(HabitLog.id)
+    ).join(Habit).filter(
+        Habit.user_id == user_id,
+        HabitLog.completed.is_(True)
+    )
+    if habit_id is not None:
+        query = query.filter(HabitLog.habit_id == habit_id)
+    if habit_ids is not None:
+        query = query.filter(HabitLog.habit_id.in_(habit_ids))
+    if start_date:
+        query = query.filter(HabitLog.completion_date >= start_date)
+    if end_date:
+        query = query.filter(HabitLog.completion_date <= end_date)
+
+    per_habit = {}
+    total = {}
+    for row_habit_id, completion_date, count in query.group_by(HabitLog.habit_id, HabitLog.completion_date):
+        date_str = completion_date.isoformat()
+        per_habit.setdefault(row_habit_id, {})[date_str] = count
+        total[date_str] = total.get(date_str, 0) + count
+
+    return per_habit, total
+
+
+def _query_bitmap_heatmaps(user_id, habit_id, start_date, end_date, habit_ids):
+    if habit_id is not None:
+        habit_ids = [habit_id]
+    loaded = bitmaps.load(
+        user_id, habit_ids=habit_ids,
+        start_year=start_date.year if start_date else None,
+        end_year=end_date.year if end_date else None
+    )
+
+    per_habit = {}
+    total = {}
+    for row_habit_id, year_bits in loaded.items():
+        year_bits = bitmaps.clip(year_bits, start_date, end_date)
+        if year_bits:
+            per_habit[row_habit_id] = bitmaps.heatmap(year_bits)
+            bitmaps.heatmap(year_bits, total)
+
+    return per_habit, total
@@ -0,0 +1,170 @@
+import hmac
+import logging
+import threading
+import time
+from flask import current_app, g, jsonify, request, has_request_context, Response
+from sqlalchemy import event
+
+# İstek başına süre ve SQL sorgu sayısını ölçer; sonuçları Prometheus metin formatında /metrics
+# üzerinden ve her yanıtta Server-Timing başlığıyla sunar. /metrics METRICS_TOKEN ile korunur;
+# token ayarlanmamışsa sadece aynı makineden (vekil sunucu üzerinden gelmeyen) isteklere açıktır.
+# Eşik değerini aşan sorgular loglanır; bağlı parametreler kişisel veri (e-posta, parola özeti,
+# alışkanlık adı) içerebileceğinden değerleri değil sadece sayıları loglanır.
+
+logger = logging.getLogger(__name__)
+
+# Saniye cinsinden histogram kova sınırları
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class Instrumentation:
+    def __init__(self, app=None, db=None):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.queries = {}
+        self.query_time = {}
+        self.slow_queries = 0
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', 100)
+        app.config.setdefault('METRICS_TOKEN', None)
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        self.slow_query_threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['instrumentation'] = self
+
+    def _before_request(self):
+        g.request_started = time.perf_counter()
+        g.query_count = 0
+        g.query_time = 0.0
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        if has_request_context() and 'query_count' in g:
+            g.query_count += 1
+            g.query_time += elapsed
+        if elapsed >= self.slow_query_threshold:
+            with self._lock:
+                self.slow_queries += 1
+            endpoint = request.endpoint if has_request_context() else None
+            # executemany'de parametre kümesi (satır) sayısı, diğerlerinde parametre sayısı
+            param_count = len(parameters) if parameters else 0
+            logger.warning('Slow query (%.1f ms, endpoint=%s, executemany=%s): %s params=<%d redacted>',
+                           elapsed * 1000, endpoint, executemany, statement, param_count)
+
+    def _after_request(self, response):
+        if 'request_started' not in g:
+            return response
+
+        elapsed = time.perf_counter() - g.request_started
+        endpoint = request.endpoint or 'unknown'
+        if endpoint != 'metrics':
+            key = (endpoint, request.method, response.status_code)
+            with self._lock:
+                self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+                self.queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(g.query_count)
+                self.query_time[key] = self.query_time.get(key, 0.0) + g.query_time
+
+        response.headers.add(
+            'Server-Timing',
+            f'app;dur={elapsed * 1000:.1f}, db;dur={g.query_time * 1000:.1f};desc="{g.query_count} queries"'
+        )
+        return response
+
+    def render(self):
+        lines = [
+            '# HELP http_request_duration_seconds Request latency per endpoint.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            for (endpoint, method, status), histogram in sorted(self.latency.items()):
+                labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+                lines.extend(histogram.render('http_request_duration_seconds', labels))
+
+            lines += [
+                '# HELP http_request_sql_queries SQL statements issued per request.',
+                '# TYPE http_request_sql_queries histogram',
+            ]
+            for (endpoint, method, status), histogram in sorted(self.queries.items()):
+                labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+                lines.extend(histogram.render('http_request_sql_queries', labels))
+
+            lines += [
+                '# HELP http_request_sql_seconds_total Time spent in SQL per endpoint.',
+                '# TYPE http_request_sql_seconds_total counter',
+            ]
+            for (endpoint, method, status), total in sorted(self.query_time.items()):
+                labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+                lines.append(f'http_request_sql_seconds_total{{{labels}}} {total}')
+
+            lines += [
+                '# HELP sql_slow_queries_total Queries slower than SLOW_QUERY_THRESHOLD_MS.',
+                '# TYPE sql_slow_queries_total counter',
+                f'sql_slow_queries_total {self.slow_queries}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def _metrics_allowed(self):
+        token = current_app.config['METRICS_TOKEN']
+        if token:
+            header = request.headers.get('Authorization', '')
+            return header.startswith('Bearer ') and hmac.compare_digest(
+                header[len('Bearer '):].strip().encode('utf-8'), token.encode('utf-8')
+            )
+        # Ters vekil sunucu arkasında uzak adres vekilin adresidir; yönlendirilen istekler reddedilir
+        return request.remote_addr in LOOPBACK_ADDRESSES and 'X-Forwarded-For' not in request.headers
+
+    def metrics_view(self):
+        if not self._metrics_allowed():
+            return jsonify({'error': 'Unauthorized'}), 401
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Job
+from app.sharding import use_shard
+
+# Ağır işler (raporlar, dışa aktarmalar, yeniden oluşturmalar) istek içinde değil, job tablosu
+# üzerinden çalışan işçi iş parçacıklarında yürütülür. İşler atomik bir "compare-and-set"
+# UPDATE ile sahiplenildiğinden aynı veritabanını kullanan birden fazla süreç güvenle çalışabilir.
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobQueue:
+    def __init__(self, app=None):
+        self.handlers = {}
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('JOB_WORKERS', 2)
+        app.config.setdefault('JOB_MAX_ATTEMPTS', 3)
+        app.config.setdefault('JOB_RETRY_BACKOFF', 5)
+        app.config.setdefault('JOB_POLL_INTERVAL', 2.0)
+        app.config.setdefault('JOB_STALE_AFTER', 600)
+        app.config.setdefault('JOB_RESULTS_DIR', os.path.join(app.instance_path, 'jobs'))
+
+        app.extensions['job_queue'] = self
+
+    def handler(self, kind, validate=None):
+        """
+        Bir iş türü için çalıştırıcı kaydeden dekoratör. Çalıştırıcı (user_id, params, job)
+        alır ve JSON'a çevrilebilir bir sonuç döndürür. validate verilirse, iş kuyruğa
+        eklenmeden önce parametreleri doğrular (hatalı girdide ValueError fırlatır).
+        """
+        def decorator(fn):
+            self.handlers[kind] = {'run': fn, 'validate': validate}
+            return fn
+        return decorator
+
+    def enqueue(self, user_id, kind, params=None):
+        """
+        İşi kuyruğa ekler. Aynı kullanıcı için aynı tür ve parametrelerle bekleyen veya
+        çalışan bir iş varsa yenisi oluşturulmaz, mevcut iş döndürülür.
+
+        Döndürür:
+            tuple: (Job, created)
+        """
+        if kind not in self.handlers:
+            raise ValueError(f'Unknown job kind: {kind}')
+
+        validate = self.handlers[kind]['validate']
+        params = validate(params or {}) if validate else (params or {})
+        encoded, dedup_key = encode_params(kind, params)
+
+        for _ in range(3):
+            existing = Job.query.filter(
+                Job.user_id == user_id, Job.dedup_key == dedup_key, Job.status.in_(ACTIVE_STATUSES)
+            ).first()
+            if existing:
+                return existing, False
+
+            job = Job(
+                user_id=user_id, kind=kind, params=encoded, dedup_key=dedup_key,
+                max_attempts=current_app.config['JOB_MAX_ATTEMPTS']
+            )
+            db.session.add(job)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Eşzamanlı bir istek aynı işi az önce ekledi; onu döndür
+                db.session.rollback()
+                continue
+
+            self._wakeup.set()
+            self.start(current_app.config['JOB_WORKERS'])
+            return job, True
+
+        raise RuntimeError('Could not enqueue job')
+
+    def start(self, workers, app=None):
+        """İşçi iş parçacıklarını (henüz başlatılmadıysa) başlatır. workers=0 ise hiçbir şey yapmaz."""
+        app = app or current_app._get_current_object()
+        with self._start_lock:
+            if self._threads or workers <= 0:
+                return
+            self._stop.clear()
+            for i in range(workers):
+                thread = threading.Thread(target=self._worker_loop, args=(app,), name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def start_on_boot(self, app):
+        """
+        Sunucu süreci açılırken JOB_WORKERS kadar işçi başlatır; yeniden başlatmadan önce kuyrukta
+        kalan işler (ör. purge_habit) yeni bir iş eklenmesini beklemez. 'flask' komutlarında
+        (db upgrade, run-jobs, ...) başlatılmaz; Flask CLI her komutta FLASK_RUN_FROM_CLI ayarlar.
+        """
+        if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+            return
+        self.start(app.config['JOB_WORKERS'], app)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self, app):
+        while not self._stop.is_set():
+            try:
+                with app.app_context():
+                    ran = self.run_once()
+            except Exception as e:
+                print(f"Error in job worker: {e}")
+                ran = False
+            if not ran:
+                self._wakeup.wait(app.config['JOB_POLL_INTERVAL'])
+                self._wakeup.clear()
+
+    def _claim(self):
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=current_app.config['JOB_STALE_AFTER'])
+        # Çöken bir işçinin uzun süredir "running" bıraktığı işler de yeniden alınabilir
+        claimable = or_(
+            and_(Job.status == 'queued', Job.run_after <= now),
+            and_(Job.status == 'running', Job.started_at < stale)
+        )
+
+        # Seçim ve sahiplenme tek bir UPDATE ... RETURNING ifadesidir; SQLite'ta okuma
+        # işleminin yazmaya yükseltilmesi sırasında oluşan "database is locked" hatası önlenir
+        next_job = select(Job.id).where(claimable).order_by(Job.run_after, Job.id).limit(1).scalar_subquery()
+        job_id = db.session.execute(
+            update(Job).where(Job.id == next_job, claimable).values(
+                status='running', started_at=now, attempts=Job.attempts + 1
+            ).returning(Job.id).execution_options(synchronize_session=False)
+        ).scalar()
+        db.session.commit()
+        return db.session.get(Job, job_id) if job_id is not None else None
+
+    def run_once(self):
+        """Sıradaki bir işi sahiplenip çalıştırır. İş yoksa False döner. Uygulama bağlamı gerektirir."""
+        job = self._claim()
+        if job is None:
+            return False
+
+        job_id, kind = job.id, job.kind
+        try:
+            # İş satırı genel veritabanında, kullanıcının verisi kendi shard'ındadır
+            if not use_shard(job.user_id):
+                raise LookupError(f'Unknown user: {job.user_id}')
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise LookupError(f'Unknown job kind: {kind}')
+            result = handler['run'](job.user_id, json.loads(job.params), job)
+
+            job.status = 'succeeded'
+            job.result = json.dumps(result) if result is not None else None
+            job.error = None
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error in job {job_id} ({kind}): {e}")
+
+            job = db.session.get(Job, job_id)
+            job.error = f'{type(e).__name__}: {e}'
+            if job.attempts < job.max_attempts:
+                # Üstel geri çekilme ile yeniden dene
+                backoff = current_app.config['JOB_RETRY_BACKOFF'] * 2 ** (job.attempts - 1)
+                job.status = 'queued'
+                job.run_after = datetime.utcnow() + timedelta(seconds=backoff)
+            else:
+                job.status = 'failed'
+                job.finished_at = datetime.utcnow()
+            db.session.commit()
+        return True
+
+    def run_pending(self, limit=None):
+        """Hazır işleri bu iş parçacığında sırayla çalıştırır (CLI ve testler için)."""
+        count = 0
+        while (limit is None or count < limit) and self.run_once():
+            count += 1
+        return count
+
+
+job_queue = JobQueue()
+
+
+def encode_params(kind, params):
+    """İş parametrelerinin saklanan JSON'u ve aynı işleri birleştiren dedup anahtarı."""
+    encoded = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return encoded, f'{kind}:{hashlib.sha1(encoded.encode("utf-8")).hexdigest()}'
+
+
+def remap_job_habit_ids(user_id, habit_ids):
+    """
+    Kullanıcı başka bir shard'a taşınırken alışkanlık id'leri yeniden verilir; kuyrukta bekleyen
+    işlerin parametrelerindeki habit_id yeni id'ye çevrilir. Commit çağırana bırakılır.
+
+    Argümanlar:
+        habit_ids (dict): Eski alışkanlık id'si -> yeni id.
+    """
+    if not habit_ids:
+        return
+    for job in Job.query.filter(Job.user_id == user_id, Job.status == 'queued'):
+        params = json.loads(job.params)
+        if params.get('habit_id') in habit_ids:
+            params['habit_id'] = habit_ids[params['habit_id']]
+            job.params, job.dedup_key = encode_params(job.kind, params)
+
+
+# İş türleri
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def _validate_range(params):
+    start, end = params.get('from'), params.get('to')
+    try:
+        _parse_date(start)
+        _parse_date(end)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid date format. Use YYYY-MM-DD')
+    return {'from': start or None, 'to': end or None}
+
+
+def _validate_export(params):
+    fmt = params.get('format', 'csv')
+    if fmt not in ('csv', 'ndjson'):
+        raise ValueError('Invalid format. Use csv or ndjson')
+    return dict(_validate_range(params), format=fmt, gzip=bool(params.get('gzip')))
+
+
+REBUILD_TARGETS = ('streaks', 'rollups', 'bitmaps', 'periods', 'search', 'leaderboards')
+
+
+def _validate_rebuild(params):
+    targets = params.get('targets') or list(REBUILD_TARGETS)
+    if not isinstance(targets, list) or not set(targets) <= set(REBUILD_TARGETS):
+        raise ValueError(f'targets must be a subset of {", ".join(REBUILD_TARGETS)}')
+    return {'targets': sorted(set(targets))}
+
+
+@job_queue.handler('report', validate=_validate_range)
+def run_report(user_id, params, job):
+    from app.reports import build_report
+
+    return build_report(user_id, _parse_date(params['from']), _parse_date(params['to']))
+
+
+@job_queue.handler('export', validate=_validate_export)
+def run_export(user_id, params, job):
+    from app.export import generate_export
+
+    fmt, compress = params['format'], params['gzip']
+    filename = f'habits.{fmt}' + ('.gz' if compress else '')
+    if compress:
+        mimetype = 'application/gzip'
+    else:
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+
+    results_dir = current_app.config['JOB_RESULTS_DIR']
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f'{job.id}-{filename}')
+
+    # Parçalar dosyaya akıtılır; yeniden denemede dosya baştan yazılır
+    chunks = generate_export(user_id, fmt, _parse_date(params['from']), _parse_date(params['to']), compress)
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+
+    return {'path': path, 'filename': filename, 'mimetype': mimetype}
+
+
+@job_queue.handler('rebuild', validate=_validate_rebuild)
+def run_rebuild(user_id, params, job):
+    from app.bitmaps import rebuild_user_bitmaps
+    from app.cache import cache
+    from app.events import events
+    from app.leaderboards import update_user
+    from app.rollup import rebuild_user_rollup
+    from app.schedules import rebuild_user_periods
+    from app.search import rebuild_user_index
+    from app.streaks import rebuild_user_streaks
+
+    rebuilders = {
+        'streaks': rebuild_user_streaks,
+        'rollups': rebuild_user_rollup,
+        'bitmaps': rebuild_user_bitmaps,
+        'periods': rebuild_user_periods,
+        'search': rebuild_user_index
+    }
+    for target in params['targets']:
+        if target in rebuilders:
+            rebuilders[target](user_id)
+    # Sıralama puanları seri ve günlük toplamlardan türetilir; onlardan sonra hesaplanır
+    if {'streaks', 'rollups', 'leaderboards'} & set(params['targets']):
+        update_user(user_id)
+    db.session.commit()
+    cache.bump(user_id)
+    # Seriler ve toplamlar değişmiş olabilir; açık sekmeler verilerini yeniden yükler
+    events.publish(user_id, 'resync', {})
+
+    return {'rebuilt': params['targets']}
+
+
+def _validate_purge(params):
+    habit_id = params.get('habit_id')
+    if not isinstance(habit_id, int) or isinstance(habit_id, bool):
+        raise ValueError('habit_id must be an integer')
+    return {'habit_id': habit_id}
+
+
+@job_queue.handler('purge_habit', validate=_validate_purge)
+def run_purge_habit(user_id, params, job):
+    from app.cache import cache
+    from app.purge import purge_habit
+
+    # Sadece silinmiş olarak işaretlenmiş alışkanlıklar temizlenir; diğerleri için iş bir şey yapmaz
+    removed = purge_habit(user_id, params['habit_id'])
+    cache.bump(user_id)
+
+    return {'habit_id': params['habit_id'], 'removed_logs': removed}
@@ -0,0 +1,87 @@
+import re
+from flask.json.provider import DefaultJSONProvider
+
+# JSON yanıtları varsayılan olarak orjson ile serileştirilir (JSON_ENCODER = 'orjson'); orjson
+# kurulu değilse veya JSON_ENCODER = 'stdlib' ise Flask'ın standart json sağlayıcısı kullanılır.
+# Çıktı, standart sağlayıcının çıktısıyla bayt bayt aynıdır:
+#   - anahtarlar sıralanır ve ayırıcılar sıkıdır (',' ve ':'),
+#   - ASCII dışı karakterler (ve DEL) json.dumps(ensure_ascii=True) gibi \uXXXX olarak kaçırılır,
+#   - tarihler, dataclass'lar ve alt sınıflar Flask'ın default() fonksiyonuna bırakılır.
+# orjson'un farklı yazdığı durumlarda (çok küçük/büyük float'lar, str olmayan sözlük anahtarları,
+# 64 bit dışı tamsayılar, girintili çıktı) o yanıt standart json ile üretilir. Sadece yanıtlar
+# hızlandırılır; app.json.dumps/loads standart json'dur. NaN ve sonsuz değerler (uygulama
+# üretmez; standart json'da da geçersizdir) orjson'da null olarak yazılır.
+
+# ensure_ascii'nin kaçırdığı ama orjson'un olduğu gibi bıraktığı karakterler
+_UNESCAPED = re.compile('[\x7f-\U0010ffff]')
+# Float yazımı sadece |x| < 1e-4 ve |x| >= 1e16 aralıklarında farklıdır: orjson 1e16 / 1e-9 yazar
+# (json 1e+16 / 1e-09) veya üs yerine 0.0000... yazar (json 1e-05). Üs, rakamdan sonra gelen e ve
+# ardından rakam veya işarettir; 'e' ile başlayan desen C tarafında hızlı aranır, önceki karakter
+# eşleşmeden sonra kontrol edilir. Metin içindeki benzer diziler de sadece standart json'a düşürür.
+_EXPONENT = re.compile(rb'e[-+0-9]')
+_DIGITS = b'0123456789'
+# BMP dışı karakterlerin UTF-8 ilk baytları (json bunları vekil çift olarak yazar); tek baytlık
+# aramalar memchr ile yapılır
+_ASTRAL_LEADS = (b'\xf0', b'\xf1', b'\xf2', b'\xf3', b'\xf4')
+
+
+def _escape(match):
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return '\\u%04x\\u%04x' % (0xD800 | code >> 10, 0xDC00 | code & 0x3FF)
+    return '\\u%04x' % code
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def __init__(self, app, orjson):
+        super().__init__(app)
+        self._orjson = orjson
+        self._options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                         | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+    def _encode(self, obj):
+        """obj'u orjson ile bayt olarak serileştirir; çıktı standart json'dan farklı olacaksa None."""
+        options = self._options | (self._orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        try:
+            data = self._orjson.dumps(obj, default=self.default, option=options)
+        except TypeError:
+            # orjson.JSONEncodeError: str olmayan anahtar, çok büyük tamsayı, bilinmeyen tür
+            return None
+        if b'0.0000' in data or any(data[match.start() - 1] in _DIGITS
+                                    for match in _EXPONENT.finditer(data)):
+            return None
+        if not data.isascii() or b'\x7f' in data:
+            text = data.decode('utf-8')
+            escaped_backslash = b'\\' in data and b'\\\\' in data
+            if escaped_backslash or b'\x7f' in data or any(lead in data for lead in _ASTRAL_LEADS):
+                data = _UNESCAPED.sub(_escape, text).encode('ascii')
+            else:
+                # backslashreplace C'de çalışır ve BMP karakterlerini zaten \uXXXX yazar; Latin-1
+                # karakterleri için \xXX -> \u00XX yeterlidir (orjson çıktısında \x ancak kaçırılmış
+                # ters bölü içinde geçebilir, o durum yukarıda karakter karakter kaçırılır)
+                data = text.encode('ascii', 'backslashreplace').replace(b'\\x', b'\\u00')
+        return data
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        data = self._encode(obj) if self.ensure_ascii else None
+        if data is None:
+            data = super().dumps(obj, separators=(',', ':')).encode('utf-8')
+        return self._app.response_class(data + b'\n', mimetype=self.mimetype)
+
+
+def init_app(app):
+    """JSON_ENCODER ayarına göre uygulamanın JSON sağlayıcısını seçer."""
+    app.config.setdefault('JSON_ENCODER', 'orjson')
+    if app.config['JSON_ENCODER'] != 'orjson':
+        return
+    try:
+        import orjson
+    except ImportError:
+        # orjson opsiyoneldir; kurulu değilse standart json ile devam edilir
+        return
+    app.json = FastJSONProvider(app, orjson)
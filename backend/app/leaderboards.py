@@ -0,0 +1,204 @@
+import heapq
+from datetime import datetime, timedelta
+from sqlalchemy import func, text
+from app import db
+from app.models import LeaderboardEntry, LeaderboardScoreCount, User, UserDailyRollup, UserDirectory
+from app.sharding import each_shard
+from app.streaks import get_streaks
+from app.timezones import user_today
+
+# Kullanıcılar arası sıralamalar (mevcut seri, en iyi seri, son 30 gündeki tamamlama sayısı).
+# Her kullanıcının puanları kendi shard'ındaki leaderboard_entry tablosunda durur ve kayıt
+# yazımlarıyla aynı transaction'da güncellenir; böylece yazımlar shard dışına çıkmaz.
+# leaderboard_score_count, shard'daki puan dağılımını (puan -> kullanıcı sayısı) tutar.
+#
+# İlk K: her shard'dan (metric, score) indeksiyle ilk K satır okunur ve birleştirilir.
+# Sıra: 1 + tüm shard'larda kullanıcının puanından yüksek puanların sayaçları toplamı; maliyet
+# kullanıcı sayısına değil farklı puan sayısına bağlıdır. Grup ve arkadaş sıralamaları sadece
+# üyelerin satırlarını birincil anahtarla okur.
+#
+# Puanlar zamanla yazım olmadan da değişir (seri kopar, gün 30 günlük pencereden çıkar). Bu
+# satırlar expires_on ile işaretlenir ve 'flask leaderboards reconcile' (cron ile periyodik)
+# tarafından yenilenir; --full seçeneği tüm kullanıcıları ve sayaçları baştan hesaplar.
+
+METRICS = ('current_streak', 'best_streak', 'completions_30d')
+WINDOW_DAYS = 30
+MAX_LIMIT = 100
+# Grup üyesi ve takip edilen kullanıcı sınırı (bu sıralamalar üyeler üzerinden hesaplanır)
+MAX_MEMBERS = 500
+
+ONE_DAY = timedelta(days=1)
+
+
+def compute_scores(user_id, today=None):
+    """
+    Kullanıcının puanlarını seri ve günlük toplam tablolarından indeksli sorgularla hesaplar.
+
+    Döndürür:
+        tuple: (metric -> puan, puanların yazım olmadan değişebileceği ilk gün veya None)
+    """
+    today = today or user_today(user_id)
+    current_streak, best_streak = get_streaks(user_id, today=today)
+
+    window = db.session.query(UserDailyRollup.date, UserDailyRollup.count).filter(
+        UserDailyRollup.user_id == user_id,
+        UserDailyRollup.date > today - timedelta(days=WINDOW_DAYS),
+        UserDailyRollup.date <= today
+    ).order_by(UserDailyRollup.date).all()
+    next_day = db.session.query(func.min(UserDailyRollup.date)).filter(
+        UserDailyRollup.user_id == user_id, UserDailyRollup.date > today
+    ).scalar()
+
+    expiries = []
+    if current_streak:
+        # Seri yarın tekrar kontrol edilir (bugün veya dün biten seri yarın/ertesi gün kopar)
+        expiries.append(today + ONE_DAY)
+    if window:
+        expiries.append(window[0].date + timedelta(days=WINDOW_DAYS))
+    if next_day is not None:
+        # İleri tarihli bir kayıt o gün geldiğinde pencereye (ve seriye) girer
+        expiries.append(next_day)
+
+    scores = {
+        'current_streak': current_streak,
+        'best_streak': best_streak,
+        'completions_30d': sum(row.count for row in window)
+    }
+    return scores, min(expiries) if expiries else None
+
+
+def _adjust_count(connection, metric, score, delta):
+    connection.execute(
+        text('INSERT INTO leaderboard_score_count (metric, score, users) VALUES (:metric, :score, :delta) '
+             'ON CONFLICT (metric, score) DO UPDATE SET users = users + excluded.users'),
+        {'metric': metric, 'score': score, 'delta': delta}
+    )
+
+
+def update_user(user_id, today=None):
+    """
+    Kullanıcının sıralama satırlarını günceller; değişen puanların sayaçlarını düzeltir.
+    Seri ve günlük toplam güncellemelerinden sonra çağrılır; commit çağırana bırakılır.
+    """
+    scores, expires_on = compute_scores(user_id, today)
+    entries = {entry.metric: entry for entry in LeaderboardEntry.query.filter_by(user_id=user_id)}
+
+    now = datetime.utcnow()
+    for metric, score in scores.items():
+        entry = entries.get(metric)
+        if entry is None:
+            db.session.add(LeaderboardEntry(user_id=user_id, metric=metric, score=score,
+                                            expires_on=expires_on, updated_at=now))
+            _adjust_count(db.session, metric, score, 1)
+            continue
+        if entry.score != score:
+            _adjust_count(db.session, metric, entry.score, -1)
+            _adjust_count(db.session, metric, score, 1)
+            entry.score = score
+            entry.updated_at = now
+        entry.expires_on = expires_on
+
+
+def adjust_user_counts(connection, user_id, delta):
+    """Kullanıcının satırlarını bir shard'ın sayaçlarına ekler (+1) veya çıkarır (-1); taşımada kullanılır."""
+    connection.execute(
+        text('INSERT INTO leaderboard_score_count (metric, score, users) '
+             'SELECT metric, score, :delta FROM leaderboard_entry WHERE user_id = :user_id '
+             'ON CONFLICT (metric, score) DO UPDATE SET users = users + excluded.users'),
+        {'user_id': user_id, 'delta': delta}
+    )
+
+
+def rebuild_score_counts(connection=None):
+    """Seçili shard'ın puan sayaçlarını leaderboard_entry tablosundan baştan oluşturur."""
+    connection = connection or db.session
+    connection.execute(text('DELETE FROM leaderboard_score_count'))
+    connection.execute(text(
+        'INSERT INTO leaderboard_score_count (metric, score, users) '
+        'SELECT metric, score, COUNT(*) FROM leaderboard_entry GROUP BY metric, score'
+    ))
+
+
+def expired_user_ids(cutoff):
+    """Seçili shard'da puanı cutoff gününe kadar yenilenmesi gereken kullanıcılar."""
+    return [row.user_id for row in db.session.query(LeaderboardEntry.user_id).filter(
+        LeaderboardEntry.expires_on <= cutoff
+    ).distinct()]
+
+
+# Okuma
+
+
+def _ranked(rows, limit):
+    """Puana göre sıralı (user_id, kullanıcı adı, puan) satırlarına sıra verir; eşit puanlar aynı sırayı alır."""
+    entries = []
+    for position, (user_id, username, score) in enumerate(rows[:limit], start=1):
+        rank = entries[-1]['rank'] if entries and entries[-1]['score'] == score else position
+        entries.append({'rank': rank, 'user_id': user_id, 'username': username, 'score': score})
+    return entries
+
+
+def _own_score(user_id, metric):
+    score = db.session.query(LeaderboardEntry.score).filter_by(user_id=user_id, metric=metric).scalar()
+    return score or 0
+
+
+def global_board(user_id, metric, limit):
+    """
+    Tüm kullanıcılar arasındaki ilk `limit` kullanıcı ve kullanıcının kendi sırası.
+
+    Döndürür:
+        dict: {'entries': [{'rank', 'user_id', 'username', 'score'}, ...],
+               'me': {'rank', 'score'}, 'total': sıralamadaki kullanıcı sayısı}
+    """
+    # Oturum isteği yapan kullanıcının shard'ındadır; kendi puanı önce okunur
+    score = _own_score(user_id, metric)
+    tops, above, total = [], 0, 0
+    for _ in each_shard():
+        rows = db.session.query(LeaderboardEntry.score, LeaderboardEntry.user_id, User.username).join(
+            User, User.id == LeaderboardEntry.user_id
+        ).filter(LeaderboardEntry.metric == metric).order_by(
+            # İndeks geriye doğru okunur; eşit puanlı çok sayıda kullanıcı sıralanmaz
+            LeaderboardEntry.score.desc(), LeaderboardEntry.user_id.desc()
+        ).limit(limit).all()
+        tops.append([(-row.score, -row.user_id, row.username) for row in rows])
+
+        counts = db.session.query(
+            func.coalesce(func.sum(LeaderboardScoreCount.users), 0),
+            func.coalesce(func.sum(LeaderboardScoreCount.users).filter(LeaderboardScoreCount.score > score), 0)
+        ).filter(LeaderboardScoreCount.metric == metric).one()
+        total += counts[0]
+        above += counts[1]
+
+    merged = [(-user, username, -negative) for negative, user, username in heapq.merge(*tops)]
+    return {
+        'entries': _ranked(merged, limit),
+        'me': {'rank': above + 1, 'score': score},
+        'total': total
+    }
+
+
+def members_board(user_id, metric, member_ids, limit):
+    """Verilen kullanıcılar (grup üyeleri veya takip edilenler) arasındaki sıralama."""
+    directory = db.session.query(UserDirectory.user_id, UserDirectory.username, UserDirectory.shard).filter(
+        UserDirectory.user_id.in_(member_ids)
+    ).all()
+    usernames = {row.user_id: row.username for row in directory}
+    by_shard = {}
+    for row in directory:
+        by_shard.setdefault(row.shard, []).append(row.user_id)
+
+    scores = {}
+    for shard in each_shard():
+        ids = by_shard.get(shard)
+        if not ids:
+            continue
+        scores.update(db.session.query(LeaderboardEntry.user_id, LeaderboardEntry.score).filter(
+            LeaderboardEntry.metric == metric, LeaderboardEntry.user_id.in_(ids)
+        ).all())
+
+    rows = sorted(((uid, usernames[uid], scores.get(uid, 0)) for uid in usernames),
+                  key=lambda row: (-row[2], -row[0]))
+    ranked = _ranked(rows, len(rows))
+    me = next(({'rank': entry['rank'], 'score': entry['score']} for entry in ranked if entry['user_id'] == user_id), None)
+    return {'entries': ranked[:limit], 'me': me, 'total': len(ranked)}
@@ -1,54 +1,312 @@
 from datetime import datetime, date
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import DDL, event
 from app import db
+from app.security import get_hasher
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(64), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
+    # IANA saat dilimi; kayıt tarihleri ve "bugün" bu dilime göre belirlenir
+    timezone = db.Column(db.String(64), nullable=False, default='UTC', server_default='UTC')
+    # Yanıt önbelleğinin sürüm sayacı (bkz. app/cache.py); her yazmada artırılır
+    cache_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     habits = db.relationship('Habit', backref='author', lazy='dynamic')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_hasher().hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return get_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return get_hasher().needs_rehash(self.password_hash)
 
     def to_dict(self):
         return {
             'id': self.id,
             'username': self.username,
-            'email': self.email
+            'email': self.email,
+            'timezone': self.timezone
         }
 
+class UserDirectory(db.Model):
+    # Genel kullanıcı dizini (varsayılan veritabanında): global kullanıcı id'si, kullanıcı adı ve
+    # e-posta benzersizliği ve kullanıcının verisinin bulunduğu shard
+    __tablename__ = 'user_directory'
+    user_id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(64), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    shard = db.Column(db.Integer, nullable=False, default=0)
+
 class Habit(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(255))
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    logs = db.relationship('HabitLog', backref='habit', lazy='dynamic', cascade="all, delete-orphan")
+    # Program: 'daily' (her gün), 'weekly' (haftada times_per_week gün) veya 'weekdays'
+    # (schedule_days bit maskesindeki günler; bit 0 = Pazartesi). Bir gün, kaydın count
+    # değeri target_count'a ulaştığında hedefe ulaşılmış sayılır.
+    schedule_type = db.Column(db.String(16), nullable=False, default='daily', server_default='daily')
+    schedule_days = db.Column(db.Integer)
+    times_per_week = db.Column(db.Integer)
+    target_count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Beklenen günler bu tarihten itibaren sayılır; daha eski bir kayıt eklenirse geri çekilir
+    starts_on = db.Column(db.Date)
+    # Arşivlenen alışkanlık listelerden gizlenir, geçmişi korunur ve geri alınabilir
+    archived_at = db.Column(db.DateTime)
+    # Silinen alışkanlık hemen gizlenir; kayıtları arka planda parça parça temizlenir (bkz. app/purge.py)
+    deleted_at = db.Column(db.DateTime)
+    # Kayıtlar ORM üzerinden tek tek yüklenip silinmez; veritabanındaki ON DELETE CASCADE siler
+    logs = db.relationship('HabitLog', backref='habit', lazy='dynamic', cascade="all, delete-orphan",
+                           passive_deletes=True)
+
+    @classmethod
+    def listed(cls, user_id, archived=False):
+        """Kullanıcının silinmemiş alışkanlıkları; archived=True ise sadece arşivlenenler, None ise hepsi."""
+        query = cls.query.filter(cls.user_id == user_id, cls.deleted_at.is_(None))
+        if archived is None:
+            return query
+        return query.filter(cls.archived_at.isnot(None) if archived else cls.archived_at.is_(None))
+
+    def schedule_dict(self):
+        return schedule_dict(self.schedule_type, self.schedule_days, self.times_per_week, self.target_count)
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'created_at': self.created_at.isoformat()
-        }
+        return habit_dict(self.id, self.name, self.description, self.created_at, self.schedule_type,
+                          self.schedule_days, self.times_per_week, self.target_count, self.starts_on,
+                          self.archived_at)
+
+# Serileştirme, Habit nesneleri ve sadece sütun seçen sorguların satırları (app/read_models.py)
+# için ortaktır; böylece iki yolun yanıtları birebir aynı kalır. Değerler konumsal alınır,
+# satırlar habit_dict(*row) ile açılır (parametre sırası read_models.HABIT_COLUMNS ile aynıdır).
+
+# Gün maskesi (0-127) -> gün listesi
+WEEKDAY_LISTS = tuple(tuple(day for day in range(7) if mask >> day & 1) for mask in range(128))
+
+def schedule_dict(schedule_type, schedule_days, times_per_week, target_count):
+    return {
+        'type': schedule_type,
+        'days': list(WEEKDAY_LISTS[(schedule_days or 0) & 127]) if schedule_type == 'weekdays' else None,
+        'times_per_week': times_per_week if schedule_type == 'weekly' else None,
+        'target': target_count
+    }
+
+def habit_dict(id, name, description, created_at, schedule_type, schedule_days, times_per_week, target_count,
+               starts_on, archived_at):
+    return {
+        'id': id,
+        'name': name,
+        'description': description,
+        'created_at': created_at.isoformat(),
+        'schedule': schedule_dict(schedule_type, schedule_days, times_per_week, target_count),
+        'starts_on': starts_on.isoformat() if starts_on else None,
+        'archived_at': archived_at.isoformat() if archived_at else None
+    }
+
+# Ad ve açıklama üzerinde tam metin arama (SQLite FTS5; rowid = habit.id). Tablo ORM'de
+# tanımlı değildir, app/search.py tarafından güncel tutulur; burada habit tablosuyla birlikte
+# oluşturulur ve silinir (create_all/drop_all); göç dosyası da aynı DDL'i çalıştırır.
+HABIT_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS habit_fts USING fts5("
+    "owner, name, description, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS habit_fts_vocab USING fts5vocab(habit_fts, 'row')",
+)
+for statement in HABIT_SEARCH_DDL:
+    event.listen(Habit.__table__, 'after_create', DDL(statement))
+event.listen(Habit.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS habit_fts_vocab'))
+event.listen(Habit.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS habit_fts'))
 
 class HabitLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    habit_id = db.Column(db.Integer, db.ForeignKey('habit.id'), nullable=False)
+    habit_id = db.Column(db.Integer, db.ForeignKey('habit.id', ondelete='CASCADE'), nullable=False)
     completed = db.Column(db.Boolean, default=False)
     completion_date = db.Column(db.Date, default=date.today)
+    # Gün içindeki tekrar sayısı (ör. 8 bardak su); kayıt varsa en az 1'dir
+    count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    __table_args__ = (
+        db.Index('ix_habit_log_habit_id_completion_date', 'habit_id', 'completion_date'),
+    )
 
     def to_dict(self):
         return {
             'id': self.id,
             'habit_id': self.habit_id,
             'completed': self.completed,
-            'completion_date': self.completion_date.isoformat()
+            'completion_date': self.completion_date.isoformat(),
+            'count': self.count
         }
 
+
+class StreakRun(db.Model):
+    # Ardışık tamamlama günlerinden oluşan bir seri (run).
+    # habit_id NULL ise kayıt kullanıcı düzeyindeki (tüm alışkanlıkların birleşimi) seriyi temsil eder.
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    habit_id = db.Column(db.Integer, db.ForeignKey('habit.id', ondelete='CASCADE'), nullable=True)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    length = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_streak_run_scope_end', 'user_id', 'habit_id', 'end_date'),
+        db.Index('ix_streak_run_scope_length', 'user_id', 'habit_id', 'length'),
+    )
+
+    def to_dict(self):
+        return {
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'length': self.length
+        }
+
+class UserDailyRollup(db.Model):
+    # Kullanıcının gün bazında toplam tamamlama sayısı (ısı haritası ve raporlar için önceden toplanmış)
+    __tablename__ = 'user_daily_rollup'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class HabitPeriod(db.Model):
+    # Alışkanlığın bir takvim haftasındaki (Pazartesi başlangıçlı) beklenen ve hedefe ulaşılan
+    # gün sayısı. Kayıt yazımlarında artımlı güncellenir; program değişince yeniden hesaplanır.
+    # Hiç kaydı olmayan haftaların satırı yoktur (hedefe ulaşılan gün sayısı 0).
+    __tablename__ = 'habit_period'
+    habit_id = db.Column(db.Integer, db.ForeignKey('habit.id', ondelete='CASCADE'), primary_key=True)
+    week_start = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    expected = db.Column(db.Integer, nullable=False)
+    achieved = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_habit_period_user_week', 'user_id', 'week_start'),
+    )
+
+class HabitWeekRun(db.Model):
+    # Programa göre hedefin tutturulduğu ardışık takvim haftalarından oluşan bir seri (streak_run'ın
+    # haftalık karşılığı). habit_period satırları değiştikçe artımlı güncellenir.
+    __tablename__ = 'habit_week_run'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    habit_id = db.Column(db.Integer, db.ForeignKey('habit.id', ondelete='CASCADE'), nullable=False)
+    start_week = db.Column(db.Date, nullable=False)
+    end_week = db.Column(db.Date, nullable=False)
+    length = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_habit_week_run_user_habit_end', 'user_id', 'habit_id', 'end_week'),
+    )
+
+class HabitYearBitmap(db.Model):
+    # Bir alışkanlığın bir yıldaki tamamlanma durumları; bit i yılın (i+1). günüdür (366 bit)
+    __tablename__ = 'habit_year_bitmap'
+    habit_id = db.Column(db.Integer, db.ForeignKey('habit.id', ondelete='CASCADE'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    bits = db.Column(db.LargeBinary(46), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_habit_year_bitmap_user_year', 'user_id', 'year'),
+    )
+
+class LeaderboardEntry(db.Model):
+    # Kullanıcının bir sıralama metriğindeki puanı (kullanıcının shard'ında). Kayıt yazımlarıyla
+    # aynı transaction'da güncellenir. expires_on, puanın yeni bir yazım olmadan değişebileceği
+    # ilk gündür (seri kopar, gün 30 günlük pencereden çıkar); uzlaştırma bu satırları yeniler.
+    __tablename__ = 'leaderboard_entry'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    metric = db.Column(db.String(32), primary_key=True)
+    score = db.Column(db.Integer, nullable=False)
+    expires_on = db.Column(db.Date)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_leaderboard_entry_metric_score', 'metric', 'score', 'user_id'),
+        db.Index('ix_leaderboard_entry_expires_on', 'expires_on'),
+    )
+
+class LeaderboardScoreCount(db.Model):
+    # Shard'da her metrik ve puan için o puana sahip kullanıcı sayısı; bir kullanıcının sırası
+    # 1 + kendisinden yüksek puanların sayaçları toplamıdır (kullanıcı sayısından bağımsız)
+    __tablename__ = 'leaderboard_score_count'
+    metric = db.Column(db.String(32), primary_key=True)
+    score = db.Column(db.Integer, primary_key=True)
+    users = db.Column(db.Integer, nullable=False, default=0)
+
+class Job(db.Model):
+    # Arka plan işi; durum: queued, running, succeeded, failed. İşler genel veritabanında,
+    # kullanıcılar shard'larda durduğundan user_id bir yabancı anahtar değildir.
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(32), nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}') # JSON
+    # Aynı kullanıcı için aynı tür ve parametrelerle bekleyen/çalışan tek bir iş olabilir
+    dedup_key = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    result = db.Column(db.Text) # JSON
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_job_status_run_after', 'status', 'run_after'),
+        db.Index('ix_job_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_job_active_dedup', 'user_id', 'dedup_key', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')")),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class LeaderboardGroup(db.Model):
+    # Sıralama grubu (genel veritabanında); üyeler davet koduyla katılır
+    __tablename__ = 'leaderboard_group'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    owner_id = db.Column(db.Integer, nullable=False)
+    invite_code = db.Column(db.String(32), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    members = db.relationship('LeaderboardGroupMember', backref='group', lazy='dynamic',
+                              cascade='all, delete-orphan', passive_deletes=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'owner_id': self.owner_id,
+            'invite_code': self.invite_code,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class LeaderboardGroupMember(db.Model):
+    # Grup üyeliği; kullanıcılar shard'larda durduğundan user_id bir yabancı anahtar değildir
+    __tablename__ = 'leaderboard_group_member'
+    group_id = db.Column(db.Integer, db.ForeignKey('leaderboard_group.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    joined_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_leaderboard_group_member_user_id', 'user_id'),
+    )
+
+class Friendship(db.Model):
+    # Tek yönlü takip: user_id, friend_id'yi arkadaş sıralamasında görür
+    user_id = db.Column(db.Integer, primary_key=True)
+    friend_id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
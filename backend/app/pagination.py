@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import or_, and_
+from app.models import Habit
+
+# Anahtar tabanlı (keyset) sayfalama: imleç, önceki sayfanın son satırının sıralama
+# anahtarını taşır; sonraki sayfa OFFSET yerine indeksli bir "bu anahtardan büyük" filtresiyle gelir.
+
+ORDERINGS = ('id', 'created_at')
+
+
+def encode_cursor(order, habit):
+    payload = {'o': order, 'id': habit.id}
+    if order == 'created_at':
+        payload['c'] = habit.created_at.isoformat()
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(order, cursor):
+    """İmleci çözer; geçersizse veya farklı bir sıralamaya aitse ValueError fırlatır."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if payload['o'] != order:
+            raise ValueError('Cursor does not match ordering')
+        last_id = int(payload['id'])
+        last_created_at = datetime.fromisoformat(payload['c']) if order == 'created_at' else None
+    except (KeyError, TypeError, ValueError, json.JSONDecodeError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    return last_id, last_created_at
+
+
+def paginate_habits(query, order='id', cursor=None, limit=50):
+    """
+    Alışkanlık sorgusunun bir sayfasını getirir.
+
+    Döndürür:
+        tuple[list[Habit], str | None]: Sayfadaki alışkanlıklar ve varsa sonraki sayfanın imleci.
+    """
+    if order == 'created_at':
+        query = query.order_by(Habit.created_at, Habit.id)
+    else:
+        query = query.order_by(Habit.id)
+
+    if cursor:
+        last_id, last_created_at = decode_cursor(order, cursor)
+        if order == 'created_at':
+            query = query.filter(or_(
+                Habit.created_at > last_created_at,
+                and_(Habit.created_at == last_created_at, Habit.id > last_id)
+            ))
+        else:
+            query = query.filter(Habit.id > last_id)
+
+    # Sonraki sayfanın varlığını anlamak için bir satır fazla okunur
+    habits = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(habits) > limit:
+        habits = habits[:limit]
+        next_cursor = encode_cursor(order, habits[-1])
+
+    return habits, next_cursor
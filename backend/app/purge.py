@@ -0,0 +1,63 @@
+from datetime import datetime
+from flask import current_app
+from app import db
+from app.models import Habit, HabitLog
+from app.rollup import set_habit_counted
+
+# Alışkanlık silme iki adımdır: istek sadece deleted_at'i işaretler (alışkanlık her sorgudan
+# anında gizlenir, süre kayıt sayısından bağımsızdır) ve bir 'purge_habit' işi kuyruğa ekler.
+# İş, kayıtları PURGE_BATCH_SIZE'lık parçalar halinde ayrı transaction'larda siler; böylece
+# SQLite yazma kilidi uzun süre tutulmaz. Son adımda alışkanlık satırı silinir; seriler,
+# bitmap'ler ve haftalık satırlar ON DELETE CASCADE ile veritabanınca silinir.
+#
+# Silinen alışkanlığın katkısı kullanıcı düzeyindeki toplamlardan (günlük toplamlar, genel
+# seri) işaretleme sırasında çıkarılır; temizlik bu tablolara dokunmaz.
+
+
+def mark_deleted(habit):
+    """Alışkanlığı silinmiş olarak işaretler (commit çağırana bırakılır)."""
+    from app.search import unindex_habit
+
+    counted = habit.archived_at is None
+    habit.deleted_at = datetime.utcnow()
+    unindex_habit(habit.id)
+    if counted:
+        # Arşivlenmiş alışkanlık toplamlardan zaten çıkarılmıştır
+        set_habit_counted(habit.user_id, habit.id, False)
+
+
+def purge_habit(user_id, habit_id, batch_size=None):
+    """
+    Silinmiş olarak işaretlenmiş bir alışkanlığı kayıtlarıyla birlikte kalıcı olarak siler.
+    Her parça ayrı commit edilir; yarıda kalan bir temizlik tekrar çalıştırılabilir.
+
+    Döndürür:
+        int: Silinen kayıt sayısı (alışkanlık yoksa veya silinmiş değilse 0).
+    """
+    batch_size = batch_size or current_app.config['PURGE_BATCH_SIZE']
+    habit = db.session.get(Habit, habit_id)
+    if habit is None or habit.user_id != user_id or habit.deleted_at is None:
+        return 0
+
+    removed = 0
+    while True:
+        ids = [row.id for row in db.session.query(HabitLog.id).filter(
+            HabitLog.habit_id == habit_id
+        ).limit(batch_size)]
+        if not ids:
+            break
+
+        HabitLog.query.filter(HabitLog.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        removed += len(ids)
+
+    db.session.delete(habit)
+    db.session.commit()
+    return removed
+
+
+def pending_purges(user_id):
+    """Kullanıcının silinmiş olarak işaretlenmiş ama henüz temizlenmemiş alışkanlık id'leri."""
+    return [row.id for row in db.session.query(Habit.id).filter(
+        Habit.user_id == user_id, Habit.deleted_at.isnot(None)
+    ).order_by(Habit.id)]
@@ -0,0 +1,37 @@
+from app.models import Habit, habit_dict
+
+# Salt okunur uç noktalar için okuma katmanı. Sorgular model nesnesi yerine sadece gereken
+# sütunları seçer; satırlar düz tuple olarak döner, oturumun kimlik haritasına (identity map)
+# eklenmez ve değişiklik takibi yapılmaz. Sözlükler models.py'deki ortak serileştirme
+# fonksiyonlarıyla oluşturulur, böylece yanıtlar nesne yoluyla birebir aynıdır.
+#
+# Sadece okuma yapan istekler içindir; yazılacak satırlar her zaman model olarak yüklenir.
+
+# Sıra models.habit_dict parametreleriyle aynıdır (satırlar habit_dict(*row) ile açılır)
+HABIT_COLUMNS = (
+    Habit.id, Habit.name, Habit.description, Habit.created_at, Habit.schedule_type, Habit.schedule_days,
+    Habit.times_per_week, Habit.target_count, Habit.starts_on, Habit.archived_at
+)
+
+
+def habit_rows(query):
+    """Habit sorgusunu (filtreleri ve sıralamasıyla) sadece yanıt sütunlarını seçen sorguya çevirir."""
+    return query.with_entities(*HABIT_COLUMNS)
+
+
+def habit_dicts(rows, fields=None):
+    """
+    Satırları Habit.to_dict() ile aynı sözlüklere çevirir.
+
+    Argümanlar:
+        fields (set, opsiyonel): Verilirse sadece bu anahtarlar döndürülür.
+    """
+    if fields is None:
+        return [habit_dict(*row) for row in rows]
+    return [{key: value for key, value in habit_dict(*row).items() if key in fields} for row in rows]
+
+
+def habits_by_id(user_id, habit_ids):
+    """Kullanıcının verilen id'lerdeki alışkanlıkları (id -> sözlük)."""
+    rows = habit_rows(Habit.query.filter(Habit.user_id == user_id, Habit.id.in_(habit_ids)))
+    return {row[0]: habit_dict(*row) for row in rows}
@@ -0,0 +1,22 @@
+from app.models import Habit
+from app.rollup import read_heatmap
+from app.streaks import get_streaks
+
+
+def build_report(user_id, start_date=None, end_date=None):
+    """/reports yanıtını oluşturur; hem rota hem de arka plan işleri tarafından kullanılır."""
+    total_habits = Habit.listed(user_id).count()
+
+    # Isı haritası, ham kayıtlar yerine önceden toplanmış günlük tablodan okunur
+    heatmap_data = read_heatmap(user_id, start_date=start_date, end_date=end_date)
+
+    current_streak, best_streak = get_streaks(user_id)
+
+    return {
+        'stats': {
+            'total_habits': total_habits,
+            'current_streak': current_streak,
+            'best_streak': best_streak
+        },
+        'heatmap': heatmap_data
+    }
@@ -0,0 +1,99 @@
+from sqlalchemy import func
+from app import db
+from app.models import Habit, HabitLog, UserDailyRollup
+from app.streaks import counted_habits, sync_user_days
+
+# user_daily_rollup, kullanıcının her günü için tek satır tutar. Yazma yolları (kayıt ekleme/
+# silme, alışkanlık silme) tabloyu aynı transaction içinde günceller; okuma yolları ham
+# kayıtlar yerine yılda en fazla 366 satırlık bu tabloyu tarih aralığıyla tarar.
+# Sadece listelenen alışkanlıkların kayıtları sayılır (arşivlenen ve silinenler hariç).
+
+
+def adjust_day(user_id, day, delta):
+    """Kullanıcının verilen günkü sayacını delta kadar değiştirir. Commit çağırana bırakılır."""
+    row = db.session.get(UserDailyRollup, (user_id, day))
+    if row is None:
+        if delta > 0:
+            db.session.add(UserDailyRollup(user_id=user_id, date=day, count=delta))
+        return
+
+    row.count += delta
+    if row.count <= 0:
+        db.session.delete(row)
+
+
+def read_heatmap(user_id, start_date=None, end_date=None):
+    """
+    Kullanıcının toplam ısı haritasını rollup tablosundan okur.
+
+    Döndürür:
+        dict: Anahtarların tarih (YYYY-AA-GG) ve değerlerin günlük toplam olduğu bir sözlük.
+    """
+    query = db.session.query(UserDailyRollup.date, UserDailyRollup.count).filter(
+        UserDailyRollup.user_id == user_id
+    )
+    if start_date:
+        query = query.filter(UserDailyRollup.date >= start_date)
+    if end_date:
+        query = query.filter(UserDailyRollup.date <= end_date)
+
+    return {row.date.isoformat(): row.count for row in query}
+
+
+def rebuild_user_rollup(user_id):
+    """Kullanıcının günlük toplamlarını ham kayıtlardan yeniden oluşturur."""
+    UserDailyRollup.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+    rows = db.session.query(HabitLog.completion_date, func.count(HabitLog.id)).join(Habit).filter(
+        Habit.user_id == user_id, counted_habits()
+    ).group_by(HabitLog.completion_date).all()
+
+    for day, count in rows:
+        db.session.add(UserDailyRollup(user_id=user_id, date=day, count=count))
+
+
+def apply_deltas(user_id, deltas):
+    """
+    Birden fazla güne ait değişiklikleri (date -> delta) tek okuma sorgusuyla uygular.
+    Toplu kayıt yazımlarında gün başına ayrı sorgu atmamak için kullanılır.
+    """
+    deltas = {day: delta for day, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    rows = {
+        row.date: row
+        for row in UserDailyRollup.query.filter(
+            UserDailyRollup.user_id == user_id,
+            UserDailyRollup.date.in_(list(deltas))
+        )
+    }
+
+    for day, delta in deltas.items():
+        row = rows.get(day)
+        if row is None:
+            if delta > 0:
+                db.session.add(UserDailyRollup(user_id=user_id, date=day, count=delta))
+            continue
+
+        row.count += delta
+        if row.count <= 0:
+            db.session.delete(row)
+
+
+def set_habit_counted(user_id, habit_id, counted):
+    """
+    Alışkanlığın kayıtlarını kullanıcı düzeyindeki günlük toplamlara ve serilere ekler (geri
+    yükleme) veya onlardan çıkarır (arşivleme, silme). Alışkanlığın archived_at/deleted_at
+    alanları önceden ayarlanmış olmalıdır; commit çağırana bırakılır.
+    """
+    deltas = {}
+    for day, count in db.session.query(HabitLog.completion_date, func.count(HabitLog.id)).filter(
+        HabitLog.habit_id == habit_id
+    ).group_by(HabitLog.completion_date):
+        deltas[day] = count if counted else -count
+
+    days = sorted(deltas)
+    for start in range(0, len(days), 500):
+        apply_deltas(user_id, {day: deltas[day] for day in days[start:start + 500]})
+    sync_user_days(user_id, days)
@@ -1,13 +1,47 @@
-from flask import Blueprint, request, jsonify, session
-from app import db
-from app.models import User, Habit, HabitLog
-from app.habit_logic import format_heatmap_data
+from flask import Blueprint, request, jsonify, session, current_app, Response, stream_with_context, send_file
+from app import db, bitmaps, leaderboards, read_models, schedules, search
+from app.models import User, UserDirectory, Habit, HabitLog, Job, LeaderboardGroup, LeaderboardGroupMember, Friendship
+from app.streaks import apply_log_change, get_streaks
+from app.rollup import adjust_day, read_heatmap, set_habit_counted
+from app.reports import build_report
+from app.jobs import job_queue
+from app.heatmaps import query_heatmaps
+from app.bulk_logs import apply_log_operations
+from app.export import generate_export
+from app.cache import cache
+from app.events import events
+from app.pagination import ORDERINGS, paginate_habits
+from app.security import get_hasher, HashingBusy
+from app.timezones import user_today, is_valid_timezone, forget_user_timezone, DEFAULT_TIMEZONE
+from app.sharding import create_user, find_user
+from app.purge import mark_deleted
+from app.auth import get_current_user_id, habit_required, issue_tokens, verify_access_token, verify_refresh_token
 from datetime import datetime, date
 import sqlalchemy
+import json
 import re
+import secrets
 
 bp = Blueprint('main', __name__)
 
+# /habits listesinde seçilebilecek alanlar ve varsayılan sayfa boyutu
+HABIT_FIELDS = {'id', 'name', 'description', 'created_at'}
+DEFAULT_PAGE_SIZE = 50
+SEARCH_PAGE_SIZE = 20
+# Tek olayda gönderilecek en fazla kayıt değişikliği; fazlası için 'resync' yayınlanır
+MAX_EVENT_CHANGES = 200
+
+# Sağlık kontrolü: yük dengeleyici ve otomatik ölçekleyici için veritabanına tek bir sorgu yapar
+
+@bp.route('/healthz', methods=['GET'])
+def healthz():
+    try:
+        db.session.execute(sqlalchemy.text('SELECT 1'))
+        return jsonify({'status': 'ok'}), 200
+    except Exception as e:
+        print(f"Error in healthz: {e}")
+        return jsonify({'status': 'unavailable'}), 503
+
 # Kimlik Doğrulama Rotaları
 
 @bp.route('/register', methods=['POST'])
@@ -17,27 +51,34 @@ def register():
         username = data.get('username')
         email = data.get('email')
         password = data.get('password')
+        timezone = data.get('timezone') or DEFAULT_TIMEZONE
 
         if not username or not email or not password:
             return jsonify({'error': 'Missing fields'}), 400
 
+        if not is_valid_timezone(timezone):
+            return jsonify({'error': 'Invalid timezone'}), 400
+
         # Regex kullanarak e-posta doğrulama
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_regex, email):
              return jsonify({'error': 'Invalid email format'}), 400
 
-        if User.query.filter_by(username=username).first():
+        # Benzersizlik tüm shard'lar için genel dizinde kontrol edilir
+        if UserDirectory.query.filter_by(username=username).first():
             return jsonify({'error': 'Username already exists'}), 409
-        if User.query.filter_by(email=email).first():
+        if UserDirectory.query.filter_by(email=email).first():
             return jsonify({'error': 'Email already exists'}), 409
 
-        user = User(username=username, email=email)
+        user = create_user(username, email, timezone=timezone)
         user.set_password(password)
         db.session.add(user)
         db.session.commit()
 
         return jsonify({'message': 'User registered successfully'}), 201
 
+    except HashingBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503
     except Exception as e:
         print(f"Error in register: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -49,16 +90,25 @@ def login():
         username_or_email = data.get('username') # Frontend her ikisi için de bu alanı gönderir
         password = data.get('password')
 
-        user = User.query.filter(
-            (User.username == username_or_email) | (User.email == username_or_email)
-        ).first()
+        user = find_user(username_or_email)
 
-        if user and user.check_password(password):
+        # Bilinmeyen kullanıcılar için de aynı maliyette sahte bir doğrulama yapılır
+        if user is None:
+            get_hasher().verify(None, password)
+            return jsonify({'error': 'Invalid username/email or password'}), 401
+
+        if user.check_password(password):
+            # Özet eski parametrelerle oluşturulmuşsa, düz parola elimizdeyken güncelle
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             session['user_id'] = user.id
             return jsonify({'message': 'Login successful', 'user': user.to_dict()}), 200
         else:
             return jsonify({'error': 'Invalid username/email or password'}), 401
 
+    except HashingBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503
     except Exception as e:
         print(f"Error in login: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -68,41 +118,223 @@ def logout():
     session.pop('user_id', None)
     return jsonify({'message': 'Logged out'}), 200
 
-# Oturumdan geçerli kullanıcı ID'sini almak için yardımcı fonksiyon
-def get_current_user_id():
-    return session.get('user_id')
+# Token tabanlı kimlik doğrulama: oturum çerezi olmadan, her kopyada doğrulanabilen imzalı token'lar
+
+@bp.route('/token', methods=['POST'])
+def create_token():
+    try:
+        data = request.get_json()
+        username_or_email = data.get('username')
+        password = data.get('password')
+
+        user = find_user(username_or_email)
+
+        if user is None:
+            get_hasher().verify(None, password)
+            return jsonify({'error': 'Invalid username/email or password'}), 401
+
+        if not user.check_password(password):
+            return jsonify({'error': 'Invalid username/email or password'}), 401
+
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
+        return jsonify(issue_tokens(user)), 200
+
+    except HashingBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503
+    except Exception as e:
+        print(f"Error in create_token: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@bp.route('/token/refresh', methods=['POST'])
+def refresh_token():
+    try:
+        data = request.get_json(silent=True) or {}
+        user = verify_refresh_token(data.get('refresh_token') or '')
+        if user is None:
+            return jsonify({'error': 'Invalid or expired refresh token'}), 401
+
+        return jsonify(issue_tokens(user)), 200
+    except Exception as e:
+        print(f"Error in refresh_token: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+# /stats yanıtı; seriler her kayıt yazımında artımlı olarak güncellendiğinden burada sadece okunur
+def user_stats(user_id):
+    current_streak, best_streak = get_streaks(user_id)
+    return {
+        'total_habits': Habit.listed(user_id).count(),
+        'current_streak': current_streak,
+        'best_streak': best_streak
+    }
+
+# Açık /events akışlarına küçük bir değişiklik olayı gönderir; istemciler tam yeniden
+# yükleme yerine bunu uygular. Güncel istatistikler olaya eklenir. Commit'ten sonra çağrılır.
+# Kullanıcının açık akışı yoksa yük hiç oluşturulmaz. redis arka ucunda abonelerin hangi süreçte
+# olduğu bilinmediğinden sadece hafif bir 'changed' olayı yayınlanır; istemciler verileri yeniden yükler.
+def publish_event(user_id, event, data):
+    if not events.should_publish(user_id):
+        return
+    try:
+        if events.distributed:
+            events.publish(user_id, 'changed', {'event': event})
+            return
+        data['stats'] = user_stats(user_id)
+        events.publish(user_id, event, data)
+    except Exception as e:
+        # Değişiklik zaten kaydedildi; olay gönderilemezse istek yine de başarılıdır
+        print(f"Error in publish_event: {e}")
+
+# Kayıt değişikliklerini ({habit_id, date, completed}), etkilenen günlerin yeni toplamlarını ve
+# alışkanlık serilerini tek olayda yayınlar; değerler mutlak olduğundan olay iki kez uygulanabilir
+def publish_log_changes(user_id, changes):
+    if not changes or not events.should_publish(user_id):
+        return
+    if len(changes) > MAX_EVENT_CHANGES:
+        # Çok büyük değişikliklerde istemcinin verileri yeniden yüklemesi daha ucuzdur
+        publish_event(user_id, 'resync', {})
+        return
+    if events.distributed:
+        # Toplamlar ve seriler hesaplanmaz; publish_event hafif 'changed' olayını gönderir
+        publish_event(user_id, 'logs.changed', {})
+        return
+    try:
+        days = sorted({log_date for _, log_date, _ in changes})
+        totals = read_heatmap(user_id, start_date=days[0], end_date=days[-1])
+        habit_streaks = {}
+        for habit_id in sorted({habit_id for habit_id, _, _ in changes}):
+            current_streak, best_streak = get_streaks(user_id, habit_id)
+            habit_streaks[str(habit_id)] = {'current_streak': current_streak, 'best_streak': best_streak}
+    except Exception as e:
+        print(f"Error in publish_log_changes: {e}")
+        return
+    publish_event(user_id, 'logs.changed', {
+        'changes': [
+            {'habit_id': habit_id, 'date': log_date.isoformat(), 'completed': completed}
+            for habit_id, log_date, completed in changes
+        ],
+        'day_totals': {day.isoformat(): totals.get(day.isoformat(), 0) for day in days},
+        'habit_streaks': habit_streaks
+    })
+
+# İstekteki opsiyonel 'from' ve 'to' (YYYY-AA-GG) parametrelerini tarihe çevirir
+def parse_date_range():
+    start_date = end_date = None
+    if request.args.get('from'):
+        start_date = datetime.strptime(request.args['from'], '%Y-%m-%d').date()
+    if request.args.get('to'):
+        end_date = datetime.strptime(request.args['to'], '%Y-%m-%d').date()
+    return start_date, end_date
+
+# Kullanıcı Ayarları
+
+@bp.route('/settings', methods=['GET'])
+def get_settings():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        user = db.session.get(User, user_id)
+        return jsonify({'timezone': user.timezone}), 200
+    except Exception as e:
+        print(f"Error in get_settings: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/settings', methods=['PUT'])
+def update_settings():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        data = request.get_json(silent=True) or {}
+        timezone = data.get('timezone')
+        if not is_valid_timezone(timezone):
+            return jsonify({'error': 'Invalid timezone. Use an IANA name such as Europe/Istanbul'}), 400
+
+        user = db.session.get(User, user_id)
+        if user.timezone != timezone:
+            # Sadece "bugün" değişir; geçmiş kayıtların tarihleri yazıldıkları gündeki gibi kalır
+            user.timezone = timezone
+            forget_user_timezone(user_id)
+            # Mevcut seri ve 30 günlük pencere yeni "bugün"e göre hesaplanır
+            leaderboards.update_user(user_id)
+            db.session.commit()
+            cache.bump(user_id)
+            publish_event(user_id, 'resync', {})
+
+        return jsonify({'timezone': user.timezone}), 200
+    except Exception as e:
+        print(f"Error in update_settings: {e}")
+        return jsonify({'error': str(e)}), 500
 
 # Alışkanlıklar için Rotalar
 
 @bp.route('/habits', methods=['GET'])
+@cache.cached
 def get_habits():
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({'error': 'Unauthorized'}), 401
         
-        # Alışkanlıkları getir
-        habits = Habit.query.filter_by(user_id=user_id).all()
-        habits_data = []
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
-        # Bu kullanıcı için tüm kayıtları tek seferde getir
-        logs = HabitLog.query.join(Habit).filter(Habit.user_id == user_id).all()
-        
-        # Kayıtları habit_id'ye göre grupla
-        logs_by_habit = {}
-        for log in logs:
-            if log.habit_id not in logs_by_habit:
-                logs_by_habit[log.habit_id] = []
-            logs_by_habit[log.habit_id].append(log)
-
-        for habit in habits:
-            habit_dict = habit.to_dict()
+        # Sayfalama sadece 'limit' veya 'cursor' gönderildiğinde uygulanır
+        order = request.args.get('order', 'id')
+        if order not in ORDERINGS:
+            return jsonify({'error': 'Invalid order. Use id or created_at'}), 400
+
+        fields = None
+        if request.args.get('fields'):
+            fields = set(request.args['fields'].split(',')) | {'id'}
+            if not fields <= HABIT_FIELDS:
+                return jsonify({'error': f'Invalid fields. Allowed: {", ".join(sorted(HABIT_FIELDS))}'}), 400
+
+        # 'include' gönderilmezse eski davranışla uyumlu olarak ısı haritası eklenir
+        include = request.args.get('include')
+        include_heatmap = include is None or 'heatmap' in include.split(',')
+
+        # Arşivlenen alışkanlıklar varsayılan olarak listelenmez; ?archived=true sadece onları döndürür.
+        # Liste model nesnesi oluşturmadan sadece yanıt sütunları okunarak hazırlanır.
+        query = read_models.habit_rows(Habit.listed(user_id, archived=request.args.get('archived') in ('1', 'true')))
+        next_cursor = None
+        if 'limit' in request.args or 'cursor' in request.args:
+            try:
+                limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            except ValueError:
+                return jsonify({'error': 'limit must be an integer'}), 400
+            limit = max(1, min(limit, current_app.config['MAX_PAGE_SIZE']))
+            try:
+                habits, next_cursor = paginate_habits(query, order, request.args.get('cursor'), limit)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            habits = query.order_by(Habit.created_at if order == 'created_at' else Habit.id, Habit.id).all()
+
+        per_habit = {}
+        if include_heatmap and habits:
+            # Sadece bu sayfadaki alışkanlıkların kayıtları, gün bazında SQL'de sayılır
+            per_habit, _ = query_heatmaps(
+                user_id, start_date=start_date, end_date=end_date, habit_ids=[habit.id for habit in habits]
+            )
+
+        habits_data = read_models.habit_dicts(habits, fields)
+        if include_heatmap:
             # Isı haritası verilerini doğrudan alışkanlık nesnesine ekle
-            habit_logs = logs_by_habit.get(habit.id, [])
-            habit_dict['heatmap'] = format_heatmap_data(habit_logs)
-            habits_data.append(habit_dict)
+            for habit_dict in habits_data:
+                habit_dict['heatmap'] = per_habit.get(habit_dict['id'], {})
 
-        return jsonify(habits_data), 200
+        response = jsonify(habits_data)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
     except Exception as e:
         print(f"Error in get_habits: {e}")
         return jsonify({'error': str(e)}), 500
@@ -121,84 +353,173 @@ def create_habit():
         if not name:
             return jsonify({'error': 'Name is required'}), 400
 
-        habit = Habit(name=name, description=description, user_id=user_id)
+        try:
+            schedule = schedules.parse_schedule(data['schedule']) if data.get('schedule') is not None else {}
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        habit = Habit(name=name, description=description, user_id=user_id, starts_on=user_today(user_id), **schedule)
         db.session.add(habit)
+        db.session.flush()
+        search.index_habit(habit)
         db.session.commit()
+        cache.bump(user_id)
 
         habit_dict = habit.to_dict()
         habit_dict['heatmap'] = {} # Yeni alışkanlık için boş ısı haritası
+        publish_event(user_id, 'habit.created', {'habit': habit_dict})
         return jsonify(habit_dict), 201
     except Exception as e:
         print(f"Error in create_habit: {e}")
         return jsonify({'error': str(e)}), 500
 
-@bp.route('/habits/<int:habit_id>', methods=['GET'])
-def get_habit(habit_id):
+@bp.route('/habits/search', methods=['GET'])
+@cache.cached
+def search_habits():
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({'error': 'Unauthorized'}), 401
 
-        habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
-        if not habit:
-            return jsonify({'error': 'Habit not found'}), 404
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'q is required'}), 400
+
+        try:
+            limit = int(request.args.get('limit', SEARCH_PAGE_SIZE))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({'error': 'limit and offset must be integers'}), 400
+        limit = max(1, min(limit, current_app.config['MAX_PAGE_SIZE']))
+        offset = max(0, offset)
+
+        filters = {}
+        archived = request.args.get('archived') in ('1', 'true')
+        if request.args.get('schedule'):
+            if request.args['schedule'] not in schedules.SCHEDULE_TYPES:
+                return jsonify({'error': f'Invalid schedule. Use {", ".join(schedules.SCHEDULE_TYPES)}'}), 400
+            filters['schedule_type'] = request.args['schedule']
+
+        # Sonuçlar FTS5 indeksinden bm25 sırasıyla gelir; sadece bu sayfanın alışkanlıkları yüklenir
+        matches, fuzzy = search.search_habits(user_id, query, limit, offset, filters, archived=archived)
+        page = matches[:limit]
+        habits = read_models.habits_by_id(user_id, [habit_id for habit_id, _ in page])
 
+        results = []
+        for habit_id, score in page:
+            habit_dict = habits[habit_id]
+            # bm25 puanları küçük değerlerdir (ör. 1e-6); yuvarlama sıralamayı gösteren farkı siler
+            habit_dict['score'] = score
+            results.append(habit_dict)
+
+        return jsonify({
+            'query': query,
+            'results': results,
+            'fuzzy': fuzzy,
+            'next_offset': offset + limit if len(matches) > limit else None
+        }), 200
+    except Exception as e:
+        print(f"Error in search_habits: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/habits/<int:habit_id>', methods=['GET'])
+@habit_required
+def get_habit(habit):
+    try:
         return jsonify(habit.to_dict()), 200
     except Exception as e:
         print(f"Error in get_habit: {e}")
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/habits/<int:habit_id>', methods=['PUT'])
-def update_habit(habit_id):
+@habit_required
+def update_habit(habit):
     try:
-        user_id = get_current_user_id()
-        if not user_id:
-            return jsonify({'error': 'Unauthorized'}), 401
-
-        habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
-        if not habit:
-            return jsonify({'error': 'Habit not found'}), 404
-
         data = request.get_json()
+        previous_text = (habit.name, habit.description)
         habit.name = data.get('name', habit.name)
         habit.description = data.get('description', habit.description)
-        
+        if (habit.name, habit.description) != previous_text:
+            search.index_habit(habit)
+
+        if data.get('schedule') is not None:
+            try:
+                schedule = schedules.parse_schedule(data['schedule'])
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if any(getattr(habit, column) != value for column, value in schedule.items()):
+                for column, value in schedule.items():
+                    setattr(habit, column, value)
+                # Beklenen ve hedefe ulaşılan günler yeni programa göre bir kez yeniden hesaplanır
+                schedules.rebuild_habit_periods(habit)
+
         db.session.commit()
+        cache.bump(habit.user_id)
+        publish_event(habit.user_id, 'habit.updated', {'habit': habit.to_dict()})
         return jsonify(habit.to_dict()), 200
     except Exception as e:
         print(f"Error in update_habit: {e}")
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/habits/<int:habit_id>', methods=['DELETE'])
-def delete_habit(habit_id):
+@habit_required
+def delete_habit(habit):
     try:
-        user_id = get_current_user_id()
-        if not user_id:
-            return jsonify({'error': 'Unauthorized'}), 401
-
-        habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
-        if not habit:
-            return jsonify({'error': 'Habit not found'}), 404
+        user_id, habit_id = habit.user_id, habit.id
 
-        db.session.delete(habit)
+        # Alışkanlık hemen gizlenir; kayıtları ve türetilmiş satırları arka planda parça parça
+        # silinir (süre kayıt sayısından bağımsızdır)
+        mark_deleted(habit)
+        leaderboards.update_user(user_id)
         db.session.commit()
-        return jsonify({'message': 'Habit deleted'}), 200
+        job, _ = job_queue.enqueue(user_id, 'purge_habit', {'habit_id': habit_id})
+        cache.bump(user_id)
+        publish_event(user_id, 'habit.deleted', {'habit_id': habit_id})
+        return jsonify({'message': 'Habit deleted', 'purge_job_id': job.id}), 200
     except Exception as e:
         print(f"Error in delete_habit: {e}")
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/habits/<int:habit_id>/archive', methods=['POST'])
+@habit_required
+def archive_habit(habit):
+    try:
+        if habit.archived_at is None:
+            habit.archived_at = datetime.utcnow()
+            # Arşivlenen alışkanlık günlük toplamlardan ve kullanıcı serisinden çıkar
+            set_habit_counted(habit.user_id, habit.id, False)
+            leaderboards.update_user(habit.user_id)
+            db.session.commit()
+            cache.bump(habit.user_id)
+            publish_event(habit.user_id, 'habit.archived', {'habit_id': habit.id})
+        return jsonify(habit.to_dict()), 200
+    except Exception as e:
+        print(f"Error in archive_habit: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/habits/<int:habit_id>/restore', methods=['POST'])
+@habit_required
+def restore_habit(habit):
+    try:
+        if habit.archived_at is not None:
+            habit.archived_at = None
+            set_habit_counted(habit.user_id, habit.id, True)
+            leaderboards.update_user(habit.user_id)
+            db.session.commit()
+            cache.bump(habit.user_id)
+            publish_event(habit.user_id, 'habit.restored', {'habit': habit.to_dict()})
+        return jsonify(habit.to_dict()), 200
+    except Exception as e:
+        print(f"Error in restore_habit: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # Alışkanlık Günlükleri / Isı Haritası Rotaları
 
 @bp.route('/habits/<int:habit_id>/logs', methods=['POST'])
-def add_habit_log(habit_id):
+@habit_required
+def add_habit_log(habit):
     try:
-        user_id = get_current_user_id()
-        if not user_id:
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
-        if not habit:
-            return jsonify({'error': 'Habit not found'}), 404
+        user_id, habit_id = habit.user_id, habit.id
 
         data = request.get_json()
         date_str = data.get('date') # Format YYYY-AA-GG
@@ -209,22 +530,69 @@ def add_habit_log(habit_id):
             except ValueError:
                 return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
         else:
-            log_date = date.today()
+            # Gün sınırı yazma sırasında kullanıcının saat diliminde bir kez çözülür
+            log_date = user_today(user_id)
+
+        # 'completed' gönderilirse istek geçiş (toggle) yerine idempotent "set" olarak işlenir
+        desired = data.get('completed')
+        if desired is not None and not isinstance(desired, bool):
+            return jsonify({'error': 'completed must be a boolean'}), 400
+
+        # 'count' günün tekrar sayısını ayarlar (0 kaydı siler); hedef (target) sayısına
+        # ulaşılan günler programa göre uyum puanına katkı sağlar
+        count = data.get('count')
+        if count is not None and (not isinstance(count, int) or isinstance(count, bool) or not 0 <= count <= 10000):
+            return jsonify({'error': 'count must be an integer between 0 and 10000'}), 400
+
+        # Arşivlenmiş alışkanlıkların kayıtları kullanıcı düzeyindeki toplamlara ve serilere katılmaz
+        counted = habit.archived_at is None
 
         # Bu tarih için zaten kaydedilmiş mi kontrol et
         existing_log = HabitLog.query.filter_by(habit_id=habit_id, completion_date=log_date).first()
+        if count is not None:
+            if existing_log and count > 0:
+                if existing_log.count != count:
+                    # Kayıt zaten var; sadece sayı değişir (seriler ve günlük toplamlar etkilenmez)
+                    schedules.apply_changes(user_id, [(habit_id, log_date, existing_log.count, count)])
+                    existing_log.count = count
+                    db.session.commit()
+                    cache.bump(user_id)
+                    publish_log_changes(user_id, [(habit_id, log_date, True)])
+                return jsonify(existing_log.to_dict()), 200
+            desired = count > 0
+        if existing_log and desired is True:
+            return jsonify(existing_log.to_dict()), 200
+        if not existing_log and desired is False:
+            return jsonify({'message': 'Log not found (unchanged)', 'completed': False}), 200
+
         if existing_log:
              # Eğer varsa, tamamlanmış demektir. Kullanıcı bunu kapatmak (işareti kaldırmak) istiyor.
              # Bu yüzden kaydı siliyoruz.
              db.session.delete(existing_log)
+             apply_log_change(user_id, habit_id, log_date, completed=False, counted=counted)
+             if counted:
+                 adjust_day(user_id, log_date, -1)
+             bitmaps.apply_changes(user_id, [(habit_id, log_date, False)])
+             schedules.apply_changes(user_id, [(habit_id, log_date, existing_log.count, 0)])
+             leaderboards.update_user(user_id)
              db.session.commit()
+             cache.bump(user_id)
+             publish_log_changes(user_id, [(habit_id, log_date, False)])
              # Silinme durumunu döndür (null veya özel mesaj)
              return jsonify({'message': 'Log deleted (unchecked)', 'completed': False}), 200
         
         # Eğer yoksa, oluştur (varsayılan olarak completed=True veya sadece varlık)
-        log = HabitLog(habit_id=habit_id, completed=True, completion_date=log_date)
+        log = HabitLog(habit_id=habit_id, completed=True, completion_date=log_date, count=count or 1)
         db.session.add(log)
+        apply_log_change(user_id, habit_id, log_date, completed=True, counted=counted)
+        if counted:
+            adjust_day(user_id, log_date, 1)
+        bitmaps.apply_changes(user_id, [(habit_id, log_date, True)])
+        schedules.apply_changes(user_id, [(habit_id, log_date, 0, log.count)])
+        leaderboards.update_user(user_id)
         db.session.commit()
+        cache.bump(user_id)
+        publish_log_changes(user_id, [(habit_id, log_date, True)])
         
         return jsonify(log.to_dict()), 201
 
@@ -232,147 +600,570 @@ def add_habit_log(habit_id):
         print(f"Error in add_habit_log: {e}")
         return jsonify({'error': str(e)}), 500
 
-@bp.route('/habits/<int:habit_id>/heatmap', methods=['GET'])
-def get_habit_heatmap(habit_id):
+@bp.route('/logs/bulk', methods=['POST'])
+def bulk_habit_logs():
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({'error': 'Unauthorized'}), 401
 
-        habit = Habit.query.filter_by(id=habit_id, user_id=user_id).first()
-        if not habit:
-            return jsonify({'error': 'Habit not found'}), 404
+        data = request.get_json()
+        operations = data.get('operations') if isinstance(data, dict) else None
+        if not isinstance(operations, list):
+            return jsonify({'error': 'operations must be a list'}), 400
+
+        max_operations = current_app.config['MAX_BULK_LOG_OPERATIONS']
+        if len(operations) > max_operations:
+            return jsonify({'error': f'Too many operations (max {max_operations})'}), 413
+
+        # Tüm işlemler tek transaction içinde uygulanır
+        results = apply_log_operations(user_id, operations)
+        db.session.commit()
+        cache.bump(user_id)
+        publish_log_changes(user_id, [
+            (result['habit_id'], date.fromisoformat(result['date']), result['completed'])
+            for result in results if result['status'] in ('created', 'deleted')
+        ])
+
+        return jsonify({'results': results}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in bulk_habit_logs: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        # Sadece var olan kayıtları getir (tamamlandığını ima eder)
-        logs = HabitLog.query.filter_by(habit_id=habit_id).all()
-        heatmap_data = format_heatmap_data(logs)
+@bp.route('/habits/<int:habit_id>/heatmap', methods=['GET'])
+@cache.cached
+@habit_required
+def get_habit_heatmap(habit):
+    try:
+        user_id, habit_id = habit.user_id, habit.id
+
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        per_habit, _ = query_heatmaps(user_id, habit_id=habit_id, start_date=start_date, end_date=end_date)
+        heatmap_data = per_habit.get(habit_id, {})
         
         return jsonify(heatmap_data), 200
     except Exception as e:
         print(f"Error in get_habit_heatmap: {e}")
         return jsonify({'error': str(e)}), 500
 
-@bp.route('/stats', methods=['GET'])
-def get_stats():
+@bp.route('/habits/<int:habit_id>/stats', methods=['GET'])
+@cache.cached
+@habit_required
+def get_habit_stats(habit):
+    try:
+        user_id, habit_id = habit.user_id, habit.id
+
+        if current_app.config['HABIT_STORAGE_MODE'] == 'bitmap':
+            # Sayım popcount, seriler bit işlemleriyle hesaplanır
+            year_bits = bitmaps.load(user_id, habit_ids=[habit_id]).get(habit_id, {})
+            total_completions = bitmaps.count(year_bits)
+            current_streak, best_streak = bitmaps.streaks(year_bits, today=user_today(user_id))
+        else:
+            total_completions = HabitLog.query.filter_by(habit_id=habit_id, completed=True).count()
+            current_streak, best_streak = get_streaks(user_id, habit_id)
+
+        # Programa göre seriler hafta cinsindendir (ör. "haftada 3 gün" hedefinin tutturulduğu haftalar)
+        scheduled = schedules.adherence(user_id, [habit])[habit_id]
+
+        return jsonify({
+            'total_completions': total_completions,
+            'current_streak': current_streak,
+            'best_streak': best_streak,
+            'schedule_current_streak': scheduled['current_streak'],
+            'schedule_best_streak': scheduled['best_streak'],
+            'adherence': scheduled['adherence']
+        }), 200
+    except Exception as e:
+        print(f"Error in get_habit_stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/habits/<int:habit_id>/adherence', methods=['GET'])
+@cache.cached
+@habit_required
+def get_habit_adherence(habit):
+    try:
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        result = schedules.adherence(habit.user_id, [habit], start_date, end_date, weeks=True)[habit.id]
+        result['schedule'] = habit.schedule_dict()
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"Error in get_habit_adherence: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/adherence', methods=['GET'])
+@cache.cached
+def get_adherence():
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({'error': 'Unauthorized'}), 401
 
-        total_habits = Habit.query.filter_by(user_id=user_id).count()
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
-        # Kullanıcı için tüm benzersiz tamamlanma tarihlerini getir
-        logs = db.session.query(HabitLog.completion_date).join(Habit).filter(
-            Habit.user_id == user_id
-        ).distinct().order_by(HabitLog.completion_date.desc()).all()
+        habits = Habit.listed(user_id).order_by(Habit.id).all()
+        results = schedules.adherence(user_id, habits, start_date, end_date)
+        expected = sum(result['expected'] for result in results.values())
+        achieved = sum(result['achieved'] for result in results.values())
 
-        dates = [log.completion_date for log in logs]
-        
-        current_streak = 0
-        best_streak = 0
-        
-        if dates:
-            # Calculate Current Streak
-            today = date.today()
-            last_date = dates[0]
-            
-            # Son kayıt bugün veya dün ise, seri potansiyel olarak devam ediyor
-            diff = (today - last_date).days
-            
-            if diff <= 1:
-                current_streak = 1
-                for i in range(len(dates) - 1):
-                    delta = (dates[i] - dates[i+1]).days
-                    if delta == 1:
-                        current_streak += 1
-                    else:
-                        break
-            
-            # Calculate Best Streak
-            temp_streak = 1
-            best_streak = 1
-            for i in range(len(dates) - 1):
-                delta = (dates[i] - dates[i+1]).days
-                if delta == 1:
-                    temp_streak += 1
-                else:
-                    best_streak = max(best_streak, temp_streak)
-                    temp_streak = 1
-            best_streak = max(best_streak, temp_streak)
+        return jsonify({
+            'habits': {str(habit_id): result for habit_id, result in results.items()},
+            'expected': expected,
+            'achieved': achieved,
+            'adherence': round(achieved / expected, 4) if expected else None
+        }), 200
+    except Exception as e:
+        print(f"Error in get_adherence: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/heatmaps', methods=['GET'])
+@cache.cached
+def get_heatmaps():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        # Listelenen alışkanlıkların ısı haritaları ve toplam ısı haritası tek sorguda; arşivlenen
+        # ve silinmiş (henüz temizlenmemiş) alışkanlıklar toplama da katılmaz
+        habit_ids = [row.id for row in Habit.listed(user_id).with_entities(Habit.id)]
+        per_habit, total = query_heatmaps(user_id, start_date=start_date, end_date=end_date, habit_ids=habit_ids)
 
         return jsonify({
-            'total_habits': total_habits,
-            'current_streak': current_streak,
-            'best_streak': best_streak
+            'habits': {str(habit_id): per_habit.get(habit_id, {}) for habit_id in habit_ids},
+            'total': total
         }), 200
+    except Exception as e:
+        print(f"Error in get_heatmaps: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/analytics', methods=['GET'])
+@cache.cached
+def get_analytics():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        try:
+            start_date, end_date = parse_date_range()
+            series_days = int(request.args.get('series_days', 90))
+        except ValueError:
+            return jsonify({'error': 'Invalid parameters. Use YYYY-MM-DD dates and an integer series_days'}), 400
+
+        # numpy sadece bu uç nokta kullanıldığında yüklenir (uygulama açılışını hızlandırır)
+        from app import analytics
+
+        end_date = end_date or user_today(user_id)
+        start_date = start_date or analytics.first_completion_date(user_id) or end_date
+        if start_date > end_date:
+            return jsonify({'error': 'from must not be after to'}), 400
+
+        habit_ids = [row.id for row in Habit.listed(user_id).with_entities(Habit.id).order_by(Habit.id)]
+
+        # Veriler ORM nesneleri yerine doğrudan alışkanlık x gün matrisine yüklenir
+        if current_app.config['HABIT_STORAGE_MODE'] == 'bitmap':
+            matrix = analytics.load_matrix_from_bitmaps(user_id, habit_ids, start_date, end_date)
+        else:
+            matrix = analytics.load_matrix_from_rows(user_id, habit_ids, start_date, end_date)
+
+        return jsonify(analytics.compute_analytics(matrix, habit_ids, start_date, series_days)), 200
+    except Exception as e:
+        print(f"Error in get_analytics: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/export', methods=['GET'])
+def export_history():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        fmt = request.args.get('format', 'csv')
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({'error': 'Invalid format. Use csv or ndjson'}), 400
+
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        compress = request.args.get('gzip') in ('1', 'true')
+        filename = f'habits.{fmt}' + ('.gz' if compress else '')
+        if compress:
+            mimetype = 'application/gzip'
+        else:
+            mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+
+        # Yanıt bellekte oluşturulmaz; satırlar okundukça istemciye akıtılır
+        chunks = generate_export(user_id, fmt, start_date, end_date, compress)
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+    except Exception as e:
+        print(f"Error in export_history: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/stats', methods=['GET'])
+@cache.cached
+def get_stats():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        return jsonify(user_stats(user_id)), 200
     except Exception as e:
         print(f"Error in get_stats: {e}")
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/reports', methods=['GET'])
+@cache.cached
 def get_reports():
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({'error': 'Unauthorized'}), 401
 
-        total_habits = Habit.query.filter_by(user_id=user_id).count()
+        try:
+            start_date, end_date = parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        return jsonify(build_report(user_id, start_date, end_date)), 200
+    except Exception as e:
+        print(f"Error in get_reports: {e}")
+        return jsonify({'error': str(e)}), 500
 
-        # Serileri ve ısı haritasını hesaplamak için kullanıcının tüm kayıtlarını getir
-        logs = db.session.query(HabitLog).join(Habit).filter(
-            Habit.user_id == user_id
-        ).all()
+# Sıralama Rotaları
 
-        # Isı Haritası Veri Toplama
-        heatmap_data = {}
-        unique_dates = set()
-        
-        for log in logs:
-            date_str = log.completion_date.isoformat()
-            heatmap_data[date_str] = heatmap_data.get(date_str, 0) + 1
-            unique_dates.add(log.completion_date)
+DEFAULT_LEADERBOARD_SIZE = 10
 
-        # Seri hesaplaması için tarihleri sırala
-        dates = sorted(list(unique_dates), reverse=True)
-        
-        current_streak = 0
-        best_streak = 0
-        
-        if dates:
-            # Calculate Current Streak
-            today = date.today()
-            last_date = dates[0]
-            
-            diff = (today - last_date).days
-            if diff <= 1:
-                current_streak = 1
-                for i in range(len(dates) - 1):
-                    delta = (dates[i] - dates[i+1]).days
-                    if delta == 1:
-                        current_streak += 1
-                    else:
-                        break
-            
-            # Calculate Best Streak
-            temp_streak = 1
-            best_streak = 1
-            for i in range(len(dates) - 1):
-                delta = (dates[i] - dates[i+1]).days
-                if delta == 1:
-                    temp_streak += 1
-                else:
-                    best_streak = max(best_streak, temp_streak)
-                    temp_streak = 1
-            best_streak = max(best_streak, temp_streak)
+# İstekteki ?metric= ve ?limit= parametrelerini doğrular; hatalı girdide ValueError
+def parse_leaderboard_args():
+    metric = request.args.get('metric', 'current_streak')
+    if metric not in leaderboards.METRICS:
+        raise ValueError(f'metric must be one of {", ".join(leaderboards.METRICS)}')
+    limit = request.args.get('limit', DEFAULT_LEADERBOARD_SIZE, type=int)
+    if not 1 <= limit <= leaderboards.MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {leaderboards.MAX_LIMIT}')
+    return metric, limit
 
-        return jsonify({
-            'stats': {
-                'total_habits': total_habits,
-                'current_streak': current_streak,
-                'best_streak': best_streak
-            },
-            'heatmap': heatmap_data
-        }), 200
+@bp.route('/leaderboards/global', methods=['GET'])
+def get_global_leaderboard():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        try:
+            metric, limit = parse_leaderboard_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        board = leaderboards.global_board(user_id, metric, limit)
+        return jsonify(dict(board, scope='global', metric=metric)), 200
     except Exception as e:
-        print(f"Error in get_reports: {e}")
+        print(f"Error in get_global_leaderboard: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/leaderboards/friends', methods=['GET'])
+def get_friends_leaderboard():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        try:
+            metric, limit = parse_leaderboard_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Kullanıcı kendi arkadaş sıralamasında da yer alır
+        member_ids = [user_id] + [row.friend_id for row in Friendship.query.filter_by(user_id=user_id)]
+        board = leaderboards.members_board(user_id, metric, member_ids, limit)
+        return jsonify(dict(board, scope='friends', metric=metric)), 200
+    except Exception as e:
+        print(f"Error in get_friends_leaderboard: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/groups/<int:group_id>/leaderboard', methods=['GET'])
+def get_group_leaderboard(group_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        try:
+            metric, limit = parse_leaderboard_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        member_ids = [row.user_id for row in LeaderboardGroupMember.query.filter_by(group_id=group_id)]
+        if user_id not in member_ids:
+            return jsonify({'error': 'Group not found'}), 404
+
+        board = leaderboards.members_board(user_id, metric, member_ids, limit)
+        return jsonify(dict(board, scope='group', group_id=group_id, metric=metric)), 200
+    except Exception as e:
+        print(f"Error in get_group_leaderboard: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/groups', methods=['GET'])
+def get_groups():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        groups = LeaderboardGroup.query.join(LeaderboardGroupMember).filter(
+            LeaderboardGroupMember.user_id == user_id
+        ).order_by(LeaderboardGroup.name, LeaderboardGroup.id).all()
+        return jsonify([dict(group.to_dict(), members=group.members.count()) for group in groups]), 200
+    except Exception as e:
+        print(f"Error in get_groups: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/groups', methods=['POST'])
+def create_group():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        data = request.get_json(silent=True) or {}
+        name = (data.get('name') or '').strip()
+        if not name or len(name) > 100:
+            return jsonify({'error': 'Group name is required (max 100 characters)'}), 400
+
+        group = LeaderboardGroup(name=name, owner_id=user_id, invite_code=secrets.token_urlsafe(9))
+        db.session.add(group)
+        db.session.flush()
+        db.session.add(LeaderboardGroupMember(group_id=group.id, user_id=user_id))
+        db.session.commit()
+        return jsonify(dict(group.to_dict(), members=1)), 201
+    except Exception as e:
+        print(f"Error in create_group: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/groups/join', methods=['POST'])
+def join_group():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        data = request.get_json(silent=True) or {}
+        group = LeaderboardGroup.query.filter_by(invite_code=data.get('invite_code') or '').first()
+        if not group:
+            return jsonify({'error': 'Invalid invite code'}), 404
+
+        if db.session.get(LeaderboardGroupMember, (group.id, user_id)) is None:
+            if group.members.count() >= leaderboards.MAX_MEMBERS:
+                return jsonify({'error': 'Group is full'}), 409
+            db.session.add(LeaderboardGroupMember(group_id=group.id, user_id=user_id))
+            db.session.commit()
+
+        return jsonify(dict(group.to_dict(), members=group.members.count())), 200
+    except Exception as e:
+        print(f"Error in join_group: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/groups/<int:group_id>/membership', methods=['DELETE'])
+def leave_group(group_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        membership = db.session.get(LeaderboardGroupMember, (group_id, user_id))
+        if not membership:
+            return jsonify({'error': 'Group not found'}), 404
+
+        db.session.delete(membership)
+        db.session.flush()
+        group = db.session.get(LeaderboardGroup, group_id)
+        # Son üye de ayrılırsa grup silinir
+        if group.members.count() == 0:
+            db.session.delete(group)
+        db.session.commit()
+        return jsonify({'message': 'Left group'}), 200
+    except Exception as e:
+        print(f"Error in leave_group: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/friends', methods=['GET'])
+def get_friends():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        friends = db.session.query(UserDirectory.user_id, UserDirectory.username).join(
+            Friendship, Friendship.friend_id == UserDirectory.user_id
+        ).filter(Friendship.user_id == user_id).order_by(UserDirectory.username).all()
+        return jsonify([{'user_id': row.user_id, 'username': row.username} for row in friends]), 200
+    except Exception as e:
+        print(f"Error in get_friends: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/friends', methods=['POST'])
+def add_friend():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        data = request.get_json(silent=True) or {}
+        entry = UserDirectory.query.filter_by(username=data.get('username') or '').first()
+        if not entry or entry.user_id == user_id:
+            return jsonify({'error': 'User not found'}), 404
+
+        created = db.session.get(Friendship, (user_id, entry.user_id)) is None
+        if created:
+            if Friendship.query.filter_by(user_id=user_id).count() >= leaderboards.MAX_MEMBERS:
+                return jsonify({'error': 'Too many friends'}), 409
+            db.session.add(Friendship(user_id=user_id, friend_id=entry.user_id))
+            db.session.commit()
+
+        return jsonify({'user_id': entry.user_id, 'username': entry.username}), 201 if created else 200
+    except Exception as e:
+        print(f"Error in add_friend: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/friends/<int:friend_id>', methods=['DELETE'])
+def remove_friend(friend_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        friendship = db.session.get(Friendship, (user_id, friend_id))
+        if not friendship:
+            return jsonify({'error': 'Friend not found'}), 404
+
+        db.session.delete(friendship)
+        db.session.commit()
+        return jsonify({'message': 'Friend removed'}), 200
+    except Exception as e:
+        print(f"Error in remove_friend: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Canlı Güncellemeler
+
+@bp.route('/events', methods=['GET'])
+def stream_events():
+    try:
+        user_id = get_current_user_id()
+        if not user_id and request.args.get('access_token'):
+            # EventSource başlık gönderemediğinden token sorgu parametresiyle de kabul edilir
+            user_id = verify_access_token(request.args['access_token'])
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+        if not events.enabled:
+            return jsonify({'error': 'Live updates are disabled'}), 404
+
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        return Response(events.stream(user_id, last_event_id), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no' # Ters vekil sunucuların akışı tamponlamasını engelle
+        })
+    except Exception as e:
+        print(f"Error in stream_events: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Arka Plan İşleri Rotaları
+
+@bp.route('/jobs', methods=['POST'])
+def create_job():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        data = request.get_json(silent=True) or {}
+        params = data.get('params') or {}
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params must be an object'}), 400
+
+        try:
+            job, created = job_queue.enqueue(user_id, data.get('kind'), params)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Aynı iş zaten bekliyorsa yenisi oluşturulmaz, mevcut iş döndürülür
+        return jsonify(job.to_dict()), 202 if created else 200
+    except Exception as e:
+        print(f"Error in create_job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        jobs = Job.query.filter_by(user_id=user_id).order_by(Job.created_at.desc(), Job.id.desc()).limit(20).all()
+        return jsonify([job.to_dict() for job in jobs]), 200
+    except Exception as e:
+        print(f"Error in get_jobs: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        job = Job.query.filter_by(id=job_id, user_id=user_id).first()
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        print(f"Error in get_job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/jobs/<int:job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({'error': 'Unauthorized'}), 401
+
+        job = Job.query.filter_by(id=job_id, user_id=user_id).first()
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        if job.status != 'succeeded':
+            return jsonify({'error': f'Job is {job.status}'}), 409
+
+        result = json.loads(job.result) if job.result else None
+        if job.kind == 'export':
+            # Dışa aktarma dosyası diskten akıtılır
+            return send_file(result['path'], mimetype=result['mimetype'], as_attachment=True,
+                             download_name=result['filename'])
+
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"Error in get_job_result: {e}")
         return jsonify({'error': str(e)}), 500
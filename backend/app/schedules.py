@@ -0,0 +1,378 @@
+from datetime import timedelta
+from sqlalchemy import case, func
+from app import db
+from app.models import Habit, HabitLog, HabitPeriod, HabitWeekRun
+
+# Alışkanlık programları ve uyum (adherence) puanı. Her alışkanlık için haftalık
+# habit_period satırları beklenen gün sayısını ve hedefe ulaşılan gün sayısını tutar; kayıt
+# yazımları sadece etkilenen haftanın sayacını değiştirir. Okumalar programı gün gün yeniden
+# türetmek yerine istenen hafta aralığını toplar; satırı olmayan haftaların beklenen değeri
+# kapalı formülle hesaplanır. Hedefin tutturulduğu ardışık haftalar habit_week_run tablosunda
+# seriler olarak tutulur; böylece haftalık seriler geçmiş taranmadan okunur.
+
+SCHEDULE_TYPES = ('daily', 'weekly', 'weekdays')
+ONE_WEEK = timedelta(days=7)
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def parse_schedule(data):
+    """
+    İstekteki 'schedule' nesnesini Habit sütunlarına çevirir. Hatalı girdide ValueError.
+
+    Örnek: {'type': 'weekly', 'times_per_week': 3, 'target': 1}
+           {'type': 'weekdays', 'days': [0, 2, 4]}  (0 = Pazartesi)
+    """
+    if not isinstance(data, dict):
+        raise ValueError('schedule must be an object')
+
+    schedule_type = data.get('type', 'daily')
+    if schedule_type not in SCHEDULE_TYPES:
+        raise ValueError(f'schedule.type must be one of {", ".join(SCHEDULE_TYPES)}')
+
+    target = data.get('target', 1)
+    if not isinstance(target, int) or isinstance(target, bool) or not 1 <= target <= 1000:
+        raise ValueError('schedule.target must be an integer between 1 and 1000')
+
+    values = {'schedule_type': schedule_type, 'schedule_days': None, 'times_per_week': None, 'target_count': target}
+    if schedule_type == 'weekly':
+        times = data.get('times_per_week')
+        if not isinstance(times, int) or isinstance(times, bool) or not 1 <= times <= 7:
+            raise ValueError('schedule.times_per_week must be an integer between 1 and 7')
+        values['times_per_week'] = times
+    elif schedule_type == 'weekdays':
+        days = data.get('days')
+        if not isinstance(days, list) or not days or not all(
+            isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6 for day in days
+        ):
+            raise ValueError('schedule.days must be a non-empty list of weekdays (0 = Monday ... 6 = Sunday)')
+        values['schedule_days'] = sum(1 << day for day in set(days))
+    return values
+
+
+def counts_toward(habit, day):
+    """Bu günde hedefe ulaşmak programa katkı sağlar mı (haftanın seçili günlerinden biri mi)?"""
+    return habit.schedule_type != 'weekdays' or bool(habit.schedule_days >> day.weekday() & 1)
+
+
+def expected_between(habit, start, end):
+    """
+    [start, end] aralığında (uçlar dahil) beklenen gün sayısı; starts_on öncesi sayılmaz.
+    Haftalık programda her takvim haftası için min(times_per_week, haftanın aralıktaki gün sayısı).
+    """
+    if habit.starts_on and start < habit.starts_on:
+        start = habit.starts_on
+    if end < start:
+        return 0
+
+    days = (end - start).days + 1
+    if habit.schedule_type == 'daily':
+        return days
+    if habit.schedule_type == 'weekdays':
+        full_weeks, rest = divmod(days, 7)
+        per_week = bin(habit.schedule_days).count('1')
+        return full_weeks * per_week + sum(
+            habit.schedule_days >> ((start.weekday() + i) % 7) & 1 for i in range(rest)
+        )
+
+    # weekly: ilk ve son (kısmi) haftalar ayrıca, aradaki tam haftalar toplu olarak sayılır
+    first_end = week_start(start) + timedelta(days=6)
+    if end <= first_end:
+        return min(habit.times_per_week, days)
+    last_start = week_start(end)
+    total = min(habit.times_per_week, (first_end - start).days + 1)
+    total += ((last_start - first_end).days - 1) // 7 * habit.times_per_week
+    total += min(habit.times_per_week, (end - last_start).days + 1)
+    return total
+
+
+def week_expected(habit, week):
+    return expected_between(habit, week, week + timedelta(days=6))
+
+
+def _period(habit, week):
+    row = db.session.get(HabitPeriod, (habit.id, week))
+    if row is None:
+        row = HabitPeriod(habit_id=habit.id, week_start=week, user_id=habit.user_id,
+                          expected=week_expected(habit, week), achieved=0)
+        db.session.add(row)
+    return row
+
+
+def apply_changes(user_id, changes):
+    """
+    (habit_id, gün, eski sayı, yeni sayı) değişikliklerini haftalık sayaçlara uygular.
+    Eski/yeni sayı 0 ise o gün kayıt yoktur. Commit çağırana bırakılır.
+    """
+    if not changes:
+        return
+    habits = {
+        habit.id: habit for habit in Habit.query.filter(
+            Habit.user_id == user_id, Habit.id.in_({habit_id for habit_id, _, _, _ in changes})
+        )
+    }
+
+    deltas = {}
+    touched = set()
+    for habit_id, day, old_count, new_count in changes:
+        habit = habits[habit_id]
+        if new_count and (habit.starts_on is None or day < habit.starts_on):
+            # Başlangıçtan eski bir kayıt: beklenen günler o tarihten itibaren sayılır
+            previous_start = habit.starts_on
+            habit.starts_on = day
+            if previous_start is not None:
+                row = db.session.get(HabitPeriod, (habit_id, week_start(previous_start)))
+                if row is not None:
+                    row.expected = week_expected(habit, row.week_start)
+                    touched.add((habit_id, row.week_start))
+
+        if not counts_toward(habit, day):
+            continue
+        target = habit.target_count
+        delta = int(new_count >= target) - int(old_count >= target)
+        if delta:
+            key = (habit_id, week_start(day))
+            deltas[key] = deltas.get(key, 0) + delta
+
+    for (habit_id, week), delta in deltas.items():
+        _period(habits[habit_id], week).achieved += delta
+        touched.add((habit_id, week))
+
+    # Hedefe ulaşma durumu değişmiş olabilecek haftaların seri üyeliği güncellenir
+    for habit_id, week in sorted(touched):
+        row = db.session.get(HabitPeriod, (habit_id, week))
+        if row is not None and week_met(row.expected, row.achieved):
+            _add_week(habits[habit_id], week)
+        else:
+            _remove_week(habits[habit_id], week)
+
+
+def rebuild_habit_periods(habit):
+    """Alışkanlığın haftalık satırlarını kayıtlardan baştan hesaplar (program değişince)."""
+    HabitPeriod.query.filter_by(habit_id=habit.id).delete(synchronize_session=False)
+
+    first_log = db.session.query(func.min(HabitLog.completion_date)).filter(HabitLog.habit_id == habit.id).scalar()
+    if first_log is not None and (habit.starts_on is None or first_log < habit.starts_on):
+        habit.starts_on = first_log
+
+    achieved = {}
+    weeks = set()
+    rows = db.session.query(HabitLog.completion_date, HabitLog.count).filter(HabitLog.habit_id == habit.id)
+    for day, count in rows:
+        week = week_start(day)
+        weeks.add(week)
+        if count >= habit.target_count and counts_toward(habit, day):
+            achieved[week] = achieved.get(week, 0) + 1
+
+    met_weeks = []
+    for week in sorted(weeks):
+        expected = week_expected(habit, week)
+        db.session.add(HabitPeriod(habit_id=habit.id, week_start=week, user_id=habit.user_id,
+                                   expected=expected, achieved=achieved.get(week, 0)))
+        if week_met(expected, achieved.get(week, 0)):
+            met_weeks.append(week)
+
+    _week_runs(habit).delete(synchronize_session=False)
+    start = previous = None
+    for week in met_weeks + [None]:
+        if start is not None and (week is None or week - previous != ONE_WEEK):
+            run = HabitWeekRun(habit_id=habit.id, user_id=habit.user_id)
+            _set_bounds(run, start, previous)
+            db.session.add(run)
+            start = None
+        if start is None:
+            start = week
+        previous = week
+
+
+def rebuild_user_periods(user_id):
+    for habit in Habit.query.filter_by(user_id=user_id).all():
+        rebuild_habit_periods(habit)
+
+
+# Haftalık seriler
+
+def week_met(expected, achieved):
+    """Haftada hedef tutturuldu mu? Beklentisi sıfır olan haftalar (ör. başlangıç haftasının
+    seçili günleri geçmişse) seriye katılmaz ama seriyi de bozmaz."""
+    return expected > 0 and achieved >= expected
+
+
+def _week_runs(habit):
+    return HabitWeekRun.query.filter(HabitWeekRun.user_id == habit.user_id, HabitWeekRun.habit_id == habit.id)
+
+
+def _set_bounds(run, start_week, end_week):
+    run.start_week = start_week
+    run.end_week = end_week
+    run.length = (end_week - start_week).days // 7 + 1
+
+
+def _add_week(habit, week):
+    """Haftayı alışkanlığın haftalık serilerine ekler; gerekirse komşu serileri birleştirir."""
+    runs = _week_runs(habit)
+    if runs.filter(HabitWeekRun.start_week <= week, HabitWeekRun.end_week >= week).first():
+        return
+
+    previous = runs.filter(HabitWeekRun.end_week == week - ONE_WEEK).first()
+    following = runs.filter(HabitWeekRun.start_week == week + ONE_WEEK).first()
+
+    if previous and following:
+        _set_bounds(previous, previous.start_week, following.end_week)
+        db.session.delete(following)
+    elif previous:
+        _set_bounds(previous, previous.start_week, week)
+    elif following:
+        _set_bounds(following, week, following.end_week)
+    else:
+        run = HabitWeekRun(habit_id=habit.id, user_id=habit.user_id)
+        _set_bounds(run, week, week)
+        db.session.add(run)
+
+
+def _remove_week(habit, week):
+    """Haftayı alışkanlığın haftalık serilerinden çıkarır; gerekirse seriyi ikiye böler."""
+    run = _week_runs(habit).filter(
+        HabitWeekRun.start_week <= week, HabitWeekRun.end_week >= week
+    ).first()
+    if not run:
+        return
+
+    if run.start_week == run.end_week:
+        db.session.delete(run)
+    elif week == run.start_week:
+        _set_bounds(run, week + ONE_WEEK, run.end_week)
+    elif week == run.end_week:
+        _set_bounds(run, run.start_week, week - ONE_WEEK)
+    else:
+        tail = HabitWeekRun(habit_id=habit.id, user_id=habit.user_id)
+        _set_bounds(tail, week + ONE_WEEK, run.end_week)
+        _set_bounds(run, run.start_week, week - ONE_WEEK)
+        db.session.add(tail)
+
+
+def _streaks(habit, previous_run, best_before, current_row):
+    """
+    Programa göre (mevcut, en iyi) seri, hafta cinsinden: hedefin tutturulduğu ardışık haftalar.
+    Devam eden hafta, hedef tutturulduysa seriye eklenir; henüz tutturulmadıysa seriyi bozmaz.
+
+    Argümanlar:
+        previous_run (int): Geçen haftayı içeren serinin o haftaya kadarki uzunluğu.
+        best_before (int): Geçen haftadan önce biten serilerin en uzunu.
+        current_row (tuple): Devam eden haftanın (beklenen, ulaşılan) değerleri; satır yoksa None.
+    """
+    if habit.starts_on is None:
+        return 0, 0
+    expected, achieved = current_row or (1, 0)
+    current = previous_run + 1 if achieved >= expected else previous_run
+    return current, max(best_before, previous_run, current)
+
+
+def _weeks(first, last):
+    week = first
+    while week <= last:
+        yield week
+        week += ONE_WEEK
+
+
+def adherence(user_id, habits, start_date=None, end_date=None, today=None, weeks=False):
+    """
+    Alışkanlıkların verilen aralıktaki uyum puanı ve programa göre serileri. Aralık takvim
+    haftalarına genişletilir ve bugünle sınırlanır; devam eden haftanın beklentisi bugüne kadar
+    sayılır. Haftalık satırlar sadece istenen aralıkta toplanır; seriler habit_week_run'dan okunur.
+
+    Döndürür:
+        dict: habit_id -> {'from', 'to', 'expected', 'achieved', 'adherence', 'current_streak',
+              'best_streak'} (weeks=True ise hafta hafta 'weeks' listesi de eklenir).
+    """
+    from app.timezones import user_today
+
+    today = today or user_today(user_id)
+    current_week = week_start(today)
+    previous_week = current_week - ONE_WEEK
+    end = min(end_date or today, today)
+    last = week_start(end)
+    # Başlangıç verilmezse her alışkanlık starts_on haftasından sayılır; ondan önce satır yoktur
+    lower = week_start(start_date) if start_date else None
+
+    def scoped(query, model):
+        query = query.filter(model.user_id == user_id)
+        if len(habits) == 1:
+            query = query.filter(model.habit_id == habits[0].id)
+        return query
+
+    current_rows = {
+        row.habit_id: (row.expected, row.achieved) for row in scoped(
+            db.session.query(HabitPeriod.habit_id, HabitPeriod.expected, HabitPeriod.achieved), HabitPeriod
+        ).filter(HabitPeriod.week_start == current_week)
+    }
+
+    # Geçmiş haftalarda en fazla beklenen kadar gün sayılır; devam eden hafta aşağıda ayrıca eklenir
+    capped = case((HabitPeriod.achieved < HabitPeriod.expected, HabitPeriod.achieved), else_=HabitPeriod.expected)
+    totals = scoped(db.session.query(HabitPeriod.habit_id, func.sum(capped)), HabitPeriod).filter(
+        HabitPeriod.week_start <= min(last, previous_week)
+    )
+    if lower is not None:
+        totals = totals.filter(HabitPeriod.week_start >= lower)
+    achieved_before = dict(totals.group_by(HabitPeriod.habit_id).all())
+
+    # Geçen haftayı içeren seri ve ondan önce biten en uzun seri; gelecekteki haftalar sayılmaz
+    previous_runs = {
+        row.habit_id: (previous_week - row.start_week).days // 7 + 1 for row in scoped(
+            db.session.query(HabitWeekRun.habit_id, HabitWeekRun.start_week), HabitWeekRun
+        ).filter(HabitWeekRun.start_week <= previous_week, HabitWeekRun.end_week >= previous_week)
+    }
+    best_runs = dict(scoped(
+        db.session.query(HabitWeekRun.habit_id, func.max(HabitWeekRun.length)), HabitWeekRun
+    ).filter(HabitWeekRun.end_week < previous_week).group_by(HabitWeekRun.habit_id).all())
+
+    rows_by_habit = {}
+    if weeks:
+        query = scoped(db.session.query(HabitPeriod.habit_id, HabitPeriod.week_start, HabitPeriod.expected,
+                                        HabitPeriod.achieved), HabitPeriod).filter(HabitPeriod.week_start <= last)
+        if lower is not None:
+            query = query.filter(HabitPeriod.week_start >= lower)
+        for row in query.order_by(HabitPeriod.habit_id, HabitPeriod.week_start):
+            rows_by_habit.setdefault(row.habit_id, []).append((row.week_start, row.expected, row.achieved))
+
+    results = {}
+    for habit in habits:
+        current_streak, best_streak = _streaks(
+            habit, previous_runs.get(habit.id, 0), best_runs.get(habit.id, 0), current_rows.get(habit.id)
+        )
+
+        first = week_start(start_date or habit.starts_on or end)
+        range_end = min(last + timedelta(days=6), today)
+
+        achieved = achieved_before.get(habit.id) or 0
+        if first <= current_week <= last and habit.id in current_rows:
+            # Devam eden haftada en fazla bugüne kadar beklenen kadar gün sayılır
+            achieved += min(current_rows[habit.id][1], expected_between(habit, current_week, today))
+
+        expected = expected_between(habit, first, range_end)
+        result = {
+            'from': first.isoformat(),
+            'to': range_end.isoformat(),
+            'expected': expected,
+            'achieved': achieved,
+            'adherence': round(achieved / expected, 4) if expected else None,
+            'current_streak': current_streak,
+            'best_streak': best_streak
+        }
+        if weeks:
+            periods = {}
+            for week, week_expected_days, week_achieved in rows_by_habit.get(habit.id, []):
+                cap = expected_between(habit, week, today) if week == current_week else week_expected_days
+                periods[week] = (cap, min(week_achieved, cap))
+            result['weeks'] = [
+                {
+                    'week_start': week.isoformat(),
+                    'expected': periods[week][0] if week in periods else expected_between(habit, week, min(week + timedelta(days=6), today)),
+                    'achieved': periods[week][1] if week in periods else 0
+                }
+                for week in _weeks(first, last)
+            ]
+        results[habit.id] = result
+    return results
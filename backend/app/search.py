@@ -0,0 +1,139 @@
+import difflib
+import re
+import unicodedata
+from sqlalchemy import text
+from app import db
+
+# Alışkanlık adı ve açıklaması üzerinde tam metin arama. habit_fts bir SQLite FTS5 sanal
+# tablosudur (rowid = habit.id); 'owner' sütunu 'u<user_id>' belirtecini tutar, böylece
+# kullanıcı filtresi de indeks üzerinden yapılır. Tablo, alışkanlık oluşturma/güncelleme/silme
+# ile aynı işlemde güncel tutulur (bkz. routes.py); tablo models.py'de Habit tablosuyla
+# birlikte oluşturulur.
+#
+# Her terim önek olarak aranır ("kit" -> kitap). Hiç sonuç yoksa, yazım hatalarına karşı
+# terimler fts5vocab tablosundaki benzer terimlerle (difflib) genişletilerek bir kez daha aranır.
+
+MAX_TERMS = 8
+# Yazım hatası toleransı: terim en az bu uzunlukta olmalı, benzerlik bu eşiği geçmeli
+MIN_FUZZY_LENGTH = 3
+FUZZY_CUTOFF = 0.75
+FUZZY_CANDIDATES = 3
+FUZZY_VOCAB_LIMIT = 5000
+# Ad eşleşmeleri açıklama eşleşmelerinden daha üstte sıralanır (owner, name, description)
+RANK_WEIGHTS = (0.0, 10.0, 1.0)
+
+_TERM = re.compile(r'\w+')
+
+
+def _owner(user_id):
+    return f'u{user_id}'
+
+
+def _normalize(value):
+    # FTS5 'unicode61 remove_diacritics 2' ayrıştırıcısına yakın: küçük harf, aksanlar atılır
+    decomposed = unicodedata.normalize('NFKD', value.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def parse_terms(query):
+    return _TERM.findall(_normalize(query))[:MAX_TERMS]
+
+
+def index_habit(habit, connection=None):
+    """Alışkanlığın arama belgesini ekler veya günceller (commit çağırana bırakılır)."""
+    connection = connection or db.session
+    connection.execute(text('DELETE FROM habit_fts WHERE rowid = :id'), {'id': habit.id})
+    connection.execute(
+        text('INSERT INTO habit_fts (rowid, owner, name, description) VALUES (:id, :owner, :name, :description)'),
+        {'id': habit.id, 'owner': _owner(habit.user_id), 'name': habit.name, 'description': habit.description or ''}
+    )
+
+
+def unindex_habit(habit_id, connection=None):
+    connection = connection or db.session
+    connection.execute(text('DELETE FROM habit_fts WHERE rowid = :id'), {'id': habit_id})
+
+
+def delete_user_documents(user_id, connection=None):
+    connection = connection or db.session
+    connection.execute(
+        text('DELETE FROM habit_fts WHERE rowid IN (SELECT rowid FROM habit_fts WHERE habit_fts MATCH :owner)'),
+        {'owner': f'owner:{_owner(user_id)}'}
+    )
+
+
+def rebuild_user_index(user_id, connection=None):
+    """Kullanıcının arama belgelerini habit tablosundan baştan oluşturur."""
+    connection = connection or db.session
+    delete_user_documents(user_id, connection)
+    connection.execute(
+        # Silinen bir alışkanlığın id'si yeniden kullanılmış olabilir; eski belge değiştirilir
+        text("INSERT OR REPLACE INTO habit_fts (rowid, owner, name, description) "
+             "SELECT id, :owner, name, COALESCE(description, '') FROM habit WHERE user_id = :user_id"),
+        {'owner': _owner(user_id), 'user_id': user_id}
+    )
+
+
+def _similar_prefixes(term):
+    """Sözlükte terime benzeyen önekler (aynı harfle başlayan terimler arasından)."""
+    upper = term[0] + '\U0010ffff'
+    rows = db.session.execute(
+        text('SELECT term FROM habit_fts_vocab WHERE term >= :lower AND term < :upper '
+             'AND length(term) >= :min_length LIMIT :limit'),
+        {'lower': term[0], 'upper': upper, 'min_length': len(term) - 1, 'limit': FUZZY_VOCAB_LIMIT}
+    ).scalars()
+
+    # Kullanıcı kelimenin tamamını yazmamış olabilir: adaylar terim uzunluğunda kırpılır
+    prefixes = set()
+    for candidate in rows:
+        prefixes.update({candidate[:len(term) - 1], candidate[:len(term)], candidate[:len(term) + 1]})
+    prefixes.discard(term)
+    return difflib.get_close_matches(term, prefixes, n=FUZZY_CANDIDATES, cutoff=FUZZY_CUTOFF)
+
+
+def _match_expression(user_id, terms, fuzzy):
+    parts = []
+    for term in terms:
+        alternatives = [term]
+        if fuzzy and len(term) >= MIN_FUZZY_LENGTH:
+            alternatives += _similar_prefixes(term)
+        parts.append('(' + ' OR '.join(f'"{alternative}"*' for alternative in alternatives) + ')')
+    return f'owner:{_owner(user_id)} AND {{name description}}:({" AND ".join(parts)})'
+
+
+def _search(expression, filters, archived, limit, offset):
+    conditions = ' AND habit.deleted_at IS NULL'
+    conditions += ' AND habit.archived_at IS NOT NULL' if archived else ' AND habit.archived_at IS NULL'
+    conditions += ''.join(f' AND habit.{column} = :{column}' for column in filters)
+    rows = db.session.execute(
+        text(f'SELECT habit.id, bm25(habit_fts, {", ".join(map(str, RANK_WEIGHTS))}) AS score '
+             f'FROM habit_fts JOIN habit ON habit.id = habit_fts.rowid '
+             f'WHERE habit_fts MATCH :expression{conditions} '
+             f'ORDER BY score, habit.id LIMIT :limit OFFSET :offset'),
+        dict(filters, expression=expression, limit=limit, offset=offset)
+    ).all()
+    return [(row.id, -row.score) for row in rows]
+
+
+def search_habits(user_id, query, limit, offset=0, filters=None, archived=False):
+    """
+    Kullanıcının alışkanlıklarında arama yapar; sonuçlar bm25 puanına göre sıralanır.
+
+    Argümanlar:
+        filters (dict): Habit sütunu -> değer eşitlik filtreleri (ör. {'schedule_type': 'weekly'}).
+        archived (bool): True ise sadece arşivlenen alışkanlıklarda aranır.
+
+    Döndürür:
+        tuple: ([(habit_id, puan), ...] en fazla limit+1 öğe, yazım hatası toleransı kullanıldı mı)
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return [], False
+    filters = filters or {}
+
+    exact = _match_expression(user_id, terms, fuzzy=False)
+    results = _search(exact, filters, archived, limit + 1, offset)
+    if results or (offset and _search(exact, filters, archived, 1, 0)):
+        return results, False
+    # Tam eşleşme yok: sonraki sayfalar da aynı genişletilmiş sorguyla hesaplanır
+    return _search(_match_expression(user_id, terms, fuzzy=True), filters, archived, limit + 1, offset), True
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Parola özetleme CPU yoğun olduğundan sınırlı bir iş parçacığı havuzunda çalıştırılır.
+# hashlib'in scrypt/pbkdf2 uygulamaları GIL'i bırakır; havuz boyutu aynı anda yapılan özetleme
+# sayısını sınırlar ve kuyrukta çok bekleyen istekler hızlıca reddedilir.
+
+
+class HashingBusy(Exception):
+    """Özetleme havuzu zaman aşımı içinde isteği işleyemediğinde fırlatılır."""
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        app.config.setdefault('PASSWORD_HASH_WORKERS', 4)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10)
+
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config['PASSWORD_HASH_WORKERS'], thread_name_prefix='password-hash'
+        )
+        # Saklanan özetlerin başındaki "yöntem:parametreler" kısmı güncel ayarlarla karşılaştırılır
+        self._dummy_hash = generate_password_hash('dummy-password', method=self.method)
+        self.method_prefix = self._dummy_hash.split('$', 1)[0]
+        app.extensions['password_hasher'] = self
+
+    def _run(self, fn, *args):
+        future = self.executor.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HashingBusy('Password hashing queue is full')
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """
+        Parolayı doğrular. password_hash None ise (bilinmeyen kullanıcı) aynı maliyetle
+        sahte bir özet doğrulanır ve False döner; böylece yanıt süresi kullanıcının varlığını sızdırmaz.
+        """
+        if password_hash is None:
+            self._run(check_password_hash, self._dummy_hash, password or '')
+            return False
+        return self._run(check_password_hash, password_hash, password or '')
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split('$', 1)[0] != self.method_prefix
+
+
+def get_hasher():
+    return current_app.extensions['password_hasher']
+
+
+password_hasher = PasswordHasher()
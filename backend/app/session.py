@@ -0,0 +1,40 @@
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Table, inspect
+from sqlalchemy.sql.dml import UpdateBase
+
+# Her zaman varsayılan veritabanında (genel dizin) duran tablolar (dizin, iş kuyruğu ve
+# kullanıcılar arası ilişkiler); diğer tüm tablolar kullanıcının shard'ındadır (bkz. app/sharding.py)
+GLOBAL_TABLES = frozenset({'user_directory', 'job', 'leaderboard_group', 'leaderboard_group_member', 'friendship'})
+
+
+class ShardedSession(Session):
+    """Genel tabloları varsayılan veritabanına, diğerlerini seçili shard'a yönlendiren oturum."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        bind_keys = current_app.extensions['shard_bind_keys']
+        if bind is not None or bind_keys == (None,):
+            return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        table = _table_of(mapper, clause)
+        if table is not None and table.name in GLOBAL_TABLES:
+            return self._db.engines[None]
+
+        # Shard, kullanıcı belirlendiğinde app.sharding.use_shard ile seçilir
+        shard = self.info.get('shard')
+        if shard is None:
+            if table is not None:
+                raise RuntimeError(f'No shard selected for table {table.name}')
+            return self._db.engines[None]
+        return self._db.engines[bind_keys[shard]]
+
+
+def _table_of(mapper, clause):
+    # Tablo belirlenemeyen ifadeler (ör. text()) seçili shard'a gider
+    if mapper is not None:
+        return inspect(mapper).local_table
+    if isinstance(clause, Table):
+        return clause
+    if isinstance(clause, UpdateBase) and isinstance(clause.table, Table):
+        return clause.table
+    return None
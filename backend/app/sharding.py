@@ -0,0 +1,308 @@
+import zlib
+from flask import current_app
+from sqlalchemy import delete, select, update
+from app import db
+from app.cache import LRUCache
+from app.session import GLOBAL_TABLES
+
+# Kullanıcı verisi user_id'ye göre N SQLite veritabanına (shard) bölünür; böylece farklı
+# kullanıcıların yazmaları aynı yazar kilidini beklemez. Varsayılan veritabanı
+# (SQLALCHEMY_DATABASE_URI) genel dizini tutar: kullanıcı adı/e-posta benzersizliği, global
+# kullanıcı id'si ve kullanıcının hangi shard'da olduğu. İş kuyruğu da buradadır.
+#
+# Her istekte oturum, kullanıcı belirlendiğinde (get_current_user_id) o kullanıcının shard'ına
+# yönlendirilir. Tüm veritabanları aynı şemaya sahiptir ve aynı göçlerle yükseltilir.
+# SHARD_DATABASE_URLS boşsa tek shard vardır ve o da varsayılan veritabanıdır.
+
+# Kullanıcı -> shard eşlemesi; taşınan kullanıcılar başka süreçlerde en geç TTL sonunda görülür
+_user_shards = LRUCache(max_entries=100000, default_ttl=60)
+# Kullanıcı adı/e-posta -> kullanıcı id'si (değişmez); girişte dizin sorgusunu atlamak için
+_login_user_ids = LRUCache(max_entries=100000, default_ttl=3600)
+
+
+def placement(user_id, shard_count):
+    """Yeni bir kullanıcının yerleştirileceği shard (user_id'nin sabit bir özeti)."""
+    return zlib.crc32(str(user_id).encode('ascii')) % shard_count
+
+
+class ShardRouter:
+    def init_app(self, app):
+        """db.init_app'ten önce çağrılır; shard veritabanlarını SQLALCHEMY_BINDS'e ekler."""
+        app.config.setdefault('SHARD_DATABASE_URLS', [])
+        app.config.setdefault('SHARD_DIRECTORY_TTL', 60)
+        _user_shards.default_ttl = app.config['SHARD_DIRECTORY_TTL']
+
+        default_uri = app.config['SQLALCHEMY_DATABASE_URI']
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        bind_keys = []
+        for index, uri in enumerate(app.config['SHARD_DATABASE_URLS'] or [default_uri]):
+            # Varsayılan veritabanıyla aynı adresteki shard ayrı bir motor açmaz
+            if uri == default_uri:
+                bind_keys.append(None)
+            else:
+                binds[f'shard{index}'] = uri
+                bind_keys.append(f'shard{index}')
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+        app.extensions['shards'] = self
+        app.extensions['shard_bind_keys'] = tuple(bind_keys)
+
+    @property
+    def bind_keys(self):
+        return current_app.extensions['shard_bind_keys']
+
+    @property
+    def count(self):
+        return len(self.bind_keys)
+
+    @property
+    def enabled(self):
+        return self.bind_keys != (None,)
+
+    def engine(self, shard):
+        return db.engines[self.bind_keys[shard]]
+
+
+shards = ShardRouter()
+
+
+def shard_of(user_id):
+    """Kullanıcının shard'ı; dizinde yoksa None."""
+    from app.models import UserDirectory
+
+    if not shards.enabled:
+        return 0
+    key = str(user_id)
+    shard = _user_shards.get(key)
+    if shard is None:
+        shard = db.session.query(UserDirectory.shard).filter_by(user_id=user_id).scalar()
+        if shard is None:
+            return None
+        _user_shards.set(key, shard)
+    return shard
+
+
+def use_shard(user_id):
+    """Oturumu kullanıcının shard'ına yönlendirir. Kullanıcı bilinmiyorsa False döner."""
+    shard = shard_of(user_id)
+    if shard is None:
+        return False
+    db.session.info['shard'] = shard
+    return True
+
+
+def each_shard():
+    """
+    Oturumu sırayla her shard'a yönlendirir (kullanıcılar arası okumalar için); döngü bitince
+    önceki shard seçimi geri yüklenir.
+    """
+    previous = db.session.info.get('shard')
+    try:
+        for shard in range(shards.count):
+            db.session.info['shard'] = shard
+            yield shard
+    finally:
+        if previous is None:
+            db.session.info.pop('shard', None)
+        else:
+            db.session.info['shard'] = previous
+
+
+def forget_user_shard(user_id):
+    _user_shards.delete(str(user_id))
+
+
+def create_user(username, email, **fields):
+    """
+    Kullanıcıyı dizine ve yerleştirildiği shard'a ekler (commit çağıran tarafta yapılır).
+    Global id dizin tablosundan alınır ve shard'daki user satırında aynen kullanılır.
+    """
+    from app.models import User, UserDirectory
+
+    entry = UserDirectory(username=username, email=email, shard=0)
+    db.session.add(entry)
+    db.session.flush()
+    entry.shard = placement(entry.user_id, shards.count)
+
+    db.session.info['shard'] = entry.shard
+    user = User(id=entry.user_id, username=username, email=email, **fields)
+    db.session.add(user)
+    return user
+
+
+def find_user(username_or_email):
+    """
+    Kullanıcı adı veya e-postaya göre kullanıcıyı bulur ve oturumu shard'ına yönlendirir. Tek
+    veritabanında ve önbellekte bulunan kullanıcılarda tek sorgu yapılır; dizin sadece ilk
+    girişte (veya önbellek süresi dolunca) sorgulanır.
+    """
+    from app.models import User, UserDirectory
+
+    if not shards.enabled:
+        # Kullanıcı satırı dizinle aynı veritabanındadır
+        return User.query.filter((User.username == username_or_email) | (User.email == username_or_email)).first()
+
+    user_id = _login_user_ids.get(username_or_email)
+    if user_id is not None and use_shard(user_id):
+        user = db.session.get(User, user_id)
+        if user is not None and username_or_email in (user.username, user.email):
+            return user
+
+    entry = UserDirectory.query.filter(
+        (UserDirectory.username == username_or_email) | (UserDirectory.email == username_or_email)
+    ).first()
+    if entry is None:
+        return None
+    _login_user_ids.set(username_or_email, entry.user_id)
+    _user_shards.set(str(entry.user_id), entry.shard)
+    db.session.info['shard'] = entry.shard
+    return db.session.get(User, entry.user_id)
+
+
+def create_schema():
+    """Şemayı varsayılan veritabanında ve tüm shard'larda oluşturur (geliştirme/test için)."""
+    # Modeller tek bir metadata paylaşır; db.create_all() yerine her motorda ayrıca oluşturulur
+    db.metadata.create_all(db.engines[None])
+    for bind_key in shards.bind_keys:
+        if bind_key is not None:
+            db.metadata.create_all(db.engines[bind_key])
+
+
+# Kullanıcı taşıma (yeniden bölümleme)
+
+COPY_BATCH_SIZE = 5000
+
+
+def _user_tables():
+    return [table for table in db.metadata.sorted_tables if table.name not in GLOBAL_TABLES]
+
+
+def _surrogate_id(table):
+    primary_key = list(table.primary_key.columns)
+    return primary_key[0] if len(primary_key) == 1 and primary_key[0].name == 'id' and table.name != 'user' else None
+
+
+def _user_filters(connection, user_id):
+    """
+    Tablo adı -> kullanıcının satırlarını seçen koşul. Tablolar sırayla (önce üst tablolar)
+    işlenir: user_id sütunu olmayan tablolar, üst tablolarına (ör. habit_id) göre seçilir.
+    """
+    filters = {}
+    owned_ids = {}
+    for table in _user_tables():
+        if table.name == 'user':
+            condition = table.c.id == user_id
+        elif 'user_id' in table.c:
+            condition = table.c.user_id == user_id
+        else:
+            condition = None
+            for fk in table.foreign_keys:
+                parent_ids = owned_ids.get(fk.column.table.name)
+                if parent_ids is not None:
+                    condition = fk.parent.in_(parent_ids)
+                    break
+            if condition is None:
+                continue
+        filters[table.name] = (table, condition)
+
+        surrogate = _surrogate_id(table)
+        if surrogate is not None:
+            owned_ids[table.name] = connection.execute(select(surrogate).where(condition)).scalars().all()
+    return filters
+
+
+def _delete_user_rows(connection, user_id):
+    from app.leaderboards import adjust_user_counts
+    from app.search import delete_user_documents
+
+    delete_user_documents(user_id, connection)
+    # Puan sayaçları kullanıcıya ait değildir; kullanıcının katkısı düşülür
+    adjust_user_counts(connection, user_id, -1)
+    for table, condition in reversed(list(_user_filters(connection, user_id).values())):
+        connection.execute(delete(table).where(condition))
+
+
+def move_user(user_id, target):
+    """
+    Kullanıcının tüm satırlarını hedef shard'a kopyalar, dizini günceller ve kaynak shard'dan
+    siler. Hedefteki otomatik artan id'ler (habit, habit_log, ...) yeniden verilir; bunlara
+    başvuran sütunlar (ve kuyrukta bekleyen işlerin habit_id parametreleri) yeni id'lere
+    çevrilir. Yarıda kalan bir taşıma tekrar çalıştırılabilir.
+
+    Döndürür:
+        int: Kopyalanan satır sayısı (kullanıcı zaten hedefteyse 0).
+    """
+    from app.models import UserDirectory
+    from app.cache import cache
+    from app.events import events
+    from app.jobs import remap_job_habit_ids
+    from app.leaderboards import adjust_user_counts
+    from app.search import rebuild_user_index
+
+    source = db.session.query(UserDirectory.shard).filter_by(user_id=user_id).scalar()
+    if source is None:
+        raise LookupError(f'Unknown user: {user_id}')
+    if source == target:
+        return 0
+
+    source_engine, target_engine = shards.engine(source), shards.engine(target)
+    copied = 0
+    id_maps = {}
+    if source_engine is not target_engine:
+        with source_engine.connect() as src, target_engine.begin() as dst:
+            # Önceki yarım kalmış bir taşımadan kalan kopyalar temizlenir
+            _delete_user_rows(dst, user_id)
+
+            for table, condition in _user_filters(src, user_id).values():
+                surrogate = _surrogate_id(table)
+                remaps = [(fk.parent.name, id_maps[fk.column.table.name])
+                          for fk in table.foreign_keys if fk.column.table.name in id_maps]
+                referenced = surrogate is not None and any(
+                    fk.column.table is table for other in _user_tables() for fk in other.foreign_keys
+                )
+
+                batch = []
+                for row in src.execute(select(table).where(condition)).mappings():
+                    values = dict(row)
+                    for column, mapping in remaps:
+                        if values[column] is not None:
+                            values[column] = mapping[values[column]]
+                    if surrogate is not None:
+                        old_id = values.pop(surrogate.name)
+                        if referenced:
+                            # Başka tablolarca başvurulan satırlar tek tek eklenip yeni id'leri alınır
+                            new_id = dst.execute(table.insert().values(**values).returning(surrogate)).scalar()
+                            id_maps.setdefault(table.name, {})[old_id] = new_id
+                            copied += 1
+                            continue
+                    batch.append(values)
+                    if len(batch) >= COPY_BATCH_SIZE:
+                        dst.execute(table.insert(), batch)
+                        copied += len(batch)
+                        batch = []
+                if batch:
+                    dst.execute(table.insert(), batch)
+                    copied += len(batch)
+
+            # Arama indeksi ORM tablolarının dışındadır; hedefte yeni habit id'leriyle oluşturulur
+            rebuild_user_index(user_id, dst)
+            # Sıralama puan sayaçları kopyalanan satırlara göre hedefte artırılır
+            adjust_user_counts(dst, user_id, 1)
+
+    # Kuyruktaki işler (ör. purge_habit) eski alışkanlık id'lerini taşır; dizinle aynı
+    # transaction'da yeni id'lere çevrilir
+    remap_job_habit_ids(user_id, id_maps.get('habit', {}))
+    db.session.execute(update(UserDirectory).where(UserDirectory.user_id == user_id).values(shard=target))
+    db.session.commit()
+    forget_user_shard(user_id)
+
+    if source_engine is not target_engine:
+        with source_engine.begin() as src:
+            _delete_user_rows(src, user_id)
+
+    # Alışkanlık id'leri değişti: önbellek geçersizleşir ve açık sekmeler verilerini yeniden yükler.
+    # Sürüm sayacı kullanıcının satırında olabileceğinden oturum yeni shard'a yönlendirilir.
+    use_shard(user_id)
+    cache.bump(user_id)
+    events.publish(user_id, 'resync', {})
+    return copied
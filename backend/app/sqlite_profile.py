@@ -0,0 +1,102 @@
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# 'production' profili dosya tabanlı SQLite için WAL günlüğü, eşzamanlı iş parçacıklarına
+# uygun bir bağlantı havuzu ve isteğe bağlı olarak süreç içi tek yazar kilidi ayarlar.
+# 'default' profili sadece yabancı anahtar denetimini açar (her profilde açıktır).
+
+
+def _is_file_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def configure_engine_options(app):
+    """db.init_app'ten önce çağrılır; profil için SQLALCHEMY_ENGINE_OPTIONS değerlerini doldurur."""
+    if app.config.get('SQLITE_PROFILE') != 'production':
+        return
+    if not _is_file_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    connect_args = dict(options.get('connect_args') or {})
+    # Bağlantılar havuzdan farklı iş parçacıklarına verilebilir
+    connect_args.setdefault('check_same_thread', False)
+    connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+    options['connect_args'] = connect_args
+    options.setdefault('pool_size', app.config['SQLITE_POOL_SIZE'])
+    options.setdefault('max_overflow', app.config['SQLITE_POOL_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', app.config['SQLITE_POOL_TIMEOUT'])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # SQLite yabancı anahtarları (ve ON DELETE CASCADE) bağlantı başına açılmadıkça uygulamaz
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def install(app, db):
+    """db.init_app'ten sonra çağrılır; bağlantı pragmalarını ve yazar kilidini kurar."""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.url.get_backend_name() == 'sqlite':
+                event.listen(engine, 'connect', _enable_foreign_keys)
+
+    if app.config.get('SQLITE_PROFILE') != 'production':
+        return
+    if not _is_file_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+
+    pragmas = [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA cache_size={int(app.config['SQLITE_CACHE_SIZE'])}",
+        'PRAGMA temp_store=MEMORY',
+    ]
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    with app.app_context():
+        # Shard'lar dahil tüm dosya tabanlı SQLite motorlarına uygulanır
+        for engine in db.engines.values():
+            if _is_file_sqlite(engine.url):
+                event.listen(engine, 'connect', set_pragmas)
+
+    if app.config['SQLITE_SERIALIZE_WRITES']:
+        _install_writer_lock(db)
+
+
+def _install_writer_lock(db):
+    # Süreç içindeki tüm yazma transaction'ları tek bir kilit üzerinden sıraya girer. Kilit ilk
+    # yazmada (flush veya DML) alınır ve transaction bitince bırakılır; böylece aynı süreçteki
+    # iş parçacıkları SQLite yazma kilidi için yarışıp "database is locked" hatası almaz.
+    writer_lock = threading.Lock()
+
+    def acquire(session):
+        if not session.info.get('holds_writer_lock'):
+            writer_lock.acquire()
+            session.info['holds_writer_lock'] = True
+
+    @event.listens_for(db.session, 'before_flush')
+    def before_flush(session, flush_context, instances):
+        if session.new or session.dirty or session.deleted:
+            acquire(session)
+
+    @event.listens_for(db.session, 'do_orm_execute')
+    def before_execute(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            acquire(orm_execute_state.session)
+
+    @event.listens_for(db.session, 'after_transaction_end')
+    def after_transaction_end(session, transaction):
+        if transaction.parent is None and session.info.pop('holds_writer_lock', False):
+            writer_lock.release()
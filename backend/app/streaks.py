@@ -0,0 +1,203 @@
+from datetime import timedelta
+from sqlalchemy import and_
+from app import db
+from app.models import Habit, HabitLog, StreakRun
+from app.habit_logic import compute_runs
+from app.timezones import user_today
+
+# Seri durumu, her kapsam (kullanıcı veya alışkanlık) için ardışık gün aralıkları olarak
+# streak_run tablosunda tutulur. Bir günün işaretlenmesi/kaldırılması en fazla iki komşu
+# aralığa dokunur; böylece /stats tüm geçmişi taramak yerine indeksli iki okuma yapar.
+#
+# Kullanıcı düzeyindeki seriler (ve günlük toplamlar, app/rollup.py) sadece listelenen
+# alışkanlıkların kayıtlarını sayar: arşivlenen veya silinen (temizlenmeyi bekleyen)
+# alışkanlıklar bu toplamlardan çıkarılır, geri yüklenince tekrar eklenir.
+
+ONE_DAY = timedelta(days=1)
+
+# Bu sayıdan fazla değişiklik içeren toplu yazımlarda seriler artımlı yerine baştan hesaplanır
+BULK_REBUILD_THRESHOLD = 500
+
+
+def counted_habits():
+    """Kullanıcı düzeyindeki toplamlara katılan alışkanlıkların koşulu (sorgulara filtre olarak eklenir)."""
+    return and_(Habit.archived_at.is_(None), Habit.deleted_at.is_(None))
+
+
+def _runs(user_id, habit_id):
+    # habit_id None ise SQLAlchemy bunu "IS NULL" olarak derler (kullanıcı düzeyi kapsam)
+    return StreakRun.query.filter(StreakRun.user_id == user_id, StreakRun.habit_id == habit_id)
+
+
+def _set_bounds(run, start_date, end_date):
+    run.start_date = start_date
+    run.end_date = end_date
+    run.length = (end_date - start_date).days + 1
+
+
+def add_day(user_id, habit_id, day):
+    """Verilen günü kapsamın serilerine ekler; gerekirse komşu serileri birleştirir."""
+    runs = _runs(user_id, habit_id)
+    if runs.filter(StreakRun.start_date <= day, StreakRun.end_date >= day).first():
+        return
+
+    previous = runs.filter(StreakRun.end_date == day - ONE_DAY).first()
+    following = runs.filter(StreakRun.start_date == day + ONE_DAY).first()
+
+    if previous and following:
+        _set_bounds(previous, previous.start_date, following.end_date)
+        db.session.delete(following)
+    elif previous:
+        _set_bounds(previous, previous.start_date, day)
+    elif following:
+        _set_bounds(following, day, following.end_date)
+    else:
+        run = StreakRun(user_id=user_id, habit_id=habit_id)
+        _set_bounds(run, day, day)
+        db.session.add(run)
+
+
+def remove_day(user_id, habit_id, day):
+    """Verilen günü kapsamın serilerinden çıkarır; gerekirse seriyi ikiye böler."""
+    run = _runs(user_id, habit_id).filter(
+        StreakRun.start_date <= day, StreakRun.end_date >= day
+    ).first()
+    if not run:
+        return
+
+    if run.start_date == run.end_date:
+        db.session.delete(run)
+    elif day == run.start_date:
+        _set_bounds(run, day + ONE_DAY, run.end_date)
+    elif day == run.end_date:
+        _set_bounds(run, run.start_date, day - ONE_DAY)
+    else:
+        tail = StreakRun(user_id=user_id, habit_id=habit_id)
+        _set_bounds(tail, day + ONE_DAY, run.end_date)
+        _set_bounds(run, run.start_date, day - ONE_DAY)
+        db.session.add(tail)
+
+
+def apply_log_change(user_id, habit_id, day, completed, counted=True):
+    """
+    Bir alışkanlık günü işaretlendiğinde veya işareti kaldırıldığında hem alışkanlığın
+    hem de kullanıcının serilerini günceller. Commit çağırana bırakılır. counted=False ise
+    (arşivlenmiş alışkanlık) sadece alışkanlığın serileri değişir.
+    """
+    if completed:
+        add_day(user_id, habit_id, day)
+    else:
+        remove_day(user_id, habit_id, day)
+    if not counted:
+        return
+
+    # Kullanıcı düzeyindeki seri, aynı gün başka bir alışkanlık kaydı yoksa değişir
+    other_log = db.session.query(HabitLog.id).join(Habit).filter(
+        Habit.user_id == user_id,
+        counted_habits(),
+        HabitLog.habit_id != habit_id,
+        HabitLog.completion_date == day
+    ).first()
+    if other_log is None:
+        if completed:
+            add_day(user_id, None, day)
+        else:
+            remove_day(user_id, None, day)
+
+
+def apply_bulk_changes(user_id, changes, counted=None):
+    """
+    Toplu yazılan (habit_id, gün, tamamlandı) değişikliklerini serilere uygular.
+    Kayıtların veritabanına zaten yazılmış olması beklenir; kullanıcı düzeyi günler
+    son duruma göre tek sorguyla belirlenir.
+
+    Argümanlar:
+        counted (set, opsiyonel): Kullanıcı düzeyine katılan alışkanlık id'leri; None ise hepsi.
+    """
+    if len(changes) > BULK_REBUILD_THRESHOLD:
+        # Çok büyük içe aktarmalarda geçmişi bir kez taramak, gün gün güncellemekten ucuzdur
+        rebuild_user_streaks(user_id)
+        return
+
+    for habit_id, day, completed in changes:
+        if completed:
+            add_day(user_id, habit_id, day)
+        else:
+            remove_day(user_id, habit_id, day)
+
+    sync_user_days(user_id, {day for habit_id, day, _ in changes if counted is None or habit_id in counted})
+
+
+def sync_user_days(user_id, days):
+    """Kullanıcı düzeyindeki serileri verilen günlerde listelenen alışkanlıkların kayıtlarına göre ayarlar."""
+    days = set(days)
+    if not days:
+        return
+    if len(days) > BULK_REBUILD_THRESHOLD:
+        rebuild_user_streaks(user_id, habits=False)
+        return
+    present_days = set()
+    ordered = sorted(days)
+    for start in range(0, len(ordered), 500):
+        present_days.update(
+            row.completion_date
+            for row in db.session.query(HabitLog.completion_date).join(Habit).filter(
+                Habit.user_id == user_id,
+                counted_habits(),
+                HabitLog.completion_date.in_(ordered[start:start + 500])
+            ).distinct()
+        )
+    for day in ordered:
+        if day in present_days:
+            add_day(user_id, None, day)
+        else:
+            remove_day(user_id, None, day)
+
+
+def get_streaks(user_id, habit_id=None, today=None):
+    """
+    Kapsamın (mevcut seri, en iyi seri) değerlerini indeksli iki sorguyla döndürür.
+    today verilmezse kullanıcının saat dilimindeki bugün kullanılır.
+    """
+    today = today or user_today(user_id)
+    runs = _runs(user_id, habit_id)
+
+    current_streak = 0
+    latest = runs.order_by(StreakRun.end_date.desc()).first()
+    # Son kayıt bugün veya dün ise, seri potansiyel olarak devam ediyor
+    if latest and (today - latest.end_date).days <= 1:
+        current_streak = latest.length
+
+    best = runs.order_by(StreakRun.length.desc()).first()
+    best_streak = best.length if best else 0
+
+    return current_streak, best_streak
+
+
+def _replace_runs(user_id, habit_id, dates):
+    _runs(user_id, habit_id).delete(synchronize_session=False)
+    for start_date, end_date in compute_runs(dates):
+        run = StreakRun(user_id=user_id, habit_id=habit_id)
+        _set_bounds(run, start_date, end_date)
+        db.session.add(run)
+
+
+def rebuild_user_streaks(user_id, habits=True):
+    """
+    Kullanıcının serilerini kayıtlardan baştan hesaplar (geri doldurma ve tutarlılık için).
+    habits=False ise sadece kullanıcı düzeyindeki seriler yeniden oluşturulur.
+    """
+    rows = db.session.query(
+        HabitLog.habit_id, HabitLog.completion_date, counted_habits().label('counted')
+    ).join(Habit).filter(Habit.user_id == user_id).all()
+
+    _replace_runs(user_id, None, [row.completion_date for row in rows if row.counted])
+
+    if habits:
+        dates_by_habit = {}
+        for row in rows:
+            dates_by_habit.setdefault(row.habit_id, []).append(row.completion_date)
+
+        habit_ids = [habit.id for habit in Habit.query.filter_by(user_id=user_id).all()]
+        for habit_id in habit_ids:
+            _replace_runs(user_id, habit_id, dates_by_habit.get(habit_id, []))
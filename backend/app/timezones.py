@@ -0,0 +1,63 @@
+import threading
+import time
+from datetime import datetime, timedelta, time as dtime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app import db
+from app.cache import LRUCache
+
+# Gün sınırları kayıt yazılırken kullanıcının saat diliminde bir kez çözülür; completion_date
+# zaten yerel tarihtir. Okumalarda satır başına dönüşüm yapılmaz, sadece "bugün" gerekir:
+# bu değer saat dilimi başına bir sonraki yerel gece yarısına kadar önbellekte tutulur.
+
+DEFAULT_TIMEZONE = 'UTC'
+
+_today_cache = {}
+_today_lock = threading.Lock()
+
+# Kullanıcı -> saat dilimi eşlemesi; başka süreçlerdeki değişiklikler en geç TTL sonunda görülür
+_user_timezones = LRUCache(max_entries=10000, default_ttl=60)
+
+
+def is_valid_timezone(name):
+    if not isinstance(name, str) or not name:
+        return False
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def local_today(tz_name):
+    """Verilen IANA saat dilimindeki bugünün tarihini döndürür."""
+    now = time.time()
+    entry = _today_cache.get(tz_name)
+    if entry is not None and now < entry[1]:
+        return entry[0]
+
+    tz = ZoneInfo(tz_name)
+    today = datetime.fromtimestamp(now, tz).date()
+    next_midnight = datetime.combine(today + timedelta(days=1), dtime.min, tzinfo=tz)
+    with _today_lock:
+        _today_cache[tz_name] = (today, next_midnight.timestamp())
+    return today
+
+
+def user_timezone(user_id):
+    from app.models import User
+
+    key = str(user_id)
+    tz_name = _user_timezones.get(key)
+    if tz_name is None:
+        tz_name = db.session.query(User.timezone).filter_by(id=user_id).scalar() or DEFAULT_TIMEZONE
+        _user_timezones.set(key, tz_name)
+    return tz_name
+
+
+def user_today(user_id):
+    """Kullanıcının kendi saat dilimindeki bugünün tarihi."""
+    return local_today(user_timezone(user_id))
+
+
+def forget_user_timezone(user_id):
+    _user_timezones.delete(str(user_id))
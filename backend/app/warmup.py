@@ -0,0 +1,27 @@
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+# Otomatik ölçeklenen ortamlarda yeni bir örneğin ilk isteği; mapper yapılandırması, ilk
+# veritabanı bağlantıları (ve pragmaları) yüzünden yavaştır. prewarm bu işleri create_app
+# sırasında, örnek trafik almadan önce yapar. numpy gibi ağır modüller bilerek ısıtılmaz;
+# sadece onları kullanan uç noktalar ilk çağrıldığında yüklenirler.
+
+
+def prewarm(app):
+    """ORM mapper'larını yapılandırır ve bağlantı havuzunu doldurur."""
+    from app import db
+
+    configure_mappers()
+
+    with app.app_context():
+        # Bağlantılar aynı anda açılıp havuza geri verilir; böylece ilk istekler bağlantı kurmaz
+        connections = []
+        try:
+            for engine in db.engines.values():
+                for _ in range(max(1, app.config['PREWARM_CONNECTIONS'])):
+                    connection = engine.connect()
+                    connection.execute(text('SELECT 1'))
+                    connections.append(connection)
+        finally:
+            for connection in connections:
+                connection.close()
@@ -0,0 +1,72 @@
+"""
+Vektörel analiz motoru benchmark'ı.
+
+100 alışkanlık x 10 yıllık bir kullanıcı için matris yükleme (satır ve bitmap yolları) ve
+compute_analytics sürelerini ölçer. Hedef: hesaplama 100 ms'nin oldukça altında.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.analytics_engine [--habits 100] [--years 10] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db, analytics
+from app.models import Habit
+from benchmarks.datagen import generate
+
+
+def timed(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--habits', type=int, default=100)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+            METRICS_ENABLED = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            end_date = date.today()
+            start_date = end_date - timedelta(days=365 * args.years - 1)
+            db.create_all()
+            generate(users=1, habits_per_user=args.habits, days=365 * args.years, density=0.6, end_date=end_date)
+            habit_ids = [row.id for row in db.session.query(Habit.id).filter_by(user_id=1).order_by(Habit.id)]
+
+            matrix, rows_seconds = timed(
+                lambda: analytics.load_matrix_from_rows(1, habit_ids, start_date, end_date), args.repeat)
+            bitmap_matrix, bitmap_seconds = timed(
+                lambda: analytics.load_matrix_from_bitmaps(1, habit_ids, start_date, end_date), args.repeat)
+            assert (matrix == bitmap_matrix).all()
+
+            _, compute_seconds = timed(
+                lambda: analytics.compute_analytics(matrix, habit_ids, start_date), args.repeat)
+
+            print(f'matrix {matrix.shape[0]} habits x {matrix.shape[1]} days, {int(matrix.sum()):,} completions')
+            print(f'load from habit_log rows      {rows_seconds * 1000:8.1f} ms')
+            print(f'load from habit_year_bitmap   {bitmap_seconds * 1000:8.1f} ms')
+            print(f'compute_analytics             {compute_seconds * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
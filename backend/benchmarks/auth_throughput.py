@@ -0,0 +1,81 @@
+"""
+Giriş (/login) verim benchmark'ı.
+
+Her parola özetleme yöntemi için eşzamanlı iş parçacıklarıyla giriş yapar; saniyedeki başarılı
+giriş sayısını, p50/p95 gecikmeyi ve bilinmeyen kullanıcı girişlerinin süresini raporlar.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.auth_throughput [--methods scrypt:32768:8:1 pbkdf2:sha256:600000]
+                                         [--threads 8] [--workers 4] [--seconds 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from benchmarks.load import percentile
+
+DEFAULT_METHODS = ['scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000', 'pbkdf2:sha256:100000']
+
+
+def run_method(method, threads, workers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(tmp, "auth.db")}',
+            'PASSWORD_HASH_METHOD': method,
+            'PASSWORD_HASH_WORKERS': workers,
+            'METRICS_ENABLED': False,
+        }
+        app = create_app(type('AuthConfig', (Config,), settings))
+        with app.app_context():
+            db.create_all()
+        app.test_client().post('/register', json={'username': 'bench', 'email': 'bench@example.com', 'password': 'pw'})
+
+        samples = {'known': [], 'unknown': []}
+        lock = threading.Lock()
+        stop_at = time.monotonic() + seconds
+
+        def worker(index):
+            client = app.test_client()
+            kind = 'unknown' if index % 4 == 3 else 'known'
+            username = 'nobody' if kind == 'unknown' else 'bench'
+            local = []
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                client.post('/login', json={'username': username, 'password': 'pw'})
+                local.append(time.perf_counter() - started)
+            with lock:
+                samples[kind].extend(local)
+
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+
+        known, unknown = samples['known'], samples['unknown']
+        print(f'{method:<24} logins/s {(len(known) + len(unknown)) / seconds:7.1f}'
+              f'  p50 {percentile(known, 0.5) * 1000:7.1f} ms  p95 {percentile(known, 0.95) * 1000:7.1f} ms'
+              + (f'  unknown-user p50 {percentile(unknown, 0.5) * 1000:7.1f} ms' if unknown else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4, help='PASSWORD_HASH_WORKERS')
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    for method in args.methods:
+        run_method(method, args.threads, args.workers, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
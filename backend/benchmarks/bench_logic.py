@@ -0,0 +1,73 @@
+"""
+format_heatmap_data ve seri hesaplamaları için mikrobenchmark'lar.
+
+Kullanım (backend klasöründen):
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks --benchmark-json=benchmarks/results/logic-$(git rev-parse --short HEAD).json
+"""
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app import db
+from app.analytics import compute_analytics
+from app.habit_logic import format_heatmap_data, compute_runs
+from app.streaks import add_day, remove_day, get_streaks
+from benchmarks.datagen import generate
+
+TODAY = date(2026, 1, 1)
+
+
+def _dates(days, density=0.7, seed=7):
+    rng = random.Random(seed)
+    return [TODAY - timedelta(days=offset) for offset in range(days) if rng.random() < density]
+
+
+@pytest.mark.parametrize('days', [365, 3650])
+def bench_format_heatmap_data(benchmark, days):
+    logs = [SimpleNamespace(completed=True, completion_date=day) for day in _dates(days)]
+    result = benchmark(format_heatmap_data, logs)
+    assert len(result) == len(logs)
+
+
+@pytest.mark.parametrize('days', [365, 3650])
+def bench_compute_runs(benchmark, days):
+    dates = _dates(days)
+    runs = benchmark(compute_runs, dates)
+    assert sum((end - start).days + 1 for start, end in runs) == len(dates)
+
+
+def bench_streak_toggle(benchmark, app):
+    """Uzun bir geçmişin ortasındaki bir günü işaretleyip kaldırmanın maliyeti."""
+    data = generate(users=1, habits_per_user=5, days=3650, density=0.9, end_date=TODAY)
+    user_id = next(iter(data['habit_ids']))
+    habit_id = data['habit_ids'][user_id][0]
+    day = TODAY - timedelta(days=1800)
+
+    def toggle():
+        remove_day(user_id, habit_id, day)
+        add_day(user_id, habit_id, day)
+        db.session.flush()
+
+    benchmark(toggle)
+    db.session.rollback()
+
+
+def bench_streak_read(benchmark, app):
+    data = generate(users=1, habits_per_user=5, days=3650, density=0.9, end_date=TODAY)
+    user_id = next(iter(data['habit_ids']))
+
+    current_streak, best_streak = benchmark(get_streaks, user_id, None, TODAY)
+    assert best_streak >= current_streak
+
+
+@pytest.mark.parametrize('days', [5, 29, 3650])
+def bench_compute_analytics(benchmark, days):
+    """Kısa seriler (yeni kullanıcılar, dar from/to aralıkları) kayan pencereden kısa kalır."""
+    rng = np.random.default_rng(7)
+    matrix = rng.random((10, days)) < 0.7
+    result = benchmark(compute_analytics, matrix, list(range(10)), TODAY - timedelta(days=days - 1))
+    overall = matrix.any(axis=0)
+    assert result['overall']['rolling_30d'] == round(float(overall[-30:].mean()), 4)
+    assert len(result['overall']['rolling_30d_series']) == min(days, 90)
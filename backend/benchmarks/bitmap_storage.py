@@ -0,0 +1,86 @@
+"""
+Satır tabanlı ve bitmap tabanlı tamamlanma geçmişinin karşılaştırması.
+
+10 yıllık, 50 alışkanlıklı bir kullanıcı için okunan satır sayısını, taşınan veri boyutunu ve
+ısı haritası + seri hesaplama süresini iki depolama modunda ölçer.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.bitmap_storage [--habits 50] [--years 10] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db, bitmaps
+from app.models import Habit, HabitLog, HabitYearBitmap
+from app.habit_logic import compute_runs
+from benchmarks.datagen import generate
+
+
+def rows_path(user_id):
+    rows = db.session.query(HabitLog.habit_id, HabitLog.completion_date).join(Habit).filter(
+        Habit.user_id == user_id
+    ).all()
+    dates_by_habit = {}
+    for habit_id, completion_date in rows:
+        dates_by_habit.setdefault(habit_id, []).append(completion_date)
+    for dates in dates_by_habit.values():
+        compute_runs(dates)
+    return len(rows)
+
+
+def bitmap_path(user_id):
+    loaded = bitmaps.load(user_id)
+    for year_bits in loaded.values():
+        bitmaps.streaks(year_bits)
+        bitmaps.count(year_bits)
+    bitmaps.count(bitmaps.union(loaded.values()))
+    return sum(len(year_bits) for year_bits in loaded.values())
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--habits', type=int, default=50)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+            METRICS_ENABLED = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            generate(users=1, habits_per_user=args.habits, days=365 * args.years, density=0.7)
+
+            log_bytes = HabitLog.query.count() * (8 + 8 + 1 + 10)
+            bitmap_bytes = HabitYearBitmap.query.count() * (bitmaps.YEAR_BYTES + 8 + 8 + 8)
+
+            row_count, row_seconds = timed(lambda: rows_path(1), args.repeat)
+            bitmap_count, bitmap_seconds = timed(lambda: bitmap_path(1), args.repeat)
+
+            print(f'rows   : {row_count:>8,} rows read  ~{log_bytes / 1e6:7.2f} MB payload  {row_seconds * 1000:8.1f} ms')
+            print(f'bitmap : {bitmap_count:>8,} rows read  ~{bitmap_bytes / 1e6:7.2f} MB payload  {bitmap_seconds * 1000:8.1f} ms')
+            print(f'reduction: x{row_count / bitmap_count:.0f} rows, x{row_seconds / bitmap_seconds:.0f} time')
+
+
+if __name__ == '__main__':
+    main()
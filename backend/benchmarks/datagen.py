@@ -0,0 +1,134 @@
+"""
+Tekrarlanabilir sentetik veri üreticisi.
+
+Modeller üzerinden N kullanıcı, kullanıcı başına M alışkanlık ve verilen gün sayısı kadar
+HabitLog geçmişi oluşturur. Aynı seed her zaman aynı veriyi üretir; böylece farklı
+commit'lerde alınan ölçümler karşılaştırılabilir.
+
+Kullanım (backend klasöründen, yapılandırılmış veritabanına yazar):
+    python -m benchmarks.datagen --users 50 --habits 20 --days 1095
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import Habit, HabitLog
+from app.search import rebuild_user_index
+from app.sharding import create_schema, create_user, use_shard
+
+PASSWORD = 'password'
+BATCH_SIZE = 50000
+
+
+def generate(users=10, habits_per_user=10, days=365, density=0.6, seed=42, max_rows=None,
+             username_prefix='user', derived=True, end_date=None):
+    """
+    Sentetik veriyi etkin uygulama bağlamındaki veritabanına yazar.
+
+    Argümanlar:
+        density (float): Bir günün tamamlanmış olma olasılığı.
+        max_rows (int, opsiyonel): Üretilecek toplam HabitLog satırı için üst sınır.
+        derived (bool): True ise seri ve günlük toplam tabloları da yeniden oluşturulur.
+
+    Döndürür:
+        dict: Üretilen kullanıcı adları, alışkanlık id'leri ve satır sayısı.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    # Parola özeti bir kez hesaplanır; her kullanıcı için yeniden hashlemek üretimi yavaşlatır
+    password_hash = generate_password_hash(PASSWORD)
+
+    usernames = []
+    habit_ids_by_user = {}
+    for user_index in range(users):
+        username = f'{username_prefix}{user_index}'
+        # Kullanıcı genel dizine ve yerleştirildiği shard'a eklenir
+        user = create_user(username, f'{username}@example.com', password_hash=password_hash)
+        db.session.flush()
+        usernames.append(username)
+
+        habits = [Habit(name=f'Habit {i}', description=f'Synthetic habit {i}', user_id=user.id)
+                  for i in range(habits_per_user)]
+        db.session.add_all(habits)
+        db.session.flush()
+        rebuild_user_index(user.id)
+        habit_ids_by_user[user.id] = [habit.id for habit in habits]
+        db.session.commit()
+
+    rows = 0
+    batch = []
+    done = False
+    for user_id, habit_ids in habit_ids_by_user.items():
+        use_shard(user_id)
+        for habit_id in habit_ids:
+            for offset in range(days):
+                if rng.random() >= density:
+                    continue
+                batch.append({
+                    'habit_id': habit_id,
+                    'completed': True,
+                    'completion_date': end_date - timedelta(days=offset)
+                })
+                rows += 1
+                if max_rows is not None and rows >= max_rows:
+                    done = True
+                    break
+            if len(batch) >= BATCH_SIZE or done:
+                db.session.execute(insert(HabitLog), batch)
+                batch = []
+            if done:
+                break
+        # Satırlar kullanıcının shard'ına yazıldığı için her kullanıcının sonunda gönderilir
+        if batch:
+            db.session.execute(insert(HabitLog), batch)
+            batch = []
+        db.session.commit()
+        if done:
+            break
+
+    if derived:
+        from app.streaks import rebuild_user_streaks
+        from app.rollup import rebuild_user_rollup
+        from app.bitmaps import rebuild_user_bitmaps
+        from app.schedules import rebuild_user_periods
+        from app.leaderboards import update_user
+        for user_id in habit_ids_by_user:
+            use_shard(user_id)
+            rebuild_user_streaks(user_id)
+            rebuild_user_rollup(user_id)
+            rebuild_user_bitmaps(user_id)
+            rebuild_user_periods(user_id)
+            update_user(user_id)
+            db.session.commit()
+
+    return {'usernames': usernames, 'habit_ids': habit_ids_by_user, 'rows': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--habits', type=int, default=10)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--density', type=float, default=0.6)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--prefix', default='user')
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        create_schema()
+        result = generate(args.users, args.habits, args.days, args.density, args.seed, username_prefix=args.prefix)
+    print(f'Generated {len(result["usernames"])} users and {result["rows"]:,} habit logs '
+          f'(password: {PASSWORD}).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Akışlı dışa aktarmanın bellek benchmark'ı.
+
+Tek bir kullanıcı için farklı boyutlarda geçmiş üretir, /export yanıtını sonuna kadar tüketir
+ve tracemalloc ile ölçülen en yüksek Python bellek kullanımını raporlar. Akış doğru
+çalışıyorsa tepe bellek satır sayısıyla büyümez.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.export_memory [--sizes 100000 1000000] [--format csv] [--gzip]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from benchmarks.datagen import generate, PASSWORD
+
+
+def measure(rows, fmt, compress):
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            generate(users=1, habits_per_user=1000, days=-(-rows // 1000), density=1.0,
+                     max_rows=rows, derived=False)
+
+        client = app.test_client()
+        client.post('/login', json={'username': 'user0', 'password': PASSWORD})
+
+        query = f'/export?format={fmt}' + ('&gzip=1' if compress else '')
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = client.get(query, buffered=False)
+        size = 0
+        for chunk in response.response:
+            size += len(chunk)
+        response.close()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return size, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    parser.add_argument('--gzip', action='store_true')
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        size, elapsed, peak = measure(rows, args.format, args.gzip)
+        print(f'{rows:>10,} rows  {size / 1e6:8.1f} MB out  {elapsed:6.1f}s  peak traced memory {peak / 1e6:6.2f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Alışkanlık silme benchmark'ı.
+
+Farklı kayıt sayılarına (varsayılan 1.000, 10.000 ve 100.000) sahip bir alışkanlık için eski
+yolu (kayıtları ORM üzerinden tek tek yükleyip silmek; eski cascade="all, delete-orphan"
+davranışı) yeni yolla karşılaştırır: DELETE /habits/<id> isteğinin süresi (sadece işaretleme
+ve iş ekleme) ile arka plandaki parça parça temizliğin toplam süresi ve en uzun tek
+transaction'ı (yazma kilidinin en uzun tutulduğu süre).
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.habit_delete [--logs 1000 10000 100000] [--batch-size 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from config import Config
+from app import create_app, db
+from app.jobs import job_queue
+from app.models import Habit, HabitLog
+from app.search import unindex_habit
+from app.sharding import create_schema, use_shard
+from benchmarks.datagen import generate, PASSWORD
+
+
+def legacy_delete(habit_id):
+    habit = db.session.get(Habit, habit_id)
+    unindex_habit(habit_id)
+    for log in habit.logs:
+        db.session.delete(log)
+    db.session.delete(habit)
+    db.session.commit()
+
+
+def seed(log_count, prefix):
+    data = generate(users=1, habits_per_user=1, days=log_count, density=1.0, seed=23, username_prefix=prefix)
+    user_id, habit_ids = next(iter(data['habit_ids'].items()))
+    return data['usernames'][0], user_id, habit_ids[0]
+
+
+def timed_commits(fn):
+    """fn'i çalıştırır; toplam süreyi ve iki commit arasındaki en uzun süreyi döndürür."""
+    marks = [time.perf_counter()]
+    listener = lambda session: marks.append(time.perf_counter())
+    event.listen(db.session, 'after_commit', listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.session, 'after_commit', listener)
+    return marks[-1] - marks[0], max(b - a for a, b in zip(marks, marks[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logs', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+            SHARD_DATABASE_URLS = []
+            CACHE_BACKEND = 'none'
+            METRICS_ENABLED = False
+            EVENTS_BACKEND = 'none'
+            JOB_WORKERS = 0
+            PURGE_BATCH_SIZE = args.batch_size
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            create_schema()
+
+        for log_count in args.logs:
+            with app.app_context():
+                _, user_id, habit_id = seed(log_count, f'legacy{log_count}_')
+                use_shard(user_id)
+                started = time.perf_counter()
+                legacy_delete(habit_id)
+                legacy = time.perf_counter() - started
+
+                username, user_id, habit_id = seed(log_count, f'soft{log_count}_')
+
+            client = app.test_client()
+            client.post('/login', json={'username': username, 'password': PASSWORD})
+            started = time.perf_counter()
+            assert client.delete(f'/habits/{habit_id}').status_code == 200
+            request = time.perf_counter() - started
+
+            with app.app_context():
+                purge_total, longest = timed_commits(job_queue.run_pending)
+                use_shard(user_id)
+                assert HabitLog.query.filter_by(habit_id=habit_id).count() == 0
+
+            print(f'{log_count:>7,} logs: legacy ORM cascade {legacy * 1000:9.1f} ms | '
+                  f'DELETE request {request * 1000:6.1f} ms, background purge {purge_total * 1000:8.1f} ms '
+                  f'(longest transaction {longest * 1000:6.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Isı haritası sorgusu mikrobenchmark'ı.
+
+1M satırlık bir habit_log tablosu üzerinde eski yolu (tüm HabitLog nesnelerini yükleyip
+format_heatmap_data ile Python'da saymak) yeni yolla (GROUP BY + indeksli tarih aralığı)
+karşılaştırır.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.heatmap_query [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.models import Habit, HabitLog
+from app.habit_logic import format_heatmap_data
+from app.heatmaps import query_heatmaps
+from benchmarks.datagen import generate
+
+
+def legacy_heatmaps(user_id):
+    logs = HabitLog.query.join(Habit).filter(Habit.user_id == user_id).all()
+    logs_by_habit = {}
+    for log in logs:
+        logs_by_habit.setdefault(log.habit_id, []).append(log)
+    return {habit_id: format_heatmap_data(habit_logs) for habit_id, habit_logs in logs_by_habit.items()}
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            # Hedef kullanıcı (id=1) yaklaşık 7 yıllık günlük geçmişe sahiptir
+            generate(users=20, habits_per_user=40, days=2555, density=0.5, max_rows=args.rows, derived=False)
+            print(f'seeded {HabitLog.query.count():,} habit_log rows in {time.perf_counter() - started:.1f}s')
+
+            year_ago = date.today() - timedelta(days=365)
+            results = {
+                'legacy ORM + format_heatmap_data (full history)': timed(lambda: legacy_heatmaps(1), args.repeat),
+                'GROUP BY (full history)': timed(lambda: query_heatmaps(1), args.repeat),
+                'GROUP BY (last 365 days)': timed(lambda: query_heatmaps(1, start_date=year_ago), args.repeat),
+            }
+
+            baseline = next(iter(results.values()))
+            for name, seconds in results.items():
+                print(f'{name:<50} {seconds * 1000:9.1f} ms  x{baseline / seconds:6.1f}')
+
+
+if __name__ == '__main__':
+    main()
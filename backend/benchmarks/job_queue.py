@@ -0,0 +1,129 @@
+"""
+Arka plan iş kuyruğu benchmark'ı.
+
+Her işçi sayısı için tüm kullanıcılara ağır bir iş (seri/günlük toplam/bitmap yeniden oluşturma
+veya dışa aktarma) kuyruğa ekler; işler çalışırken ön planda GET /stats gecikmesini ölçer.
+Saniyede tamamlanan iş sayısını ve boşta/yük altında p50/p95 istek gecikmesini raporlar.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.job_queue [--workers 1 2 4] [--users 16] [--habits 10] [--days 730]
+                                   [--kind rebuild|export|report] [--processes]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.jobs import job_queue
+from app.models import Job
+from benchmarks.datagen import generate, PASSWORD
+from benchmarks.load import percentile
+
+JOB_PARAMS = {'rebuild': {}, 'export': {'format': 'csv'}, 'report': {}}
+
+
+def measure_latency(client, stop):
+    samples = []
+    while not stop():
+        started = time.perf_counter()
+        client.get('/stats')
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _process_worker(config_class):
+    # 'flask run-jobs' ile aynı: ayrı süreçte kendi uygulamasıyla tek işçi çalıştırır
+    app = create_app(config_class)
+    with app.app_context():
+        while Job.query.filter(Job.status.in_(('queued', 'running'))).count():
+            if not job_queue.run_once():
+                time.sleep(0.02)
+
+
+def run(workers, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(tmp, "jobs.db")}',
+            'SQLITE_PROFILE': 'production',
+            'SQLITE_SERIALIZE_WRITES': True,
+            'CACHE_BACKEND': 'none',
+            'METRICS_ENABLED': False,
+            'JOB_WORKERS': 0, # İşçiler kuyruk dolduktan sonra elle başlatılır
+            'JOB_POLL_INTERVAL': 0.05,
+            'JOB_RESULTS_DIR': os.path.join(tmp, 'results'),
+        }
+        config_class = type('JobBenchConfig', (Config,), settings)
+        app = create_app(config_class)
+        with app.app_context():
+            db.create_all()
+            data = generate(users=args.users, habits_per_user=args.habits, days=args.days, seed=7)
+
+        client = app.test_client()
+        client.post('/login', json={'username': data['usernames'][0], 'password': PASSWORD})
+
+        # Boşta gecikme
+        idle_until = time.monotonic() + args.idle_seconds
+        idle = measure_latency(client, lambda: time.monotonic() >= idle_until)
+
+        with app.app_context():
+            user_ids = list(data['habit_ids'])
+            for user_id in user_ids:
+                job_queue.enqueue(user_id, args.kind, JOB_PARAMS[args.kind])
+
+            def pending():
+                with app.app_context():
+                    return Job.query.filter(Job.status.in_(('queued', 'running'))).count()
+
+            started = time.perf_counter()
+            processes = []
+            if args.processes:
+                processes = [multiprocessing.Process(target=_process_worker, args=(config_class,)) for _ in range(workers)]
+                for process in processes:
+                    process.start()
+            else:
+                job_queue.start(workers)
+
+            done = threading.Event()
+            loaded = []
+            probe = threading.Thread(target=lambda: loaded.extend(measure_latency(client, done.is_set)))
+            probe.start()
+            while pending():
+                time.sleep(0.02)
+            elapsed = time.perf_counter() - started
+            done.set()
+            probe.join()
+            job_queue.stop()
+            for process in processes:
+                process.join()
+
+            failed = Job.query.filter_by(status='failed').count()
+
+        print(f'{"processes" if args.processes else "threads"} {workers}: {len(user_ids) / elapsed:6.1f} jobs/s ({elapsed:5.2f} s, {failed} failed)'
+              f'  /stats idle p50 {percentile(idle, 0.5) * 1000:5.1f} ms p95 {percentile(idle, 0.95) * 1000:5.1f} ms'
+              f'  busy p50 {percentile(loaded, 0.5) * 1000:5.1f} ms p95 {percentile(loaded, 0.95) * 1000:5.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--habits', type=int, default=10)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--kind', choices=sorted(JOB_PARAMS), default='rebuild')
+    parser.add_argument('--idle-seconds', type=float, default=2)
+    parser.add_argument('--processes', action='store_true', help='İşçileri iş parçacığı yerine ayrı süreçlerde çalıştır')
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == '__main__':
+    main()
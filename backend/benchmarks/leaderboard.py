@@ -0,0 +1,139 @@
+"""
+Sıralama (leaderboard) benchmark'ı.
+
+İki bölümden oluşur:
+1. Gerçek veri: datagen ile üretilen kullanıcılar için eski yol (her kullanıcının tüm
+   kayıtlarını tarayıp serisini hesaplamak ve sıralamak, O(sistemdeki tüm kayıtlar)) ile
+   leaderboard_entry üzerinden ilk K + kullanıcının sırası karşılaştırılır. Kayıt yazımına
+   eklenen update_user maliyeti de ölçülür.
+2. Ölçek: farklı sayılarda (varsayılan 10.000, 100.000 ve 1.000.000) kullanıcı için puan
+   satırları doğrudan eklenir ve ilk K / sıra sorgusunun gecikmesinin kullanıcı sayısıyla
+   büyümediği gösterilir.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.leaderboard [--users 200] [--days 365] [--scale 10000 100000 1000000]
+                                     [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from config import Config
+from app import create_app, db
+from app.habit_logic import compute_runs
+from app.leaderboards import METRICS, global_board, rebuild_score_counts, update_user
+from app.models import Habit, HabitLog, LeaderboardEntry, User
+from app.sharding import create_schema
+from app.timezones import user_today
+from benchmarks.datagen import generate
+from benchmarks.load import percentile
+
+BATCH_SIZE = 50000
+# Ölçek bölümündeki sentetik kullanıcıların id'leri gerçek kullanıcılarla çakışmaz
+SYNTHETIC_ID_OFFSET = 10_000_000
+
+
+def legacy_board(limit):
+    """Her kullanıcının serisini kayıtlarından hesaplayıp sıralar (eski yol)."""
+    scores = []
+    for user_id, in db.session.query(User.id).all():
+        dates = [row.completion_date for row in db.session.query(HabitLog.completion_date).join(Habit).filter(
+            Habit.user_id == user_id
+        ).distinct()]
+        runs = compute_runs(dates)
+        today = user_today(user_id)
+        current = 0
+        if runs and (today - runs[-1][1]).days <= 1:
+            current = (runs[-1][1] - runs[-1][0]).days + 1
+        scores.append((-current, user_id))
+    return sorted(scores)[:limit]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def seed_entries(count, rng):
+    """count sentetik kullanıcı için user ve leaderboard_entry satırlarını doğrudan ekler."""
+    LeaderboardEntry.query.filter(LeaderboardEntry.user_id > SYNTHETIC_ID_OFFSET).delete(synchronize_session=False)
+    User.query.filter(User.id > SYNTHETIC_ID_OFFSET).delete(synchronize_session=False)
+    for start in range(0, count, BATCH_SIZE):
+        ids = range(SYNTHETIC_ID_OFFSET + start + 1, SYNTHETIC_ID_OFFSET + min(start + BATCH_SIZE, count) + 1)
+        db.session.execute(insert(User), [
+            {'id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@example.com', 'password_hash': '-'}
+            for user_id in ids
+        ])
+        rows = []
+        for user_id in ids:
+            # Çoğu kullanıcının serisi kısadır; uzun seriler azdır (geometrik dağılım)
+            best = int(rng.expovariate(1 / 20))
+            rows += [
+                {'user_id': user_id, 'metric': 'current_streak', 'score': rng.randint(0, best)},
+                {'user_id': user_id, 'metric': 'best_streak', 'score': best},
+                {'user_id': user_id, 'metric': 'completions_30d', 'score': rng.randint(0, 150)},
+            ]
+        db.session.execute(insert(LeaderboardEntry), rows)
+    rebuild_score_counts()
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200, help='Gerçek veri bölümündeki kullanıcı sayısı')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--scale', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(24)
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+            SHARD_DATABASE_URLS = []
+            CACHE_BACKEND = 'none'
+            METRICS_ENABLED = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            create_schema()
+            data = generate(users=args.users, habits_per_user=5, days=args.days, seed=24)
+            user_ids = list(data['habit_ids'])
+            print(f'{args.users} users, {data["rows"]:,} logs')
+
+            legacy = timed(lambda: legacy_board(10), max(1, args.repeat // 10))
+            indexed = timed(lambda: global_board(rng.choice(user_ids), 'current_streak', 10), args.repeat)
+            print(f'  top 10 + rank   legacy scan {min(legacy) * 1000:9.2f} ms   '
+                  f'leaderboard {percentile(indexed, 0.5) * 1000:7.2f} ms (p50)')
+
+            updates = []
+            for _ in range(args.repeat):
+                user_id = rng.choice(user_ids)
+                started = time.perf_counter()
+                update_user(user_id)
+                db.session.flush()
+                updates.append(time.perf_counter() - started)
+            db.session.rollback()
+            print(f'  update_user per write {percentile(updates, 0.5) * 1000:6.2f} ms (p50)')
+
+            for count in args.scale:
+                seed_entries(count, rng)
+                for metric in METRICS:
+                    samples = timed(lambda: global_board(SYNTHETIC_ID_OFFSET + rng.randint(1, count), metric, 10), args.repeat)
+                    print(f'{count:>10,} users  {metric:<16} top 10 + rank '
+                          f'p50 {percentile(samples, 0.5) * 1000:6.2f} ms  p95 {percentile(samples, 0.95) * 1000:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
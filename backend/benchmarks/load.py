@@ -0,0 +1,163 @@
+"""
+Süreç içi yük sürücüsü.
+
+Sentetik veriyle doldurulmuş geçici bir veritabanına karşı Flask test istemcisiyle istek
+gönderir ve uç nokta başına p50/p95/p99 gecikme ile saniyedeki istek sayısını raporlar.
+Sonuçlar, commit'ler arasında karşılaştırılabilmesi için JSON olarak kaydedilir.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.load [--users 20] [--habits 20] [--days 730] [--requests 200]
+                              [--concurrency 4] [--cache] [--output benchmarks/results/load.json]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from benchmarks.datagen import generate, PASSWORD
+
+
+def _endpoints(habit_ids, rng):
+    """(ad, yöntem, yol üreticisi, gövde üreticisi) dörtlüleri."""
+    year_ago = (date.today() - timedelta(days=365)).isoformat()
+    return [
+        ('GET /habits', 'GET', lambda: '/habits', None),
+        ('GET /habits (page, no heatmap)', 'GET', lambda: '/habits?limit=20&include=', None),
+        ('GET /heatmaps (last year)', 'GET', lambda: f'/heatmaps?from={year_ago}', None),
+        ('GET /habits/<id>/heatmap', 'GET', lambda: f'/habits/{rng.choice(habit_ids)}/heatmap', None),
+        ('GET /stats', 'GET', lambda: '/stats', None),
+        ('GET /reports', 'GET', lambda: '/reports', None),
+        ('POST /habits/<id>/logs', 'POST', lambda: f'/habits/{rng.choice(habit_ids)}/logs',
+         lambda: {'date': (date.today() - timedelta(days=rng.randint(0, 730))).isoformat()}),
+    ]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(tmp, "load.db")}',
+            'CACHE_BACKEND': 'memory' if args.cache else 'none',
+            'METRICS_ENABLED': False,
+            'SQLITE_PROFILE': args.profile,
+        }
+        app = create_app(type('LoadConfig', (Config,), settings))
+        with app.app_context():
+            db.create_all()
+            data = generate(args.users, args.habits, args.days, seed=args.seed)
+
+        results = {}
+        lock = threading.Lock()
+        usernames = data['usernames']
+        habit_ids = list(data['habit_ids'].values())
+
+        def worker(worker_index, endpoint_index, count):
+            rng = random.Random(args.seed + worker_index)
+            user_index = worker_index % len(usernames)
+            client = app.test_client()
+            client.post('/login', json={'username': usernames[user_index], 'password': PASSWORD})
+            name, method, path, body = _endpoints(habit_ids[user_index], rng)[endpoint_index]
+
+            samples = []
+            errors = 0
+            for _ in range(count):
+                started = time.perf_counter()
+                if method == 'GET':
+                    response = client.get(path())
+                else:
+                    response = client.post(path(), json=body())
+                samples.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+            with lock:
+                entry = results.setdefault(name, {'samples': [], 'errors': 0})
+                entry['samples'].extend(samples)
+                entry['errors'] += errors
+
+        endpoint_names = [endpoint[0] for endpoint in _endpoints([0], random.Random())]
+        per_worker = max(1, args.requests // args.concurrency)
+        summary = {}
+        for endpoint_index, name in enumerate(endpoint_names):
+            threads = [threading.Thread(target=worker, args=(i, endpoint_index, per_worker))
+                       for i in range(args.concurrency)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - started
+
+            samples = results[name]['samples']
+            summary[name] = {
+                'requests': len(samples),
+                'errors': results[name]['errors'],
+                'rps': round(len(samples) / wall, 1),
+                'p50_ms': round(percentile(samples, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(samples, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(samples, 0.99) * 1000, 2),
+            }
+
+        return {
+            'revision': git_revision(),
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'parameters': {k: v for k, v in vars(args).items() if k != 'output'},
+            'log_rows': data['rows'],
+            'endpoints': summary,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--habits', type=int, default=20)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--requests', type=int, default=200, help='Uç nokta başına toplam istek sayısı')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', choices=['default', 'production'], default='default')
+    parser.add_argument('--cache', action='store_true', help='Yanıt önbelleğini açık bırak')
+    parser.add_argument('--output', default=None, help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    report = run(args)
+
+    print(f'{"endpoint":<34} {"rps":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7}')
+    for name, stats in report['endpoints'].items():
+        print(f'{name:<34} {stats["rps"]:>8} {stats["p50_ms"]:>8} {stats["p95_ms"]:>8} '
+              f'{stats["p99_ms"]:>8} {stats["errors"]:>7}')
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results', f'load-{report["revision"] or "local"}.json'
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
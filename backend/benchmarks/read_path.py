@@ -0,0 +1,142 @@
+"""
+Okuma yolu (GET /habits) serileştirme benchmark'ı.
+
+Hedef kullanıcıya farklı sayılarda (varsayılan 50, 200 ve 1.000) alışkanlık ekler ve eski
+yolu (Habit nesnelerini yükleyip to_dict() ile standart json sağlayıcısından geçirmek) yeni
+yolla (sadece yanıt sütunlarını seçen sorgu + orjson sağlayıcısı) karşılaştırır:
+
+- nesne/sn: sorgu + sözlük oluşturma + JSON serileştirme, istek dışında,
+- istek gecikmesi: test istemcisiyle /habits?include=none (eski yol benchmark uygulamasına
+  ayrı bir rota olarak eklenir; yanıt önbelleği kapalıdır).
+
+Her boyutta iki yolun yanıt gövdelerinin bayt bayt aynı olduğu da doğrulanır. Alışkanlık
+adlarının bir kısmı ASCII dışı karakter içerir (kaçırma yolu da ölçülür).
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.read_path [--sizes 50 200 1000] [--repeat 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+from config import Config
+from app import create_app, db
+from app.auth import get_current_user_id
+from app.models import Habit
+from app.read_models import habit_dicts, habit_rows
+from app.sharding import create_schema, create_user
+from benchmarks.datagen import PASSWORD
+from benchmarks.load import percentile
+
+NAMES = ('Kitap oku', 'Su iç', 'Yürüyüş', 'Meditasyon', 'Morning run', 'Journal', 'Spanish', 'Günlük yaz')
+
+
+def legacy_habits():
+    """Değişiklikten önceki /habits?include=none yolu: model nesneleri ve to_dict()."""
+    user_id = get_current_user_id()
+    habits = Habit.listed(user_id).order_by(Habit.id, Habit.id).all()
+    return jsonify([habit.to_dict() for habit in habits]), 200
+
+
+def seed(user_id, count, rng):
+    db.session.execute(insert(Habit), [{
+        'user_id': user_id,
+        'name': f'{rng.choice(NAMES)} {index}',
+        'description': rng.choice((None, 'Her gün 20 dakika', 'Before breakfast')),
+        'schedule_type': rng.choice(('daily', 'weekly', 'weekdays')),
+        'schedule_days': 0b10101,
+        'times_per_week': 3,
+    } for index in range(count)])
+    db.session.commit()
+
+
+def per_second(fn, repeat, count):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return count * repeat / (time.perf_counter() - started)
+
+
+def latencies(client, url, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(url)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(25)
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+            SHARD_DATABASE_URLS = []
+            CACHE_BACKEND = 'none'
+            METRICS_ENABLED = False
+            JSON_ENCODER = 'orjson'
+
+        app = create_app(BenchConfig)
+        app.add_url_rule('/bench/legacy-habits', view_func=legacy_habits)
+        fast = app.json
+        stdlib = DefaultJSONProvider(app)
+        if fast.__class__ is DefaultJSONProvider:
+            print('orjson is not installed; both paths use the standard json provider')
+
+        with app.app_context():
+            create_schema()
+
+        for size in args.sizes:
+            with app.app_context():
+                user = create_user(f'reader{size}', f'reader{size}@example.com')
+                user.set_password(PASSWORD)
+                db.session.commit()
+                user_id = user.id
+                seed(user_id, size, rng)
+
+            client = app.test_client()
+            client.post('/login', json={'username': f'reader{size}', 'password': PASSWORD})
+
+            app.json = stdlib
+            legacy_body = client.get('/bench/legacy-habits').data
+            legacy_latency = latencies(client, '/bench/legacy-habits', args.repeat)
+            app.json = fast
+            lean_body = client.get('/habits?include=none').data
+            lean_latency = latencies(client, '/habits?include=none', args.repeat)
+            assert lean_body == legacy_body, 'response bodies differ'
+
+            with app.test_request_context():
+                db.session.info['shard'] = 0
+
+                def legacy():
+                    objects = [habit.to_dict() for habit in Habit.listed(user_id).order_by(Habit.id).all()]
+                    stdlib.response(objects)
+                    db.session.expunge_all()
+
+                def lean():
+                    fast.response(habit_dicts(habit_rows(Habit.listed(user_id).order_by(Habit.id))))
+
+                repeat = max(1, args.repeat * 50 // size)
+                legacy_rate = per_second(legacy, repeat, size)
+                lean_rate = per_second(lean, repeat, size)
+
+            print(f'{size:>5} habits  objects/s  legacy {legacy_rate:10,.0f}  lean {lean_rate:10,.0f}  x{lean_rate / legacy_rate:4.1f}'
+                  f'   request p50  legacy {percentile(legacy_latency, 0.5) * 1000:6.2f} ms'
+                  f'  lean {percentile(lean_latency, 0.5) * 1000:6.2f} ms   (bodies identical)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Alışkanlık arama benchmark'ı.
+
+Hedef kullanıcıya farklı sayılarda (varsayılan 100, 1.000 ve 10.000) rastgele adlı alışkanlık
+ekler ve eski yolu (tüm alışkanlıkları yükleyip adı/açıklamayı Python'da süzmek, istemcinin
+yaptığı gibi) FTS5 aramasıyla karşılaştırır: önek, çok terimli ve yazım hatalı sorgular.
+Aynı shard'daki diğer kullanıcıların alışkanlıkları da indekste yer alır.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.search_query [--sizes 100 1000 10000] [--other-users 20] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from config import Config
+from app import create_app, db
+from app.models import Habit
+from app.search import rebuild_user_index, search_habits
+from app.sharding import create_schema, create_user
+
+WORDS = ('morning run meditation reading journal water stretch yoga walk guitar piano spanish '
+         'german vitamins sleep early floss cook budget inbox cleanup gratitude pushups plank '
+         'swim cycling hydrate breathing study review practice write code podcast news tidy').split()
+QUERIES = {
+    'prefix': 'medi',
+    'two terms': 'morning med',
+    'typo': 'meditaton',
+}
+
+
+def seed_habits(user_id, count, rng):
+    rows = [{
+        'user_id': user_id,
+        'name': ' '.join(rng.sample(WORDS, 2)).capitalize(),
+        'description': ' '.join(rng.sample(WORDS, 5))
+    } for _ in range(count)]
+    db.session.execute(insert(Habit), rows)
+    rebuild_user_index(user_id)
+    db.session.commit()
+
+
+def legacy_search(user_id, query):
+    terms = query.lower().split()
+    return [
+        habit for habit in Habit.query.filter_by(user_id=user_id).all()
+        if all(term in f'{habit.name} {habit.description}'.lower() for term in terms)
+    ]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--other-users', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(22)
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+            SHARD_DATABASE_URLS = []
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            create_schema()
+            for index in range(args.other_users):
+                other = create_user(f'other{index}', f'other{index}@example.com', password_hash='-')
+                db.session.flush()
+                seed_habits(other.id, 500, rng)
+
+            for size in args.sizes:
+                user = create_user(f'target{size}', f'target{size}@example.com', password_hash='-')
+                db.session.flush()
+                user_id = user.id
+                seed_habits(user_id, size, rng)
+
+                print(f'{size:,} habits')
+                for label, query in QUERIES.items():
+                    legacy = timed(lambda: legacy_search(user_id, query), args.repeat)
+                    fts = timed(lambda: search_habits(user_id, query, limit=20), args.repeat)
+                    print(f'  {label:<10} legacy {legacy * 1000:8.2f} ms   fts5 {fts * 1000:7.2f} ms  x{legacy / fts:6.1f}')
+
+
+if __name__ == '__main__':
+    main()
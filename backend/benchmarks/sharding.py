@@ -0,0 +1,112 @@
+"""
+Shard sayısına göre yazma verimi benchmark'ı.
+
+Her shard sayısı için geçici klasörde bir genel dizin ve N SQLite dosyası oluşturur, kullanıcıları
+shard'lara dağıtır ve ayrı süreçlerdeki yazıcılarla belirli bir süre boyunca
+POST /habits/<id>/logs istekleri gönderir. Saniyedeki başarılı yazma sayısını, p95 gecikmeyi
+ve hatalı (ör. "database is locked") yanıt sayısını raporlar. Shard sayısı 1 iken tek
+veritabanı kullanılır (SHARD_DATABASE_URLS boş).
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.sharding [--shards 1 2 4] [--writers 4] [--users 32] [--seconds 5]
+                                  [--profile default|production]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app
+from app.sharding import create_schema
+from benchmarks.datagen import generate, PASSWORD
+from benchmarks.load import percentile
+
+
+def _settings(tmp, shard_count, profile):
+    directory = f'sqlite:///{os.path.join(tmp, "directory.db")}'
+    return {
+        'SQLALCHEMY_DATABASE_URI': directory,
+        'SHARD_DATABASE_URLS': [] if shard_count == 1 else
+            [f'sqlite:///{os.path.join(tmp, f"shard{i}.db")}' for i in range(shard_count)],
+        'SQLITE_PROFILE': profile,
+        'CACHE_BACKEND': 'none',
+        'METRICS_ENABLED': False,
+        'EVENTS_BACKEND': 'none',
+        'JOB_WORKERS': 0,
+    }
+
+
+def _writer(settings, users, seconds, seed, results):
+    # Her yazıcı kendi uygulamasıyla ayrı bir süreçte çalışır (ayrı gunicorn işçileri gibi)
+    app = create_app(type('ShardBenchConfig', (Config,), settings))
+    rng = random.Random(seed)
+    clients = []
+    for username, habit_ids in users:
+        client = app.test_client()
+        client.post('/login', json={'username': username, 'password': PASSWORD})
+        clients.append((client, habit_ids))
+
+    latencies, errors = [], 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        client, habit_ids = rng.choice(clients)
+        day = date.today() - timedelta(days=rng.randint(0, 365))
+        started = time.perf_counter()
+        response = client.post(f'/habits/{rng.choice(habit_ids)}/logs', json={'date': day.isoformat()})
+        latencies.append(time.perf_counter() - started)
+        if response.status_code not in (200, 201):
+            errors += 1
+    results.put((latencies, errors))
+
+
+def run(shard_count, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = _settings(tmp, shard_count, args.profile)
+        app = create_app(type('ShardBenchConfig', (Config,), settings))
+        with app.app_context():
+            create_schema()
+            data = generate(users=args.users, habits_per_user=5, days=30, seed=11)
+
+        users = list(zip(data['usernames'], data['habit_ids'].values()))
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        writers = [
+            context.Process(target=_writer, args=(settings, users[i::args.writers], args.seconds, i, results))
+            for i in range(args.writers)
+        ]
+        for writer in writers:
+            writer.start()
+        collected = [results.get() for _ in writers]
+        for writer in writers:
+            writer.join()
+
+        latencies = [sample for samples, _ in collected for sample in samples]
+        errors = sum(count for _, count in collected)
+        writes = len(latencies) - errors
+        print(f'{shard_count} shard(s): {writes / args.seconds:7.1f} writes/s'
+              f'  p95 {percentile(latencies, 0.95) * 1000:6.1f} ms  {errors} error(s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--writers', type=int, default=4, help='Yazıcı süreç sayısı')
+    parser.add_argument('--users', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--profile', choices=('default', 'production'), default='default',
+                        help="SQLite profili ('default': rollback günlüğü, her commit'te fsync)")
+    args = parser.parse_args()
+
+    for shard_count in args.shards:
+        run(shard_count, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+SQLite eşzamanlılık stres testi.
+
+Aynı dosya veritabanı üzerinde yazan (POST /habits/<id>/logs) ve okuyan (GET /habits, /stats)
+iş parçacıklarını belirli bir süre çalıştırır; her veritabanı profili için saniyedeki
+başarılı işlem sayısını ve "database is locked" hatalarını raporlar.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.sqlite_concurrency [--writers 8] [--readers 8] [--seconds 10]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+
+PROFILES = {
+    'default': {'SQLITE_PROFILE': 'default'},
+    'production': {'SQLITE_PROFILE': 'production'},
+    'production+serialized': {'SQLITE_PROFILE': 'production', 'SQLITE_SERIALIZE_WRITES': True},
+}
+
+
+def run_profile(name, overrides, writers, readers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = dict(overrides, SQLALCHEMY_DATABASE_URI=f'sqlite:///{os.path.join(tmp, "stress.db")}')
+        BenchConfig = type('BenchConfig', (Config,), settings)
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+
+        # Her yazar kendi kullanıcısını ve alışkanlığını kullanır; okuyucular bu kullanıcıları okur
+        habit_ids = []
+        for index in range(writers):
+            client = app.test_client()
+            client.post('/register', json={'username': f'w{index}', 'email': f'w{index}@example.com', 'password': 'pw'})
+            client.post('/login', json={'username': f'w{index}', 'password': 'pw'})
+            habit_ids.append(client.post('/habits', json={'name': 'stress'}).get_json()['id'])
+
+        counters = {'writes': 0, 'reads': 0, 'locked': 0, 'errors': 0}
+        lock = threading.Lock()
+        stop_at = time.monotonic() + seconds
+
+        def record(kind, response):
+            with lock:
+                if response.status_code < 400:
+                    counters[kind] += 1
+                elif 'locked' in (response.get_json() or {}).get('error', ''):
+                    counters['locked'] += 1
+                else:
+                    counters['errors'] += 1
+
+        def writer(index):
+            rng = random.Random(index)
+            client = app.test_client()
+            client.post('/login', json={'username': f'w{index}', 'password': 'pw'})
+            while time.monotonic() < stop_at:
+                day = (date.today() - timedelta(days=rng.randint(0, 365))).isoformat()
+                record('writes', client.post(f'/habits/{habit_ids[index]}/logs', json={'date': day}))
+
+        def reader(index):
+            client = app.test_client()
+            client.post('/login', json={'username': f'w{index % writers}', 'password': 'pw'})
+            while time.monotonic() < stop_at:
+                record('reads', client.get('/habits'))
+                record('reads', client.get('/stats'))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            db.engine.dispose()
+
+        print(f'{name:<24} writes/s {counters["writes"] / seconds:8.1f}  reads/s {counters["reads"] / seconds:8.1f}'
+              f'  locked {counters["locked"]:5d}  other errors {counters["errors"]:5d}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+    args = parser.parse_args()
+
+    for name in args.profiles:
+        run_profile(name, PROFILES[name], args.writers, args.readers, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
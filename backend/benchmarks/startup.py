@@ -0,0 +1,117 @@
+"""
+Uygulama açılış (cold start) benchmark'ı.
+
+Her ölçüm yeni bir Python sürecinde yapılır: 'app' paketinin içe aktarılma süresi, create_app
+süresi, ilk isteğin (GET /healthz) süresi ve süreç başlangıcından ilk yanıta kadar geçen toplam
+süre raporlanır. Geliştirme ve üretim modları (APP_MODE) karşılaştırılır.
+
+--threshold-ms verilirse, herhangi bir modun medyan toplam süresi bu eşiği aşarsa; --baseline
+verilirse, medyan toplam süre kayıtlı değerden --tolerance oranından fazla kötüleşirse betik
+sıfırdan farklı bir kodla çıkar (CI'da gerileme kontrolü için). --save ile sonuçlar kaydedilir.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.startup [--runs 5] [--modes development production]
+                                 [--threshold-ms 800] [--baseline startup.json --tolerance 0.2]
+                                 [--save startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Alt süreçte çalışan ölçüm kodu; süreler milisaniye olarak JSON satırı halinde yazılır
+CHILD = r'''
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+response = app.test_client().get('/healthz')
+answered = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    'import': (imported - started) * 1000,
+    'create_app': (created - imported) * 1000,
+    'first_request': (answered - created) * 1000,
+}))
+'''
+
+
+def measure(mode, database_url):
+    env = dict(os.environ, APP_MODE=mode, DATABASE_URL=database_url, JOB_WORKERS='0')
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    env.pop('AUTO_CREATE_SCHEMA', None)
+    env.pop('PREWARM_ON_STARTUP', None)
+
+    # Toplam süre yorumlayıcının açılışını da içerir (sunucusuz bir örneğin gördüğü gibi)
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    total = (time.perf_counter() - started) * 1000
+    result = json.loads(output.strip().splitlines()[-1])
+    result['total'] = total
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--modes', nargs='+', choices=('development', 'production'), default=['development', 'production'])
+    parser.add_argument('--threshold-ms', type=float, help='Medyan toplam süre için üst sınır')
+    parser.add_argument('--baseline', help='Karşılaştırılacak sonuç dosyası (--save ile üretilir)')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Taban değere göre izin verilen kötüleşme oranı')
+    parser.add_argument('--save', help='Medyan sonuçların yazılacağı dosya')
+    args = parser.parse_args()
+
+    medians = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Üretim modu şemayı oluşturmaz; ölçümler için şema bir kez önceden oluşturulur
+        database_url = f'sqlite:///{os.path.join(tmp, "startup.db")}'
+        subprocess.run(
+            [sys.executable, '-c', 'from app import create_app, db\napp = create_app()\nwith app.app_context(): db.create_all()'],
+            cwd=BACKEND_DIR, env=dict(os.environ, APP_MODE='development', DATABASE_URL=database_url, JOB_WORKERS='0'),
+            check=True
+        )
+
+        for mode in args.modes:
+            # İlk çalıştırma .pyc dosyalarını ve işletim sistemi önbelleğini ısıtır, sayılmaz
+            measure(mode, database_url)
+            runs = [measure(mode, database_url) for _ in range(args.runs)]
+            medians[mode] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            m = medians[mode]
+            print(f'{mode:12}: import {m["import"]:6.1f} ms  create_app {m["create_app"]:6.1f} ms'
+                  f'  first request {m["first_request"]:6.1f} ms  total {m["total"]:6.1f} ms')
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(medians, f, indent=2)
+
+    failures = []
+    if args.threshold_ms is not None:
+        for mode, m in medians.items():
+            if m['total'] > args.threshold_ms:
+                failures.append(f'{mode}: total {m["total"]:.1f} ms > threshold {args.threshold_ms:.1f} ms')
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for mode, m in medians.items():
+            if mode in baseline:
+                limit = baseline[mode]['total'] * (1 + args.tolerance)
+                if m['total'] > limit:
+                    failures.append(f'{mode}: total {m["total"]:.1f} ms > baseline {baseline[mode]["total"]:.1f} ms + {args.tolerance:.0%}')
+
+    for failure in failures:
+        print(f'REGRESSION {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
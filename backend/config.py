@@ -7,6 +7,91 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev_secret_key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///habit_tracker.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Çalışma modu: 'development' veya 'production'. Üretimde göç araçları sadece CLI için
+    # yüklenir, şema çalışma anında oluşturulmaz ve bağlantı havuzu/mapper'lar önceden ısıtılır.
+    APP_MODE = os.environ.get('APP_MODE') or 'development'
+    AUTO_CREATE_SCHEMA = os.environ.get(
+        'AUTO_CREATE_SCHEMA', 'false' if APP_MODE == 'production' else 'true'
+    ).lower() in ('1', 'true')
+    PREWARM_ON_STARTUP = os.environ.get(
+        'PREWARM_ON_STARTUP', 'true' if APP_MODE == 'production' else 'false'
+    ).lower() in ('1', 'true')
+    PREWARM_CONNECTIONS = int(os.environ.get('PREWARM_CONNECTIONS') or 2)
+    # Virgülle ayrılmış izinli kökenler; boşsa CORS eklentisi yüklenmez
+    CORS_ORIGINS = [origin for origin in os.environ.get('CORS_ORIGINS', 'http://localhost:5173').split(',') if origin]
+
+    # Parola özetleme: werkzeug yöntem dizesi (ör. 'scrypt:32768:8:1' veya 'pbkdf2:sha256:600000').
+    # Değiştirildiğinde eski özetler bir sonraki başarılı girişte yeni ayarlarla yeniden oluşturulur.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 4)
+    PASSWORD_HASH_TIMEOUT = 10 # Saniye; havuz bu sürede yanıt veremezse 503 döner
+
+    # Kimlik doğrulama: 'session' (çerez), 'token' (Bearer) veya 'both'
+    AUTH_MODE = os.environ.get('AUTH_MODE') or 'both'
+    ACCESS_TOKEN_TTL = int(os.environ.get('ACCESS_TOKEN_TTL') or 15 * 60) # Saniye
+    REFRESH_TOKEN_TTL = int(os.environ.get('REFRESH_TOKEN_TTL') or 30 * 24 * 3600) # Saniye
+
+    # Veritabanı profili: 'default' veya 'production' (WAL, pragmalar, bağlantı havuzu)
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE') or 'default'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000)
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE = -64000 # Negatif değer KiB cinsindendir (~64 MB)
+    SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE') or 10)
+    SQLITE_POOL_MAX_OVERFLOW = 10
+    SQLITE_POOL_TIMEOUT = 30
+    # True ise süreç içindeki yazmalar tek bir yazar kilidi üzerinden sıraya alınır
+    SQLITE_SERIALIZE_WRITES = os.environ.get('SQLITE_SERIALIZE_WRITES', '').lower() in ('1', 'true')
+
+    # Kullanıcı verisinin bölündüğü veritabanları (virgülle ayrılmış). Boşsa tek veritabanı
+    # kullanılır. SQLALCHEMY_DATABASE_URI genel dizini tutar; mevcut tek veritabanından geçişte o
+    # adres ilk shard olarak listelenir ve 'flask shards rebalance' çalıştırılır. Yazar kilidi
+    # (SQLITE_SERIALIZE_WRITES) süreç genelinde tektir; shard'larla birlikte kullanılmamalıdır.
+    SHARD_DATABASE_URLS = [url for url in os.environ.get('SHARD_DATABASE_URLS', '').split(',') if url]
+    SHARD_DIRECTORY_TTL = 60 # Saniye; kullanıcı -> shard önbelleği
+
+    # Performans ölçümü: /metrics uç noktası, Server-Timing başlığı ve yavaş sorgu logu
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true')
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS') or 100)
+    # /metrics için 'Authorization: Bearer <token>'; boşsa sadece yerel (loopback) isteklere açık
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+    # Arka plan işleri: süreç içi işçi sayısı (0 ise sadece 'flask run-jobs' süreçleri çalıştırır),
+    # deneme sayısı ve yeniden denemeler arasındaki temel bekleme (saniye, üstel artar)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS') or 2)
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS') or 3)
+    JOB_RETRY_BACKOFF = 5
+    JOB_POLL_INTERVAL = 2.0
+    JOB_STALE_AFTER = 600 # Saniye; bu süreden uzun "running" kalan işler yeniden kuyruğa alınır
+    # Silinen alışkanlıkların kayıtları bu büyüklükte parçalar halinde, ayrı transaction'larda silinir
+    PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE') or 1000)
+
+    # Canlı güncellemeler (/events, Server-Sent Events): 'memory' (tek süreç), 'redis'
+    # (süreçler arası pub/sub) veya 'none'. Akışlar uzun süre açık kaldığından sunucunun
+    # iş parçacıklı (threaded) ya da gevent işçileriyle çalışması gerekir.
+    EVENTS_BACKEND = os.environ.get('EVENTS_BACKEND') or 'memory'
+    EVENTS_REDIS_URL = os.environ.get('EVENTS_REDIS_URL') or 'redis://localhost:6379/0'
+    EVENTS_KEEPALIVE = 15 # Saniye
+    EVENTS_STREAM_TIMEOUT = 300 # Saniye; sonra istemci Last-Event-ID ile yeniden bağlanır
+
+    # Tamamlanma geçmişi okumaları: 'rows' (habit_log) veya 'bitmap' (habit_year_bitmap).
+    # Bitmap'ler her iki modda da yazma sırasında güncel tutulur.
+    HABIT_STORAGE_MODE = os.environ.get('HABIT_STORAGE_MODE') or 'rows'
+
+    # Tek bir /logs/bulk isteğinde kabul edilen en fazla işlem sayısı
+    MAX_BULK_LOG_OPERATIONS = int(os.environ.get('MAX_BULK_LOG_OPERATIONS') or 5000)
+
+    # /habits sayfalamasında istenebilecek en büyük sayfa boyutu
+    MAX_PAGE_SIZE = 200
+
+    # JSON yanıtları: 'orjson' (kuruluysa; çıktı standart json ile bayt bayt aynıdır) veya 'stdlib'
+    JSON_ENCODER = os.environ.get('JSON_ENCODER') or 'orjson'
+
+    # Yanıt önbelleği: 'memory' (süreç içi LRU), 'redis' veya 'none' (kapalı)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'memory'
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or 'redis://localhost:6379/0'
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL') or 300)
+    CACHE_MAX_ENTRIES = 10000
     
     # Session Cookie Settings
     SESSION_COOKIE_SAMESITE = 'Lax'
@@ -1,8 +1,21 @@
-from app import create_app, db
+import os
+from app import create_app
+from app.jobs import job_queue
+from app.sharding import create_schema
 
 app = create_app()
 
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-    app.run(debug=True)
+    debug = app.config['APP_MODE'] != 'production'
+    # Üretim modunda şema sadece 'flask db upgrade' ile oluşturulur
+    if app.config['AUTO_CREATE_SCHEMA']:
+        with app.app_context():
+            create_schema()
+    # Hata ayıklama modunda yeniden yükleyicinin (reloader) izleyen ana süreci işçi başlatmaz;
+    # işçiler sunucuyu çalıştıran alt süreçte (WERKZEUG_RUN_MAIN) başlar
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        job_queue.start_on_boot(app)
+    app.run(debug=debug)
+else:
+    # WSGI sunucuları (ör. gunicorn main:app) uygulamayı buradan yükler
+    job_queue.start_on_boot(app)
@@ -45,12 +45,43 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+def get_target_engines():
+    """
+    Yükseltilecek veritabanları. Varsayılan olarak sadece genel veritabanı; '-x shard=all'
+    ile tüm shard'lar da, '-x shard=<n>' veya '-x shard=directory' ile tek bir veritabanı.
+    Her veritabanı kendi alembic_version tablosunu tutar.
+    """
+    engines = target_db.engines
+    targets = [('directory', engines[None])]
+    for index, bind_key in enumerate(current_app.extensions['shard_bind_keys']):
+        # Genel veritabanıyla aynı olan shard ayrıca yükseltilmez
+        if bind_key is not None:
+            targets.append((f'shard{index}', engines[bind_key]))
+
+    selected = context.get_x_argument(as_dictionary=True).get('shard')
+    if selected is None:
+        return targets[:1]
+    if selected == 'all':
+        return targets
+    name = selected if selected == 'directory' else f'shard{selected}'
+    matches = [target for target in targets if target[0] == name]
+    if not matches:
+        raise ValueError(f'Unknown shard: {selected}')
+    return matches
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
     return target_db.metadata
 
 
+def include_name(name, type_, parent_names):
+    # FTS5 sanal tabloları ve gölge tabloları (habit_fts, habit_fts_data, ...) modellerde
+    # tanımlı değildir; autogenerate bunları silmeye çalışmasın
+    return not (type_ == 'table' and name.startswith('habit_fts'))
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +96,7 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True, include_name=include_name
     )
 
     with context.begin_transaction():
@@ -94,17 +125,33 @@ def run_migrations_online():
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
 
-    connectable = get_engine()
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=get_metadata(),
-            **conf_args
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+    for name, connectable in get_target_engines():
+        logger.info('Migrating %s (%s)', name, connectable.url)
+        with connectable.connect() as connection:
+            sqlite = connection.dialect.name == 'sqlite'
+            if sqlite:
+                # Uygulama bağlantıları yabancı anahtarları açar (app/sqlite_profile.py). Göçlerde
+                # kapalı olmalıdır: batch modunda tablo yeniden oluşturulurken DROP TABLE örtük bir
+                # DELETE yapar ve ON DELETE CASCADE bağlı tablolardaki satırları siler. Pragma
+                # transaction içinde etkisizdir; bu yüzden göç transaction'ından önce uygulanır ve
+                # bağlantı havuza dönmeden geri açılır.
+                connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+                connection.commit()
+            try:
+                context.configure(
+                    connection=connection,
+                    target_metadata=get_metadata(),
+                    include_name=include_name,
+                    **conf_args
+                )
+
+                with context.begin_transaction():
+                    context.run_migrations()
+            finally:
+                if sqlite:
+                    connection.rollback()
+                    connection.exec_driver_sql('PRAGMA foreign_keys=ON')
+                    connection.commit()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,36 @@
+"""Add habit full-text search index
+
+Revision ID: 2d8f6b3a9c10
+Revises: 7c2f5a8e1b49
+Create Date: 2026-10-18 15:02:41.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d8f6b3a9c10'
+down_revision = '7c2f5a8e1b49'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 sanal tabloları autogenerate tarafından algılanmaz; DDL app/models.py ile aynıdır
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS habit_fts USING fts5("
+        "owner, name, description, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS habit_fts_vocab USING fts5vocab(habit_fts, 'row')")
+
+    # Mevcut alışkanlıklar indekse eklenir
+    op.execute(
+        "INSERT INTO habit_fts (rowid, owner, name, description) "
+        "SELECT id, 'u' || user_id, name, COALESCE(description, '') FROM habit"
+    )
+
+
+def downgrade():
+    op.execute('DROP TABLE IF EXISTS habit_fts_vocab')
+    op.execute('DROP TABLE IF EXISTS habit_fts')
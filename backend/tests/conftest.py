@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.sharding import create_schema
+
+PASSWORD = 'Passw0rd!x'
+
+
+class FakeRedis:
+    """Testler için get/set/incr/publish destekleyen süreç içi Redis benzeri istemci."""
+
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+        self.published = []
+
+    def get(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at < time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        value = self.values.get(key)
+        return value.encode('utf-8') if isinstance(value, str) else value
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        if ex:
+            self.expires[key] = time.monotonic() + ex
+        else:
+            self.expires.pop(key, None)
+        return True
+
+    def incr(self, key):
+        value = int(self.values.get(key) or 0) + 1
+        self.values[key] = str(value)
+        return value
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+
+def make_config(tmp_path, **overrides):
+    """Her test için geçici dosya veritabanı kullanan yapılandırma sınıfı."""
+    attributes = {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "test.db"}',
+        'SHARD_DATABASE_URLS': [],
+        'METRICS_ENABLED': False,
+        'JOB_WORKERS': 0,
+        'TESTING': True,
+    }
+    attributes.update(overrides)
+    return type('TestConfig', (Config,), attributes)
+
+
+def build_app(config_class):
+    app = create_app(config_class)
+    with app.app_context():
+        create_schema()
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = build_app(make_config(tmp_path))
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def register(client, username):
+    """Kullanıcı oluşturup oturum açar; kullanıcı id'sini döndürür."""
+    response = client.post('/register', json={
+        'username': username, 'email': f'{username}@example.com', 'password': PASSWORD
+    })
+    assert response.status_code == 201, response.get_json()
+    response = client.post('/login', json={'username': username, 'password': PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['user']['id']
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,77 @@
+import sqlite3
+import time
+
+from flask import jsonify
+
+from app.cache import RedisCache, ResponseCache
+from tests.conftest import FakeRedis, build_app, make_config, register
+
+
+def test_redis_cache_get_set_and_counter():
+    backend = RedisCache(FakeRedis(), default_ttl=300)
+    assert backend.get('missing') is None
+    backend.set('entry', {'body': '[]', 'headers': [['X-Test', '1']]})
+    assert backend.get('entry') == {'body': '[]', 'headers': [['X-Test', '1']]}
+
+    assert backend.counter('user:1:version') == 0
+    assert backend.incr('user:1:version') == 1
+    assert backend.incr('user:1:version') == 2
+    assert backend.counter('user:1:version') == 2
+
+
+def test_redis_cache_entries_expire():
+    client = FakeRedis()
+    backend = RedisCache(client, default_ttl=300)
+    backend.set('short', 1, ttl=1)
+    client.expires[backend.prefix + 'short'] = time.monotonic() - 1
+    assert backend.get('short') is None
+
+
+def counting_view(calls):
+    def view():
+        calls.append(1)
+        return jsonify({'calls': len(calls)})
+    return view
+
+
+def test_redis_bump_invalidates_other_instances(tmp_path):
+    client = FakeRedis()
+    app = build_app(make_config(tmp_path, CACHE_BACKEND='redis', CACHE_REDIS_CLIENT=client))
+    # Aynı Redis'i kullanan iki süreç
+    first, second = ResponseCache(app), ResponseCache(app)
+    calls = []
+    first_view, second_view = first.cached(counting_view(calls)), second.cached(counting_view(calls))
+
+    user_id = register(app.test_client(), 'redisuser')
+    with app.test_request_context('/analytics'):
+        from flask import g
+        g.user_id = user_id
+        etag = first_view().get_etag()[0]
+        # İkinci örnek aynı girdiyi kullanır; görünüm tekrar çalışmaz
+        assert second_view().get_etag()[0] == etag and len(calls) == 1
+
+        first.bump(user_id)
+        assert second.get_version(user_id) == 1
+        assert second_view().get_etag()[0] != etag and len(calls) == 2
+
+
+def test_memory_backend_sees_bumps_from_other_processes(app, client, tmp_path):
+    register(client, 'memuser')
+    etag = client.get('/analytics').headers['ETag']
+    assert client.get('/analytics', headers={'If-None-Match': etag}).status_code == 304
+
+    # 'flask run-jobs' veya başka bir gunicorn işçisi sayacı kendi bağlantısıyla artırır
+    connection = sqlite3.connect(tmp_path / 'test.db')
+    with connection:
+        connection.execute("UPDATE user SET cache_version = cache_version + 1 WHERE username = 'memuser'")
+    connection.close()
+
+    response = client.get('/analytics', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+
+def test_memory_backend_bump_on_write(client):
+    register(client, 'writer')
+    etag = client.get('/analytics').headers['ETag']
+    assert client.post('/habits', json={'name': 'read'}).status_code == 201
+    assert client.get('/analytics', headers={'If-None-Match': etag}).status_code == 200
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from app import routes
+from app.events import events
+from tests.conftest import FakeRedis, build_app, make_config, register
+from tests.test_habit_totals import read_events
+
+
+@pytest.fixture
+def payload_calls(monkeypatch):
+    """Olay yükü için yapılan toplam ve istatistik sorgularını sayar."""
+    calls = []
+
+    def counted(function):
+        def wrapper(*args, **kwargs):
+            calls.append(function.__name__)
+            return function(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(routes, 'read_heatmap', counted(routes.read_heatmap))
+    monkeypatch.setattr(routes, 'user_stats', counted(routes.user_stats))
+    return calls
+
+
+def test_no_payload_without_subscribers(client, payload_calls):
+    register(client, 'nobody')
+    habit_id = client.post('/habits', json={'name': 'read'}).get_json()['id']
+    client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+    assert payload_calls == []
+
+
+def test_payload_built_for_subscribers(client, payload_calls):
+    user_id = register(client, 'watcher')
+    habit_id = client.post('/habits', json={'name': 'read'}).get_json()['id']
+    subscriber = events.subscribe(user_id)
+    try:
+        client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+        received = read_events(subscriber)
+    finally:
+        events.unsubscribe(user_id, subscriber)
+    assert [event for event, _ in received] == ['logs.changed']
+    assert received[0][1]['day_totals'] == {'2024-03-05': 1}
+    assert payload_calls == ['read_heatmap', 'user_stats']
+
+
+def test_reconnect_after_skipped_events_gets_resync(client):
+    user_id = register(client, 'returning')
+    subscriber = events.subscribe(user_id)
+    habit_id = client.post('/habits', json={'name': 'read'}).get_json()['id']
+    message = subscriber.get_nowait()
+    events.unsubscribe(user_id, subscriber)
+    last_event_id = message.split('\n', 1)[0][len('id: '):]
+
+    # Akış kapalıyken yapılan değişiklik yayınlanmaz; yeniden bağlanan istemci yeniden yükler
+    client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+    subscriber = events.subscribe(user_id, last_event_id)
+    try:
+        assert [event for event, _ in read_events(subscriber)] == ['resync']
+    finally:
+        events.unsubscribe(user_id, subscriber)
+
+
+def test_redis_backend_publishes_lightweight_events(tmp_path, payload_calls):
+    client_redis = FakeRedis()
+    app = build_app(make_config(tmp_path, EVENTS_BACKEND='redis', EVENTS_REDIS_CLIENT=client_redis))
+    client = app.test_client()
+    register(client, 'redisevents')
+    habit_id = client.post('/habits', json={'name': 'read'}).get_json()['id']
+    client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+
+    published = [json.loads(message) for _, message in client_redis.published]
+    assert [(message['event'], message['data']) for message in published] == [
+        ('changed', {'event': 'habit.created'}), ('changed', {'event': 'logs.changed'})
+    ]
+    assert payload_calls == []
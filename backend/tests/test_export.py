@@ -0,0 +1,68 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from app import export
+from app.sharding import use_shard
+from tests.conftest import register
+
+
+def plain_export(records, fmt):
+    """Aynı kayıtların akıtılmadan, tek seferde yazılmış dışa aktarımı."""
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=export.EXPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(records)
+        return buffer.getvalue()
+    return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Küçük parçalar akışın birçok parçaya bölünmesini sağlar
+    monkeypatch.setattr(export, 'YIELD_PER', 3)
+
+
+def stream(client, **query):
+    response = client.get('/export', query_string=query)
+    assert response.status_code == 200 and response.is_streamed
+    return response
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_streamed_export_matches_plain_export(app, client, small_chunks, fmt):
+    user_id = register(client, f'exporter{fmt}')
+    for name in ('Koşu', 'Read, "books"', 'Deleted'):
+        habit_id = client.post('/habits', json={'name': name, 'description': 'satır\nsonu'}).get_json()['id']
+        for day in range(1, 6):
+            client.post(f'/habits/{habit_id}/logs', json={'date': f'2024-03-0{day}', 'count': day})
+    client.delete(f'/habits/{habit_id}')
+
+    with app.app_context():
+        use_shard(user_id)
+        records = list(export._export_rows(user_id, None, None))
+    assert [record['record_type'] for record in records].count('log') == 10
+    body = stream(client, format=fmt).get_data(as_text=True)
+    assert body == plain_export(records, fmt)
+
+    # Sıkıştırılmış akış aynı içeriği taşır
+    compressed = stream(client, format=fmt, gzip='1').get_data()
+    assert gzip.decompress(compressed).decode('utf-8') == body
+
+
+@pytest.mark.parametrize('fmt, empty', [('csv', ','.join(export.EXPORT_COLUMNS) + '\r\n'), ('ndjson', '')])
+def test_empty_export(client, small_chunks, fmt, empty):
+    register(client, f'empty{fmt}')
+    assert stream(client, format=fmt).get_data(as_text=True) == empty
+    assert gzip.decompress(stream(client, format=fmt, gzip='1').get_data()).decode('utf-8') == empty
+
+    # Aralık dışındaki kayıtlar aktarılmaz; sadece alışkanlık satırları kalır
+    habit_id = client.post('/habits', json={'name': 'read'}).get_json()['id']
+    client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+    body = stream(client, format=fmt, **{'from': '2025-01-01', 'to': '2025-01-31'}).get_data(as_text=True)
+    lines = [line for line in body.splitlines() if line]
+    assert len(lines) == (2 if fmt == 'csv' else 1) and 'habit' in lines[-1]
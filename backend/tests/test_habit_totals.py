@@ -0,0 +1,75 @@
+import json
+import queue
+
+from app.events import events
+from tests.conftest import register
+
+DAY = '2024-03-05'
+
+
+def read_events(subscriber):
+    """Abonelik kuyruğundaki olayları (event, data) çiftleri olarak döndürür."""
+    received = []
+    while True:
+        try:
+            message = subscriber.get_nowait()
+        except queue.Empty:
+            return received
+        fields = dict(line.split(': ', 1) for line in message.strip().splitlines() if ': ' in line)
+        if 'event' in fields:
+            received.append((fields['event'], json.loads(fields['data'])))
+
+
+def totals(client):
+    heatmaps = client.get('/heatmaps').get_json()
+    report = client.get('/reports').get_json()
+    return heatmaps['total'].get(DAY, 0), report['heatmap'].get(DAY, 0), report['stats']
+
+
+def create_habits(client, *names):
+    habit_ids = []
+    for name in names:
+        habit_id = client.post('/habits', json={'name': name}).get_json()['id']
+        response = client.post(f'/habits/{habit_id}/logs', json={'date': DAY, 'completed': True})
+        assert response.status_code in (200, 201)
+        habit_ids.append(habit_id)
+    return habit_ids
+
+
+def test_archive_excludes_habit_from_all_totals(client):
+    user_id = register(client, 'archiver')
+    kept, archived = create_habits(client, 'kept', 'archived')
+    assert totals(client)[:2] == (2, 2)
+
+    subscriber = events.subscribe(user_id)
+    try:
+        assert client.post(f'/habits/{archived}/archive').status_code == 200
+        # Arşivlenen alışkanlığa yazılan kayıt toplamları değiştirmez
+        client.post(f'/habits/{archived}/logs', json={'date': '2024-03-06', 'completed': True})
+        client.post(f'/habits/{kept}/logs', json={'date': DAY, 'completed': False})
+        client.post(f'/habits/{kept}/logs', json={'date': DAY, 'completed': True})
+        received = read_events(subscriber)
+    finally:
+        events.unsubscribe(user_id, subscriber)
+
+    heatmap_total, report_total, stats = totals(client)
+    changed = [data for event, data in received if event == 'logs.changed']
+    assert changed
+    assert heatmap_total == report_total == changed[-1]['day_totals'][DAY] == 1
+    assert changed[-1]['stats'] == stats
+    assert client.get('/heatmaps').get_json()['total'].get('2024-03-06', 0) == 0
+
+    assert client.post(f'/habits/{archived}/restore').status_code == 200
+    heatmap_total, report_total, _ = totals(client)
+    assert heatmap_total == report_total == 2
+    assert client.get('/reports').get_json()['heatmap'].get('2024-03-06') == 1
+
+
+def test_delete_excludes_habit_before_purge(client):
+    register(client, 'deleter')
+    _, deleted = create_habits(client, 'kept', 'deleted')
+
+    assert client.delete(f'/habits/{deleted}').status_code in (200, 202, 204)
+    heatmap_total, report_total, stats = totals(client)
+    assert heatmap_total == report_total == 1
+    assert stats['total_habits'] == 1
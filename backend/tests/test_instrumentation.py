@@ -0,0 +1,37 @@
+import logging
+
+from tests.conftest import build_app, make_config, register
+
+
+def metrics_app(tmp_path, **overrides):
+    return build_app(make_config(tmp_path, METRICS_ENABLED=True, **overrides))
+
+
+def test_metrics_requires_token(tmp_path):
+    client = metrics_app(tmp_path, METRICS_TOKEN='s3cret').test_client()
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+
+    response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds' in response.get_data(as_text=True)
+
+
+def test_metrics_without_token_is_local_only(tmp_path):
+    client = metrics_app(tmp_path).test_client()
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.7'}).status_code == 401
+    # Yerel bir ters vekil sunucu üzerinden gelen istekler de reddedilir
+    assert client.get('/metrics', headers={'X-Forwarded-For': '203.0.113.7'}).status_code == 401
+
+
+def test_slow_query_log_redacts_parameters(tmp_path, caplog):
+    client = metrics_app(tmp_path, SLOW_QUERY_THRESHOLD_MS=0).test_client()
+    with caplog.at_level(logging.WARNING, logger='app.instrumentation'):
+        register(client, 'private')
+        client.post('/habits', json={'name': 'therapy appointments'})
+
+    messages = [record.getMessage() for record in caplog.records if record.name == 'app.instrumentation']
+    assert messages and all('redacted>' in message for message in messages)
+    logged = '\n'.join(messages)
+    assert 'private@example.com' not in logged and 'therapy appointments' not in logged
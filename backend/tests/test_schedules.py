@@ -0,0 +1,78 @@
+import random
+from datetime import date, timedelta
+
+from app import db
+from app.models import Habit, HabitWeekRun
+from app.schedules import rebuild_habit_periods, week_start
+from app.timezones import user_today
+from tests.conftest import register
+
+
+def week_runs(habit_id):
+    return [
+        (run.start_week, run.end_week, run.length)
+        for run in HabitWeekRun.query.filter_by(habit_id=habit_id).order_by(HabitWeekRun.start_week)
+    ]
+
+
+def brute_streaks(logs, starts_on, today, times_per_week):
+    """Haftaları baştan yürüyerek (mevcut, en iyi) haftalık seriyi hesaplar."""
+    current_week = week_start(today)
+    achieved = {}
+    for day in logs:
+        achieved[week_start(day)] = achieved.get(week_start(day), 0) + 1
+
+    def expected(week):
+        # Başlangıç haftasında sadece starts_on'dan sonraki günler beklenebilir
+        return min(times_per_week, (week + timedelta(days=6) - max(week, starts_on)).days + 1)
+
+    best = run = 0
+    week = week_start(starts_on)
+    while week < current_week:
+        run = run + 1 if achieved.get(week, 0) >= expected(week) else 0
+        best = max(best, run)
+        week += timedelta(days=7)
+    current = run + 1 if achieved.get(current_week, 0) >= expected(current_week) else run
+    return current, max(best, current)
+
+
+def test_weekly_streaks_follow_log_changes(app, client):
+    register(client, 'weekly')
+    habit_id = client.post('/habits', json={
+        'name': 'gym', 'schedule': {'type': 'weekly', 'times_per_week': 2}
+    }).get_json()['id']
+    with app.app_context():
+        today = user_today(db.session.query(Habit.user_id).filter_by(id=habit_id).scalar())
+
+    random.seed(21)
+    logs = set()
+    for _ in range(150):
+        day = today - timedelta(days=random.randint(0, 90))
+        completed = day not in logs
+        response = client.post(f'/habits/{habit_id}/logs', json={'date': day.isoformat(), 'completed': completed})
+        assert response.status_code in (200, 201)
+        logs ^= {day}
+
+        starts_on = date.fromisoformat(client.get(f'/habits/{habit_id}').get_json()['starts_on'])
+        result = client.get(f'/habits/{habit_id}/adherence').get_json()
+        assert (result['current_streak'], result['best_streak']) == brute_streaks(logs, starts_on, today, 2)
+
+    # Artımlı tutulan seriler, geçmişten yeniden hesaplananlarla aynıdır
+    with app.app_context():
+        habit = db.session.get(Habit, habit_id)
+        incremental = week_runs(habit_id)
+        rebuild_habit_periods(habit)
+        db.session.commit()
+        assert week_runs(habit_id) == incremental
+
+
+def test_adherence_range_only_counts_requested_weeks(client):
+    register(client, 'ranged')
+    habit_id = client.post('/habits', json={'name': 'walk'}).get_json()['id']
+    for day in ('2024-01-01', '2024-01-02', '2024-02-05'):
+        client.post(f'/habits/{habit_id}/logs', json={'date': day, 'completed': True})
+
+    result = client.get(f'/habits/{habit_id}/adherence?from=2024-02-05&to=2024-02-11').get_json()
+    assert (result['from'], result['to']) == ('2024-02-05', '2024-02-11')
+    assert (result['expected'], result['achieved']) == (7, 1)
+    assert sum(week['achieved'] for week in result['weeks']) == 1
@@ -0,0 +1,26 @@
+from tests.conftest import register
+
+
+def test_search_results_are_ordered_by_score(client):
+    register(client, 'searcher')
+    names = {
+        'Morning run': 'jog around the park',
+        'Read a book': 'morning reading',
+        'Meditation': 'ten minutes every morning before a morning run',
+        'Spanish practice': 'duolingo',
+    }
+    ids = {name: client.post('/habits', json={'name': name, 'description': description}).get_json()['id']
+           for name, description in names.items()}
+
+    results = client.get('/habits/search?q=morning').get_json()['results']
+    # Ad eşleşmesi açıklama eşleşmelerinden önce gelir; puanlar sıralamayla tutarlıdır
+    assert [habit['id'] for habit in results] == [ids['Morning run'], ids['Meditation'], ids['Read a book']]
+    scores = [habit['score'] for habit in results]
+    assert all(score > 0 for score in scores)
+    assert scores == sorted(scores, reverse=True) and len(set(scores)) == len(scores)
+
+    # Sayfalar aynı sırayı devam ettirir
+    first = client.get('/habits/search?q=morning&limit=2').get_json()
+    second = client.get('/habits/search?q=morning&limit=2&offset=2').get_json()
+    assert [habit['id'] for habit in first['results'] + second['results']] == [habit['id'] for habit in results]
+    assert first['next_offset'] == 2 and second['next_offset'] is None
@@ -0,0 +1,124 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.jobs import job_queue
+from app.models import Job
+from app.sharding import move_user, placement, shard_of
+from tests.conftest import PASSWORD, build_app, make_config, register
+
+SHARDS = ('directory', 'shard1', 'shard2')
+
+
+@pytest.fixture
+def sharded_app(tmp_path):
+    urls = [f'sqlite:///{tmp_path / name}.db' for name in SHARDS]
+    app = build_app(make_config(tmp_path, SQLALCHEMY_DATABASE_URI=urls[0], SHARD_DATABASE_URLS=urls))
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def user_rows(tmp_path, table):
+    """Her shard dosyasındaki tablo satır sayısı (sırasıyla shard 0, 1, 2)."""
+    counts = []
+    for name in SHARDS:
+        connection = sqlite3.connect(tmp_path / f'{name}.db')
+        counts.append(connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0])
+        connection.close()
+    return counts
+
+
+@contextmanager
+def count_queries(app):
+    """Bağlam süresince motor adına göre çalıştırılan SELECT sayıları."""
+    counts = {}
+    listeners = []
+    with app.app_context():
+        engines = {key: engine for key, engine in db.engines.items()}
+    for key, engine in engines.items():
+        def listener(conn, cursor, statement, parameters, context, executemany, key=key):
+            if statement.lstrip().upper().startswith('SELECT'):
+                counts[key] = counts.get(key, 0) + 1
+        event.listen(engine, 'before_cursor_execute', listener)
+        listeners.append((engine, listener))
+    try:
+        yield counts
+    finally:
+        for engine, listener in listeners:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+
+def test_users_are_routed_to_their_shard(sharded_app, tmp_path):
+    placed = []
+    for index in range(6):
+        client = sharded_app.test_client()
+        user_id = register(client, f'user{index}')
+        habit_id = client.post('/habits', json={'name': f'habit {index}'}).get_json()['id']
+        client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+        assert len(client.get('/habits').get_json()) == 1
+        placed.append(placement(user_id, 3))
+
+    expected = [placed.count(shard) for shard in range(3)]
+    assert user_rows(tmp_path, 'user') == expected
+    assert user_rows(tmp_path, 'habit_log') == expected
+    # Dizin ve iş kuyruğu sadece varsayılan veritabanındadır
+    assert user_rows(tmp_path, 'user_directory')[0] == 6
+
+
+def test_move_user_remaps_queued_jobs(sharded_app, tmp_path):
+    client = sharded_app.test_client()
+    user_id = register(client, 'mover')
+    kept, deleted = [client.post('/habits', json={'name': name}).get_json()['id'] for name in ('kept', 'deleted')]
+    for habit_id in (kept, deleted):
+        client.post(f'/habits/{habit_id}/logs', json={'date': '2024-03-05', 'completed': True})
+    assert client.delete(f'/habits/{deleted}').status_code == 200
+
+    source = placement(user_id, 3)
+    target = (source + 1) % 3
+    with sharded_app.app_context():
+        assert move_user(user_id, target) > 0
+        assert shard_of(user_id) == target
+        job = Job.query.filter_by(user_id=user_id, kind='purge_habit').one()
+        new_deleted = json.loads(job.params)['habit_id']
+        assert job.dedup_key.startswith('purge_habit:')
+
+    # Taşınan kullanıcının verisi sadece hedef shard'dadır; id'ler yeniden verilmiştir
+    assert user_rows(tmp_path, 'habit')[source] == 0 and user_rows(tmp_path, 'habit')[target] == 2
+    habits = client.get('/habits').get_json()
+    assert [habit['name'] for habit in habits] == ['kept']
+    assert client.get('/habits/search?q=kept').get_json()['results'][0]['id'] == habits[0]['id']
+
+    # Bekleyen temizlik işi yeni id'yle çalışır ve silinen alışkanlığı hedef shard'dan kaldırır
+    with sharded_app.app_context():
+        assert job_queue.run_pending() == 1
+        job = Job.query.filter_by(user_id=user_id, kind='purge_habit').one()
+        assert job.status == 'succeeded'
+        assert json.loads(job.result) == {'habit_id': new_deleted, 'removed_logs': 1}
+    assert user_rows(tmp_path, 'habit')[target] == 1
+    assert client.get('/reports').get_json()['heatmap'] == {'2024-03-05': 1}
+
+
+def test_login_skips_directory_query_once_cached(sharded_app):
+    register(sharded_app.test_client(), 'cached')
+
+    with count_queries(sharded_app) as counts:
+        client = sharded_app.test_client()
+        assert client.post('/login', json={'username': 'cached', 'password': PASSWORD}).status_code == 200
+    # Kullanıcının satırı tek sorguyla kendi shard'ından okunur
+    assert sum(counts.values()) == 1
+
+
+def test_login_is_a_single_query_without_shards(app):
+    register(app.test_client(), 'single')
+
+    with count_queries(app) as counts:
+        client = app.test_client()
+        assert client.post('/login', json={'username': 'single@example.com', 'password': PASSWORD}).status_code == 200
+    assert sum(counts.values()) == 1
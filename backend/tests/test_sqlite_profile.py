@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event
+
+from app import create_app, db
+from tests.conftest import make_config
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 1,
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'temp_store': 2,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+
+def read_pragmas(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    values = {name: cursor.execute(f'PRAGMA {name}').fetchone()[0] for name in list(PRODUCTION_PRAGMAS) + ['foreign_keys']}
+    cursor.close()
+    return values
+
+
+@pytest.fixture
+def production_app(tmp_path):
+    urls = [f'sqlite:///{tmp_path / name}.db' for name in ('directory', 'shard1')]
+    app = create_app(make_config(
+        tmp_path, SQLITE_PROFILE='production', SQLITE_BUSY_TIMEOUT_MS=5000,
+        SQLALCHEMY_DATABASE_URI=urls[0], SHARD_DATABASE_URLS=urls
+    ))
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_app_connections_get_profile_pragmas(production_app):
+    with production_app.app_context():
+        assert len(db.engines) == 2
+        for engine in db.engines.values():
+            with engine.connect() as connection:
+                assert read_pragmas(connection.connection.dbapi_connection) == dict(PRODUCTION_PRAGMAS, foreign_keys=1)
+
+
+def test_migration_connections_get_profile_pragmas(production_app):
+    seen = {}
+
+    def capture(connection, cursor, statement, parameters, context, executemany):
+        # İlk göç ifadesi çalışırken bağlantının pragmaları okunur
+        if 'alembic_version' in statement and connection.engine.url not in seen:
+            seen[connection.engine.url] = read_pragmas(connection.connection.dbapi_connection)
+
+    with production_app.app_context():
+        engines = list(db.engines.values())
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            upgrade(directory=MIGRATIONS, x_arg=['shard=all'])
+        finally:
+            for engine in engines:
+                event.remove(engine, 'before_cursor_execute', capture)
+
+        # Yabancı anahtarlar göç sırasında kapalıdır (tablo yeniden oluşturma CASCADE silmesin)
+        assert len(seen) == 2
+        for values in seen.values():
+            assert values == dict(PRODUCTION_PRAGMAS, foreign_keys=0)
+
+        # Havuza dönen bağlantılarda yabancı anahtarlar yeniden açıktır
+        for engine in engines:
+            with engine.connect() as connection:
+                assert read_pragmas(connection.connection.dbapi_connection) == dict(PRODUCTION_PRAGMAS, foreign_keys=1)
@@ -5,6 +5,7 @@ import RegisterForm from './components/RegisterForm';
 import Dashboard from './pages/Dashboard';
 import Habits from './pages/Habits';
 import Reports from './pages/Reports';
+import Leaderboards from './pages/Leaderboards';
 import './App.css';
 
 const PrivateRoute = ({ children }) => {
@@ -45,6 +46,11 @@ function AppRoutes() {
           <Reports />
         </PrivateRoute>
       } />
+      <Route path="/leaderboards" element={
+        <PrivateRoute>
+          <Leaderboards />
+        </PrivateRoute>
+      } />
     </Routes>
   );
 }
@@ -1,43 +1,116 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import api from '../api/axios';
+import { useLiveUpdates, upsertHabit } from '../hooks/useLiveUpdates';
 import './HabitList.css';
 
+// Liste görünümü ısı haritalarına ihtiyaç duymaz; alışkanlıklar sayfa sayfa getirilir
+const PAGE_SIZE = 20;
+// Arama kutusu yazmayı bitirene kadar beklenir; her tuşta istek gönderilmez
+const SEARCH_DELAY_MS = 250;
+
 const HabitList = () => {
   const [habits, setHabits] = useState([]);
   const [newHabitName, setNewHabitName] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [query, setQuery] = useState('');
+  // Arama sonuçları sunucudan gelir (null: arama yapılmıyor, tüm liste gösterilir)
+  const [searchResults, setSearchResults] = useState(null);
+  const [nextOffset, setNextOffset] = useState(null);
 
   useEffect(() => {
     fetchHabits();
   }, []);
 
-  const fetchHabits = async () => {
+  useEffect(() => {
+    if (!query.trim()) {
+      setSearchResults(null);
+      setNextOffset(null);
+      return;
+    }
+    const timer = setTimeout(() => searchHabits(query), SEARCH_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  // Liste sadece ad ve açıklama gösterdiğinden kayıt olayları yok sayılır
+  useLiveUpdates({
+    'habit.created': ({ habit }) => setHabits(prev => upsertHabit(prev, habit)),
+    'habit.updated': ({ habit }) => setHabits(prev => upsertHabit(prev, habit)),
+    'habit.deleted': ({ habit_id }) => setHabits(prev => prev.filter(h => h.id !== habit_id)),
+    'habit.archived': ({ habit_id }) => setHabits(prev => prev.filter(h => h.id !== habit_id)),
+    'habit.restored': ({ habit }) => setHabits(prev => upsertHabit(prev, habit)),
+    resync: () => fetchHabits()
+  });
+
+  const fetchHabits = async (cursor = null) => {
     try {
-      const response = await api.get('/habits');
-      setHabits(response.data);
+      const params = { limit: PAGE_SIZE, include: '', fields: 'id,name,description' };
+      if (cursor) params.cursor = cursor;
+
+      const response = await api.get('/habits', { params });
+      setHabits(prev => {
+        if (!cursor) return response.data;
+        // Yerelde eklenmiş alışkanlıklar sonraki sayfalarda tekrar gelebilir
+        const seen = new Set(prev.map(h => h.id));
+        return [...prev, ...response.data.filter(h => !seen.has(h.id))];
+      });
+      setNextCursor(response.headers['x-next-cursor'] || null);
     } catch (error) {
       console.error('Error fetching habits:', error);
     }
   };
 
+  const searchHabits = async (q, offset = 0) => {
+    try {
+      const response = await api.get('/habits/search', { params: { q, limit: PAGE_SIZE, offset } });
+      setSearchResults(prev => (offset ? [...(prev || []), ...response.data.results] : response.data.results));
+      setNextOffset(response.data.next_offset);
+    } catch (error) {
+      console.error('Error searching habits:', error);
+    }
+  };
+
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    if (searchResults) {
+      await searchHabits(query, nextOffset);
+    } else {
+      await fetchHabits(nextCursor);
+    }
+    setLoadingMore(false);
+  };
+
   const handleAddHabit = async (e) => {
     e.preventDefault();
     if (!newHabitName.trim()) return;
 
     try {
       const response = await api.post('/habits', { name: newHabitName });
-      setHabits([...habits, response.data]);
+      setHabits(prev => upsertHabit(prev, response.data));
       setNewHabitName('');
     } catch (error) {
       console.error('Error adding habit:', error);
     }
   };
 
+  // Arşivlenen alışkanlık listeden kalkar, geçmişi korunur
+  const handleArchive = async (id) => {
+    try {
+      await api.post(`/habits/${id}/archive`);
+      setHabits(prev => prev.filter(h => h.id !== id));
+      setSearchResults(prev => prev && prev.filter(h => h.id !== id));
+    } catch (error) {
+      console.error('Error archiving habit:', error);
+    }
+  };
+
   const handleDelete = async (id) => {
     if (!window.confirm('Are you sure?')) return;
     try {
       await api.delete(`/habits/${id}`);
-      setHabits(habits.filter(h => h.id !== id));
+      setHabits(prev => prev.filter(h => h.id !== id));
+      setSearchResults(prev => prev && prev.filter(h => h.id !== id));
     } catch (error) {
       console.error('Error deleting habit:', error);
     }
@@ -58,17 +131,33 @@ const HabitList = () => {
         <button type="submit">Add Habit</button>
       </form>
 
+      <input
+        type="search"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        placeholder="Search habits..."
+        className="habit-search"
+      />
+      {searchResults && searchResults.length === 0 && <p>No matching habits.</p>}
+
       <div className="habit-grid">
-        {habits.map(habit => (
+        {(searchResults || habits).map(habit => (
           <div key={habit.id} className="habit-card">
             <Link to={`/habits/${habit.id}`} className="habit-link">
               <h4>{habit.name}</h4>
               <p>{habit.description}</p>
             </Link>
+            <button onClick={() => handleArchive(habit.id)} className="archive-btn">Archive</button>
             <button onClick={() => handleDelete(habit.id)} className="delete-btn">Delete</button>
           </div>
         ))}
       </div>
+
+      {(searchResults ? nextOffset : nextCursor) && (
+        <button onClick={handleLoadMore} disabled={loadingMore} className="load-more-btn">
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 };
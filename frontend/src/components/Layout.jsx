@@ -7,7 +7,8 @@ import {
   BarChart2, 
   LogOut, 
   ListTodo,
-  Loader2
+  Loader2,
+  Trophy
 } from 'lucide-react';
 
 const Layout = ({ children, isLoading }) => {
@@ -66,6 +67,10 @@ const Layout = ({ children, isLoading }) => {
                   <BarChart2 size={20} />
                   <p className="text-sm font-medium leading-normal">Reports</p>
                 </Link>
+                <Link to="/leaderboards" className={getLinkClass('/leaderboards')}>
+                  <Trophy size={20} />
+                  <p className="text-sm font-medium leading-normal">Leaderboards</p>
+                </Link>
               </div>
             </div>
 
@@ -3,6 +3,9 @@ import api from '../api/axios';
 
 const AuthContext = createContext(null);
 
+// Tarayıcının IANA saat dilimi; sunucu "bugün"ü ve günlük kayıtları buna göre belirler
+const browserTimezone = () => Intl.DateTimeFormat().resolvedOptions().timeZone;
+
 export const AuthProvider = ({ children }) => {
   const [user, setUser] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -42,8 +45,21 @@ export const AuthProvider = ({ children }) => {
   const login = async (username, password) => {
     try {
       const response = await api.post('/login', { username, password });
-      setUser(response.data.user);
-      localStorage.setItem('user', JSON.stringify(response.data.user));
+      let loggedInUser = response.data.user;
+
+      // Kullanıcı başka bir saat diliminden giriş yaptıysa ayarı güncelle
+      const timezone = browserTimezone();
+      if (timezone && loggedInUser.timezone !== timezone) {
+        try {
+          await api.put('/settings', { timezone });
+          loggedInUser = { ...loggedInUser, timezone };
+        } catch (error) {
+          console.error("Timezone update failed", error);
+        }
+      }
+
+      setUser(loggedInUser);
+      localStorage.setItem('user', JSON.stringify(loggedInUser));
       return { success: true };
     } catch (error) {
       console.error("Login failed", error);
@@ -53,7 +69,7 @@ export const AuthProvider = ({ children }) => {
 
   const register = async (username, email, password) => {
     try {
-      await api.post('/register', { username, email, password });
+      await api.post('/register', { username, email, password, timezone: browserTimezone() });
       return { success: true };
     } catch (error) {
       console.error("Registration failed", error);
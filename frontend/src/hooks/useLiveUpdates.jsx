@@ -0,0 +1,56 @@
+import { useEffect, useRef, useState } from 'react';
+import api from '../api/axios';
+
+const EVENT_TYPES = [
+  'habit.created', 'habit.updated', 'habit.deleted', 'habit.archived', 'habit.restored', 'logs.changed', 'resync'
+];
+
+// Sunucunun /events (Server-Sent Events) akışına bağlanır ve gelen olayları işleyicilere iletir.
+// Olaylar mutlak değerler taşır (güncel istatistikler, günlük toplamlar); bu yüzden aynı
+// sekmenin kendi yazmalarından gelen olaylar da iki kez uygulanmış olmaz. Çok süreçli (redis)
+// kurulumda sunucu yük yerine sadece 'changed' gönderir; bu 'resync' gibi işlenir.
+// Döndürür: bağlantının açık olup olmadığı.
+export const useLiveUpdates = (handlers) => {
+  const handlersRef = useRef(handlers);
+  const [connected, setConnected] = useState(false);
+
+  useEffect(() => {
+    handlersRef.current = handlers;
+  });
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(`${api.defaults.baseURL}/events`, { withCredentials: true });
+    EVENT_TYPES.forEach(type => {
+      source.addEventListener(type, (e) => handlersRef.current[type]?.(JSON.parse(e.data)));
+    });
+    source.addEventListener('changed', () => handlersRef.current.resync?.());
+    source.onopen = () => setConnected(true);
+    // Tarayıcı bağlantıyı Last-Event-ID ile kendisi yeniden kurar; kaçırılan olaylar
+    // sunucuda yoksa 'resync' gelir
+    source.onerror = () => setConnected(false);
+
+    return () => source.close();
+  }, []);
+
+  return connected;
+};
+
+// Alışkanlık listesine id'ye göre ekler veya günceller (aynı olay iki kez gelebilir)
+export const upsertHabit = (habits, habit) => {
+  if (habits.some(h => h.id === habit.id)) {
+    return habits.map(h => (h.id === habit.id ? { ...h, ...habit } : h));
+  }
+  return [...habits, habit];
+};
+
+// Isı haritasına mutlak günlük değerleri uygular; 0 olan günler silinir
+export const applyDayValues = (heatmap, values) => {
+  const next = { ...heatmap };
+  Object.entries(values).forEach(([day, count]) => {
+    if (count > 0) next[day] = count;
+    else delete next[day];
+  });
+  return next;
+};
@@ -3,6 +3,7 @@ import { Link } from 'react-router-dom';
 import api from '../api/axios';
 import HabitHeatmap from '../components/HabitHeatmap';
 import Layout from '../components/Layout';
+import { useLiveUpdates, upsertHabit, applyDayValues } from '../hooks/useLiveUpdates';
 import { Plus, Flame, CheckSquare, TrendingUp } from 'lucide-react';
 
 const Dashboard = () => {
@@ -18,27 +19,44 @@ const Dashboard = () => {
     fetchData();
   }, []);
 
+  // Diğer sekmelerdeki (ve bu sekmedeki) değişiklikler tam yeniden yükleme olmadan uygulanır
+  const live = useLiveUpdates({
+    'habit.created': ({ habit, stats }) => {
+      setHabits(prev => upsertHabit(prev, habit));
+      setStats(stats);
+    },
+    'habit.updated': ({ habit }) => setHabits(prev => upsertHabit(prev, habit)),
+    // Silinen alışkanlığın kayıtları arka planda temizlenir; toplamlar bitince 'resync' ile yenilenir
+    'habit.deleted': ({ habit_id, stats }) => {
+      setHabits(prev => prev.filter(h => h.id !== habit_id));
+      setStats(stats);
+    },
+    'habit.archived': ({ habit_id, stats }) => {
+      setHabits(prev => prev.filter(h => h.id !== habit_id));
+      setStats(stats);
+    },
+    // Geri alınan alışkanlığın ısı haritası gerektiğinden veriler yeniden yüklenir
+    'habit.restored': () => fetchData(),
+    'logs.changed': ({ day_totals, stats }) => {
+      setGlobalHeatmapData(prev => applyDayValues(prev, day_totals));
+      setStats(stats);
+    },
+    resync: () => fetchData()
+  });
+
   const fetchData = async () => {
     try {
-      const [habitsRes, statsRes] = await Promise.all([
+      const [habitsRes, statsRes, heatmapsRes] = await Promise.all([
         api.get('/habits'),
-        api.get('/stats')
+        api.get('/stats'),
+        api.get('/heatmaps')
       ]);
       
       setHabits(habitsRes.data);
       setStats(statsRes.data);
       
-      // Birleştirmek için tüm alışkanlıkların ısı haritası verilerini getir
-      const heatmapPromises = habitsRes.data.map(h => api.get(`/habits/${h.id}/heatmap`));
-      const heatmaps = await Promise.all(heatmapPromises);
-      
-      const aggregatedData = {};
-      heatmaps.forEach(res => {
-        Object.entries(res.data).forEach(([date, count]) => {
-            aggregatedData[date] = (aggregatedData[date] || 0) + count;
-        });
-      });
-      setGlobalHeatmapData(aggregatedData);
+      // Tüm alışkanlıkların birleşik ısı haritası tek istekte sunucudan gelir
+      setGlobalHeatmapData(heatmapsRes.data.total);
       
     } catch (error) {
       console.error('Error fetching data:', error);
@@ -56,9 +74,11 @@ const Dashboard = () => {
         name: newHabitName,
         description: newHabitDesc 
       });
-      setHabits([...habits, response.data]);
-      // İstatistikleri yerel olarak güncelle veya yeniden getir
-      setStats(prev => ({ ...prev, total_habits: prev.total_habits + 1 }));
+      setHabits(prev => upsertHabit(prev, response.data));
+      // Canlı bağlantı varsa güncel istatistikler 'habit.created' olayıyla gelir
+      if (!live) {
+        setStats(prev => ({ ...prev, total_habits: prev.total_habits + 1 }));
+      }
       
       setNewHabitName('');
       setNewHabitDesc('');
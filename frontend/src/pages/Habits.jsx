@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import api from '../api/axios';
 import Layout from '../components/Layout';
 import HabitHeatmap from '../components/HabitHeatmap';
+import { useLiveUpdates, upsertHabit, applyDayValues } from '../hooks/useLiveUpdates';
 import { Plus, Check, X, Trash2 } from 'lucide-react';
 
 const Habits = () => {
@@ -15,6 +16,23 @@ const Habits = () => {
     fetchData();
   }, []);
 
+  // Diğer sekmelerdeki değişiklikler tam yeniden yükleme olmadan uygulanır
+  useLiveUpdates({
+    'habit.created': ({ habit }) => setHabits(prev => upsertHabit(prev, habit)),
+    'habit.updated': ({ habit }) => setHabits(prev => upsertHabit(prev, habit)),
+    'habit.deleted': ({ habit_id }) => setHabits(prev => prev.filter(h => h.id !== habit_id)),
+    'habit.archived': ({ habit_id }) => setHabits(prev => prev.filter(h => h.id !== habit_id)),
+    'habit.restored': () => fetchData(),
+    'logs.changed': ({ changes }) => {
+      setHabits(prev => prev.map(habit => {
+        const values = {};
+        changes.filter(c => c.habit_id === habit.id).forEach(c => { values[c.date] = c.completed ? 1 : 0; });
+        return Object.keys(values).length ? { ...habit, heatmap: applyDayValues(habit.heatmap, values) } : habit;
+      }));
+    },
+    resync: () => fetchData()
+  });
+
   const fetchData = async () => {
     try {
       // Artık ısı haritası verileri dahil edilmiş alışkanlıkları getirir
@@ -36,7 +54,7 @@ const Habits = () => {
         name: newHabitName,
         description: newHabitDesc 
       });
-      setHabits([...habits, response.data]);
+      setHabits(prev => upsertHabit(prev, response.data));
       
       setNewHabitName('');
       setNewHabitDesc('');
@@ -72,19 +90,9 @@ const Habits = () => {
         if (habit.id === habitId) {
           const isUnchecking = response.data.completed === false; // Backend yanıtına göre ayarla
           
-          // Isı haritası verilerini iyimser bir şekilde güncellemeyi deneyelim
-          const newHeatmap = { ...habit.heatmap };
-          
-          // Tamamlanıp tamamlanmadığını kontrol et (önceki duruma göre)
-          const wasCompleted = newHeatmap[localDate] > 0;
-          
-          if (wasCompleted) {
-             delete newHeatmap[localDate];
-          } else {
-             newHeatmap[localDate] = 1;
-          }
-          
-          return { ...habit, heatmap: newHeatmap };
+          // Önceki duruma göre çevirmek yerine yanıttaki mutlak durum uygulanır; böylece
+          // aynı değişiklik 'logs.changed' olayıyla daha önce uygulanmışsa tekrar çevrilmez
+          return { ...habit, heatmap: applyDayValues(habit.heatmap, { [localDate]: isUnchecking ? 0 : 1 }) };
         }
         return habit;
       }));
@@ -0,0 +1,201 @@
+import React, { useState, useEffect, useCallback } from 'react';
+import api from '../api/axios';
+import Layout from '../components/Layout';
+import { Trophy, UserPlus, Users, X } from 'lucide-react';
+
+const METRICS = [
+  { value: 'current_streak', label: 'Current Streak' },
+  { value: 'best_streak', label: 'Best Streak' },
+  { value: 'completions_30d', label: 'Last 30 Days' }
+];
+
+const Leaderboards = () => {
+  const [metric, setMetric] = useState('current_streak');
+  // 'global', 'friends' veya grup id'si
+  const [scope, setScope] = useState('global');
+  const [board, setBoard] = useState(null);
+  const [groups, setGroups] = useState([]);
+  const [friends, setFriends] = useState([]);
+  const [friendName, setFriendName] = useState('');
+  const [groupName, setGroupName] = useState('');
+  const [inviteCode, setInviteCode] = useState('');
+  const [error, setError] = useState('');
+  const [loading, setLoading] = useState(true);
+
+  const fetchBoard = useCallback(async () => {
+    try {
+      const path = typeof scope === 'number' ? `/groups/${scope}/leaderboard` : `/leaderboards/${scope}`;
+      const response = await api.get(path, { params: { metric, limit: 25 } });
+      setBoard(response.data);
+    } catch (error) {
+      console.error('Error fetching leaderboard:', error);
+    } finally {
+      setLoading(false);
+    }
+  }, [scope, metric]);
+
+  const fetchSocial = async () => {
+    try {
+      const [groupsResponse, friendsResponse] = await Promise.all([api.get('/groups'), api.get('/friends')]);
+      setGroups(groupsResponse.data);
+      setFriends(friendsResponse.data);
+    } catch (error) {
+      console.error('Error fetching groups and friends:', error);
+    }
+  };
+
+  useEffect(() => {
+    fetchBoard();
+  }, [fetchBoard]);
+
+  useEffect(() => {
+    fetchSocial();
+  }, []);
+
+  const submit = async (request) => {
+    setError('');
+    try {
+      await request();
+      await fetchSocial();
+      await fetchBoard();
+    } catch (error) {
+      setError(error.response?.data?.error || 'Something went wrong');
+    }
+  };
+
+  const addFriend = (e) => {
+    e.preventDefault();
+    if (!friendName.trim()) return;
+    submit(async () => {
+      await api.post('/friends', { username: friendName.trim() });
+      setFriendName('');
+    });
+  };
+
+  const createGroup = (e) => {
+    e.preventDefault();
+    if (!groupName.trim()) return;
+    submit(async () => {
+      const response = await api.post('/groups', { name: groupName.trim() });
+      setGroupName('');
+      setScope(response.data.id);
+    });
+  };
+
+  const joinGroup = (e) => {
+    e.preventDefault();
+    if (!inviteCode.trim()) return;
+    submit(async () => {
+      const response = await api.post('/groups/join', { invite_code: inviteCode.trim() });
+      setInviteCode('');
+      setScope(response.data.id);
+    });
+  };
+
+  const leaveGroup = (groupId) => submit(async () => {
+    await api.delete(`/groups/${groupId}/membership`);
+    if (scope === groupId) setScope('global');
+  });
+
+  const removeFriend = (friendId) => submit(() => api.delete(`/friends/${friendId}`));
+
+  if (loading) {
+    return <Layout isLoading={true} />;
+  }
+
+  const scopeClass = (value) => `px-3 py-1.5 rounded-lg text-sm font-medium transition-colors ${
+    scope === value ? 'bg-[#137fec] text-white' : 'bg-[#111a22] text-slate-300 hover:text-white border border-slate-800'
+  }`;
+  const inputClass = 'flex-1 bg-[#101922] border border-slate-700 rounded-lg px-3 py-2 text-sm text-white placeholder-slate-500 focus:outline-none focus:border-[#137fec]';
+
+  return (
+    <Layout>
+      <div className="flex flex-wrap justify-between gap-4 items-center mb-6">
+        <p className="text-white text-4xl font-black leading-tight tracking-[-0.033em]">Leaderboards</p>
+        <select
+          value={metric}
+          onChange={(e) => setMetric(e.target.value)}
+          className="bg-[#111a22] border border-slate-700 rounded-lg px-3 py-2 text-sm text-white"
+        >
+          {METRICS.map(option => <option key={option.value} value={option.value}>{option.label}</option>)}
+        </select>
+      </div>
+
+      <div className="flex flex-wrap gap-2 mb-6">
+        <button className={scopeClass('global')} onClick={() => setScope('global')}>Everyone</button>
+        <button className={scopeClass('friends')} onClick={() => setScope('friends')}>Friends</button>
+        {groups.map(group => (
+          <button key={group.id} className={scopeClass(group.id)} onClick={() => setScope(group.id)}>{group.name}</button>
+        ))}
+      </div>
+
+      {error && <p className="text-red-400 text-sm mb-4">{error}</p>}
+
+      <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
+        {/* Sıralama tablosu */}
+        <div className="lg:col-span-2 bg-[#111a22] rounded-xl border border-slate-800 p-6">
+          <div className="flex items-center justify-between mb-4">
+            <h2 className="text-white text-lg font-bold flex items-center gap-2"><Trophy size={20} className="text-yellow-500" /> Top</h2>
+            {board?.me && (
+              <p className="text-slate-400 text-sm">
+                Your rank: <span className="text-white font-bold">#{board.me.rank}</span> of {board.total} · {board.me.score}
+              </p>
+            )}
+          </div>
+          {board?.entries?.length ? (
+            <table className="w-full text-sm">
+              <tbody>
+                {board.entries.map(entry => (
+                  <tr key={entry.user_id} className="border-t border-slate-800">
+                    <td className="py-2 w-12 text-slate-400">#{entry.rank}</td>
+                    <td className="py-2 text-white">{entry.username}</td>
+                    <td className="py-2 text-right text-white font-bold">{entry.score}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          ) : (
+            <p className="text-slate-400 text-sm">No one on this leaderboard yet.</p>
+          )}
+          {typeof scope === 'number' && (
+            <div className="mt-4 flex items-center justify-between text-sm text-slate-400">
+              <span>Invite code: <span className="text-white font-mono">{groups.find(group => group.id === scope)?.invite_code}</span></span>
+              <button onClick={() => leaveGroup(scope)} className="text-red-400 hover:text-red-300">Leave group</button>
+            </div>
+          )}
+        </div>
+
+        {/* Arkadaşlar ve gruplar */}
+        <div className="flex flex-col gap-6">
+          <div className="bg-[#111a22] rounded-xl border border-slate-800 p-6">
+            <h2 className="text-white text-lg font-bold flex items-center gap-2 mb-4"><UserPlus size={20} /> Friends</h2>
+            <form onSubmit={addFriend} className="flex gap-2 mb-4">
+              <input value={friendName} onChange={(e) => setFriendName(e.target.value)} placeholder="Username" className={inputClass} />
+              <button type="submit" className="bg-[#137fec] text-white rounded-lg px-3 py-2 text-sm font-medium">Add</button>
+            </form>
+            {friends.map(friend => (
+              <div key={friend.user_id} className="flex items-center justify-between py-1 text-sm text-slate-300">
+                <span>{friend.username}</span>
+                <button onClick={() => removeFriend(friend.user_id)} className="text-slate-500 hover:text-red-400"><X size={16} /></button>
+              </div>
+            ))}
+          </div>
+
+          <div className="bg-[#111a22] rounded-xl border border-slate-800 p-6">
+            <h2 className="text-white text-lg font-bold flex items-center gap-2 mb-4"><Users size={20} /> Groups</h2>
+            <form onSubmit={createGroup} className="flex gap-2 mb-3">
+              <input value={groupName} onChange={(e) => setGroupName(e.target.value)} placeholder="New group name" className={inputClass} />
+              <button type="submit" className="bg-[#137fec] text-white rounded-lg px-3 py-2 text-sm font-medium">Create</button>
+            </form>
+            <form onSubmit={joinGroup} className="flex gap-2">
+              <input value={inviteCode} onChange={(e) => setInviteCode(e.target.value)} placeholder="Invite code" className={inputClass} />
+              <button type="submit" className="bg-[#137fec] text-white rounded-lg px-3 py-2 text-sm font-medium">Join</button>
+            </form>
+          </div>
+        </div>
+      </div>
+    </Layout>
+  );
+};
+
+export default Leaderboards;
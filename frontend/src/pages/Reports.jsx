@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import api from '../api/axios';
 import HabitHeatmap from '../components/HabitHeatmap';
 import Layout from '../components/Layout';
+import { useLiveUpdates, applyDayValues } from '../hooks/useLiveUpdates';
 import { 
   CheckSquare, 
   TrendingUp,
@@ -17,6 +18,18 @@ const Reports = () => {
     fetchReports();
   }, []);
 
+  useLiveUpdates({
+    'habit.created': ({ stats }) => setData(prev => prev && { ...prev, stats }),
+    'logs.changed': ({ day_totals, stats }) => setData(prev => prev && {
+      stats,
+      heatmap: applyDayValues(prev.heatmap, day_totals)
+    }),
+    'habit.deleted': () => fetchReports(),
+    'habit.archived': () => fetchReports(),
+    'habit.restored': () => fetchReports(),
+    resync: () => fetchReports()
+  });
+
   const fetchReports = async () => {
     try {
       const response = await api.get('/reports');